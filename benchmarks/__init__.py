@@ -0,0 +1 @@
+"""Load benchmarks for the MCP Server."""
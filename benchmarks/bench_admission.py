@@ -0,0 +1,140 @@
+"""
+Latency under overload with and without admission control.
+
+Calls arrive at a fixed rate from several sessions, faster than a stub
+backend that serves a limited number of requests at once can answer them.
+Without admission control every call is sent upstream, the backlog grows and
+calls end in timeouts and fallback data. With it, calls beyond the limits
+wait briefly or are shed at once with a busy result, so the calls that are
+admitted keep a stable latency. A share of the calls are to the cheap
+validate_future_date tool, which is queued ahead of the others.
+
+Run with:
+    python -m benchmarks.bench_admission --rate 400 --seconds 5 --capacity 10 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import contextvars
+import os
+import tempfile
+import time
+
+from benchmarks.stub_upstreams import start_in_process, stub_env
+
+_session: contextvars.ContextVar[str] = contextvars.ContextVar("session", default="")
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Return a percentile of `values` in milliseconds, or 0 if there are none."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)] * 1000
+
+
+async def run(args: argparse.Namespace, controller, offset: int) -> dict:
+    """
+    Issue calls at `args.rate` per second for `args.seconds` seconds.
+
+    Args:
+        args: Command-line arguments
+        controller: AdmissionController to run the calls under, or None for none
+        offset: First user number, so no two runs share cached histories
+
+    Returns:
+        Latencies and counts by outcome and tool.
+    """
+    from core import admission, http
+    from core.fallback import call_tracking_fallback
+    from tools.get_past_activities import get_past_activities
+    from tools.validate_future_date import validate_future_date
+
+    http.breakers.clear()
+    http.upstreams.clear()
+    admission.admission = controller or admission.AdmissionController(0, 0, 0, 0)
+    history = admission.admission_controlled(get_past_activities, _session.get)
+    validate = admission.admission_controlled(validate_future_date, _session.get)
+
+    results = {"ok": [], "fallback": [], "busy": [], "validate": []}
+
+    async def one(i: int) -> None:
+        _session.set(f"session{i % args.sessions}")
+        start = time.perf_counter()
+        if i % 10 == 0:
+            await validate(date="2099-01-01")
+            results["validate"].append(time.perf_counter() - start)
+            return
+        result, fallback = await call_tracking_fallback(history, user=f"user{offset + i}", limit=5)
+        outcome = "busy" if isinstance(result, dict) and result.get("busy") else "fallback" if fallback else "ok"
+        results[outcome].append(time.perf_counter() - start)
+
+    tasks = []
+    start = time.perf_counter()
+    for i in range(int(args.rate * args.seconds)):
+        delay = start + i / args.rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(i)))
+    await asyncio.gather(*tasks)
+    return results
+
+
+def print_row(name: str, results: dict) -> None:
+    served = results["ok"]
+    print(
+        f"{name:<20} {len(served):>6} {len(results['fallback']):>9} {len(results['busy']):>6} "
+        f"{percentile(served, 0.5):>8.1f} {percentile(served, 0.99):>8.1f} "
+        f"{percentile(results['fallback'], 0.5):>12.1f} {percentile(results['busy'], 0.99):>12.1f} "
+        f"{percentile(results['validate'], 0.99):>13.1f}"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    from core.admission import AdmissionController
+    from core.http import aclose
+
+    calls = int(args.rate * args.seconds)
+    print(
+        f"{calls} calls at {args.rate}/s from {args.sessions} sessions; backend serves {args.capacity} at once, "
+        f"{args.latency * 1000:.0f} ms each"
+    )
+    print(
+        f"{'admission':<20} {'ok':>6} {'fallback':>9} {'busy':>6} {'ok p50':>8} {'ok p99':>8} "
+        f"{'fallback p50':>12} {'busy p99':>12} {'validate p99':>13}"
+    )
+    print_row("off", await run(args, None, 0))
+    controller = AdmissionController(args.max_concurrent, args.per_session, args.queue_size, args.queue_timeout)
+    print_row("on", await run(args, controller, calls))
+    print(controller.stats())
+    await aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=400, help="calls started per second")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--capacity", type=int, default=10, help="backend requests served at once")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the backend takes per request")
+    parser.add_argument("--timeout", type=float, default=2.0, help="backend timeout in seconds")
+    parser.add_argument("--max-concurrent", type=int, default=10)
+    parser.add_argument("--per-session", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=20)
+    parser.add_argument("--queue-timeout", type=float, default=0.5)
+    parser.add_argument("--port", type=int, default=8900)
+    args = parser.parse_args()
+
+    # Settings are read at import time, so point them at the stub first.
+    os.environ.update(stub_env(args.port))
+    os.environ["BACKEND_TIMEOUT"] = str(args.timeout)
+    os.environ["HISTORY_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "history.sqlite")
+    stub = start_in_process(args.port, args.latency, capacity=args.capacity)
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        stub.terminate()
+
+
+if __name__ == "__main__":
+    main()
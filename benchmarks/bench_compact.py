@@ -0,0 +1,128 @@
+"""
+Response size of each tool with and without the compact output options.
+
+Each tool is registered on a FastMCP server the way main.py registers it, and
+unwrapped on a second server for the plain baseline. Calls go through the
+servers, so the sizes are those of the text and structured content sent to the
+client. Every tool is called plainly, then compactly twice in a new session
+(the second call can refer to objects sent by the first), then compactly with
+long texts shortened in another new session. Tokens are estimated by counting
+words and punctuation marks.
+
+Weather comes from the stub. The backend is left unreachable, so the
+backend tools answer from the bundled datasets, whose long descriptions are
+what the real backend returns.
+
+Run with:
+    python -m benchmarks.bench_compact --max-text-chars 160
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import tempfile
+from datetime import date, timedelta
+
+from benchmarks.stub_upstreams import start_in_process, stub_env
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+def tool_calls() -> list:
+    """Return (tool, kwargs) pairs covering tools with list, nested and prose-heavy results."""
+    from tools.get_all_location_for_designation import get_all_location_for_designation
+    from tools.get_all_location_for_designation_batch import get_all_location_for_designation_batch
+    from tools.get_nearby_location_activities import get_nearby_location_activities
+    from tools.get_past_activities import get_past_activities
+    from tools.get_weather import get_weather
+    from tools.get_weather_range import get_weather_range
+    from tools.plan_trip import plan_trip
+
+    soon = date.today() + timedelta(days=3)
+    return [
+        (get_all_location_for_designation, {"location": "Kandy"}),
+        (get_all_location_for_designation_batch, {"locations": ["Kandy", "Ella"]}),
+        (get_nearby_location_activities, {"location": "Kandy"}),
+        (get_past_activities, {"user": "alice"}),
+        (get_weather, {"location": "Kandy", "date": soon.isoformat()}),
+        (get_weather_range, {"location": "Kandy", "start_date": str(soon), "end_date": str(soon + timedelta(days=6))}),
+        (plan_trip, {"user": "alice", "location": "Kandy", "date": soon.isoformat()}),
+    ]
+
+
+def size(result) -> tuple[int, int]:
+    """Return the bytes and estimated tokens of a call_tool result."""
+    from mcp.types import CallToolResult
+
+    if isinstance(result, CallToolResult):
+        content, structured = result.content, result.structuredContent
+    else:
+        content, structured = result if isinstance(result, tuple) else (result, None)
+    text = "".join(block.text for block in content)
+    if structured is not None:
+        text += json.dumps(structured)
+    return len(text.encode()), len(_TOKEN.findall(text))
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    from mcp.server.fastmcp import FastMCP
+
+    from core.compact import compact_output
+    from core.http import aclose
+
+    plain_server = FastMCP("bench plain", log_level="WARNING")
+    server = FastMCP("bench", log_level="WARNING")
+    session = [""]
+    calls = tool_calls()
+    for tool, _ in calls:
+        plain_server.tool()(tool)
+        server.tool()(compact_output(tool, lambda: session[0]))
+
+    print(f"bytes (estimated tokens) per call; text shortened to {args.max_text_chars} characters")
+    print(f"{'tool':<40} {'plain':>14} {'compact':>14} {'repeat':>14} {'+ shortened':>14} {'saved':>6} {'+ short':>7}")
+    totals = [0, 0, 0, 0]
+    for tool, kwargs in calls:
+        name = tool.__name__
+        session[0] = name
+        plain = size(await plain_server.call_tool(name, kwargs))
+        compact = size(await server.call_tool(name, {**kwargs, "compact": True}))
+        repeat = size(await server.call_tool(name, {**kwargs, "compact": True}))
+        session[0] = f"{name} shortened"
+        shortened = size(
+            await server.call_tool(name, {**kwargs, "max_text_chars": args.max_text_chars, "compact": True})
+        )
+        for i, (nbytes, _) in enumerate((plain, compact, repeat, shortened)):
+            totals[i] += nbytes
+        print(
+            f"{name:<40} "
+            + " ".join(f"{nbytes:>6} ({tokens:>5})" for nbytes, tokens in (plain, compact, repeat, shortened))
+            + f" {1 - compact[0] / plain[0]:>6.0%} {1 - shortened[0] / plain[0]:>7.0%}"
+        )
+    print(
+        f"{'total bytes':<40} " + " ".join(f"{total:>14}" for total in totals)
+        + f" {1 - totals[1] / totals[0]:>6.0%} {1 - totals[3] / totals[0]:>7.0%}"
+    )
+    await aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-text-chars", type=int, default=160)
+    parser.add_argument("--port", type=int, default=8900, help="stub port; nothing may listen on the next one")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so point them at the stub first.
+    os.environ.update(stub_env(args.port))
+    os.environ["BACKEND_API_URL"] = f"http://127.0.0.1:{args.port + 1}/api"
+    os.environ["HISTORY_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "history.sqlite")
+    stub = start_in_process(args.port)
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        stub.terminate()
+
+
+if __name__ == "__main__":
+    main()
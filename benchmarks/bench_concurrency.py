@@ -0,0 +1,113 @@
+"""
+Concurrency benchmark for the async tools against local upstream stubs.
+
+FastMCP invokes sync tools directly on the event loop, so the old blocking
+urllib tools served one upstream call at a time no matter how many sessions
+were waiting. A run at concurrency 1 reproduces that behaviour; higher levels
+show how many calls the async tools keep in flight on the shared client.
+
+Run with:
+    python -m benchmarks.bench_concurrency --calls 400 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.stub_upstreams import start_in_process, stub_env
+
+
+def tool_mix() -> list:
+    """Return (tool, kwargs) pairs covering every upstream-calling tool."""
+    from tools.get_all_location_for_designation import get_all_location_for_designation
+    from tools.get_nearby_location_activities import get_nearby_location_activities
+    from tools.get_past_activities import get_past_activities
+    from tools.get_past_locations import get_past_locations
+    from tools.get_weather import get_weather
+
+    return [
+        (get_past_activities, {"user": "alice"}),
+        (get_past_locations, {"user": "alice"}),
+        (get_nearby_location_activities, {"location": "Kandy"}),
+        (get_all_location_for_designation, {"location": "Kandy"}),
+        (get_weather, {"location": "Kandy", "date": ""}),
+    ]
+
+
+async def run(calls: int, concurrency: int) -> dict:
+    """
+    Issue `calls` tool calls with at most `concurrency` in flight.
+
+    Args:
+        calls: Total number of tool calls to make
+        concurrency: Maximum number of calls awaiting upstreams at once
+
+    Returns:
+        Wall time, throughput and per-call latency percentiles.
+    """
+    mix = tool_mix()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int) -> None:
+        tool, kwargs = mix[i % len(mix)]
+        async with semaphore:
+            start = time.perf_counter()
+            await tool(**kwargs)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "elapsed_s": elapsed,
+        "calls_per_s": calls / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    from core.http import aclose, pool_stats
+
+    print(f"{args.calls} calls, {args.latency * 1000:.0f} ms upstream latency")
+    print(f"{'concurrency':>11}  {'elapsed s':>9}  {'calls/s':>8}  {'p50 ms':>8}  {'p99 ms':>8}  {'speedup':>7}")
+    baseline = None
+    for concurrency in args.levels:
+        result = await run(args.calls, concurrency)
+        baseline = baseline or result["elapsed_s"]
+        print(
+            f"{concurrency:>11}  {result['elapsed_s']:>9.2f}  {result['calls_per_s']:>8.1f}  "
+            f"{result['p50_ms']:>8.1f}  {result['p99_ms']:>8.1f}  {baseline / result['elapsed_s']:>6.1f}x"
+        )
+    for name, stats in pool_stats().items():
+        print(
+            f"pool {name}: {stats['requests']} requests, {stats['hits']} reused, "
+            f"{stats['misses']} new connections, {stats['waits']} waited"
+        )
+    await aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds of simulated upstream latency")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--port", type=int, default=8900)
+    args = parser.parse_args()
+
+    # Settings are read at import time, so point them at the stub first.
+    os.environ.update(stub_env(args.port))
+    stub = start_in_process(args.port, args.latency)
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        stub.terminate()
+
+
+if __name__ == "__main__":
+    main()
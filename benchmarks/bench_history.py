@@ -0,0 +1,76 @@
+"""
+Serving cost of a user's history as it grows, from the backend payload and from the local store.
+
+Without the store every call decoded the user's whole history before taking
+a page of it, so the cost grew with the history. The store reads the page,
+or the rows matching a date range or categories, through its indexes. This
+times both for users with short and long histories; no network is involved.
+
+Run with:
+    python -m benchmarks.bench_history --sizes 10 1000 100000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+CATEGORIES = ["hiking", "nature", "wildlife", "cultural", "adventure", "photography", "camping"]
+
+
+def history(size: int) -> list[dict]:
+    """Generate `size` past activities, one every few days back from today."""
+    today = date.today()
+    return [
+        {
+            "activity": f"Activity {i}",
+            "date": (today - timedelta(days=(size - i) // 3)).isoformat(),
+            "budget": 1000 + i % 40 * 100,
+            "category": [CATEGORIES[i % 7], CATEGORIES[(i * 3 + 1) % 7]],
+        }
+        for i in range(size)
+    ]
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    """Return the fastest of `repeat` runs of `fn`, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--page", type=int, default=20)
+    args = parser.parse_args()
+
+    from core.history import HistoryStore
+    from core.shaping import shape
+
+    path = os.path.join(tempfile.mkdtemp(), "history.sqlite")
+    store = HistoryStore(path)
+    month_ago = (date.today() - timedelta(days=30)).isoformat()
+
+    print(f"page of {args.page} rows; times in ms, best of 5")
+    print(f"{'history rows':>12}  {'full payload':>12}  {'store page':>10}  {'last 30 days':>12}  {'2 categories':>12}")
+    for size in args.sizes:
+        user = f"user{size}"
+        rows = history(size)
+        store.add(user, "activities", rows)
+        payload = json.dumps(rows)
+
+        full = best_of(lambda: shape(json.loads(payload), None, args.page, 0))
+        page = best_of(lambda: store.query(user, "activities", limit=args.page))
+        recent = best_of(lambda: store.query(user, "activities", start_date=month_ago, limit=args.page))
+        both = best_of(lambda: store.query(user, "activities", categories=["hiking", "wildlife"], limit=args.page))
+        print(f"{size:>12}  {full:>12.2f}  {page:>10.2f}  {recent:>12.2f}  {both:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
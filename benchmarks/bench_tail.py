@@ -0,0 +1,140 @@
+"""
+Tail-latency and retry-amplification benchmark for the upstream call policy.
+
+Runs the same stream of forecast requests against a stub whose responses
+have a slow tail, once with hedging and retries off and once with the
+configured policy, and compares latency percentiles and how many upstream
+requests each call cost. A final run against a stub that fails every request,
+with the circuit breaker out of the way, shows that retries stay within the
+retry budget during an outage.
+
+Run with:
+    python -m benchmarks.bench_tail --calls 400 --latency 0.05 --slow-rate 0.05 --slow-latency 1
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.stub_upstreams import start_in_process, stub_env
+
+# Calls made before measuring, so latency percentiles are known
+WARMUP_CALLS = 50
+
+
+async def run(base_url: str, calls: int, concurrency: int, hedge: bool, retries: int, offset: int) -> dict:
+    """
+    Issue `calls` distinct forecast requests with at most `concurrency` in flight.
+
+    Args:
+        base_url: Forecast endpoint of the stub
+        calls: Number of measured requests
+        concurrency: Maximum number of requests in flight at once
+        hedge: Whether slow attempts are hedged
+        retries: Retries allowed per request
+        offset: First request number, so no two runs share a URL
+
+    Returns:
+        Latency percentiles, failures and upstream requests per call.
+    """
+    from core import http
+
+    http.upstreams.clear()
+    runner = http.get_upstream("forecast")
+    runner.policy.hedge = hedge
+    runner.policy.retries = retries
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one(i: int, measure: bool) -> None:
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await http.get_json(f"{base_url}?current=temperature_2m&n={offset + i}", timeout=5, upstream="forecast")
+            except Exception:
+                failures += measure
+            if measure:
+                latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(-i - 1, False) for i in range(WARMUP_CALLS)))
+    requests_before = sum(stats["requests"] for stats in http.pool_stats().values())
+    await asyncio.gather(*(one(i, True) for i in range(calls)))
+    requests = sum(stats["requests"] for stats in http.pool_stats().values()) - requests_before
+
+    latencies.sort()
+    return {
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "failures": failures,
+        "upstream_per_call": requests / calls,
+        "hedges": runner.hedges,
+        "retries": runner.retries,
+    }
+
+
+def print_row(name: str, result: dict) -> None:
+    print(
+        f"{name:<22} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+        f"{result['max_ms']:>8.1f} {result['failures']:>8} {result['upstream_per_call']:>9.2f} "
+        f"{result['hedges']:>7} {result['retries']:>7}"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    from core.breaker import CircuitBreaker
+    from core.http import aclose, breakers, retry_budget
+    from core.settings import UPSTREAM_RETRIES
+
+    tail_url = f"http://127.0.0.1:{args.port}/v1/forecast"
+    outage_url = f"http://127.0.0.1:{args.port + 1}/v1/forecast"
+    print(
+        f"{args.calls} calls, concurrency {args.concurrency}, {args.latency * 1000:.0f} ms upstream latency, "
+        f"{args.slow_rate:.0%} of requests take {args.slow_latency * 1000:.0f} ms"
+    )
+    print(
+        f"{'policy':<22} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'failed':>8} "
+        f"{'upstream':>9} {'hedges':>7} {'retries':>7}"
+    )
+    print_row("no hedge, no retry", await run(tail_url, args.calls, args.concurrency, False, 0, 0))
+    print_row("hedge + retry", await run(tail_url, args.calls, args.concurrency, True, UPSTREAM_RETRIES, args.calls))
+
+    # A breaker that never opens, so every call reaches the failing upstream
+    breakers["forecast"] = CircuitBreaker("forecast", args.calls * 10, 0)
+    spent_before = retry_budget.spent
+    result = await run(outage_url, args.calls, args.concurrency, True, UPSTREAM_RETRIES, 2 * args.calls)
+    print_row("outage, hedge + retry", result)
+    print(
+        f"retry budget during outage: {retry_budget.spent - spent_before} extra calls spent, "
+        f"{retry_budget.denied} denied"
+    )
+    await aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds of simulated upstream latency")
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="fraction of requests in the slow tail")
+    parser.add_argument("--slow-latency", type=float, default=1.0, help="seconds a slow request takes")
+    parser.add_argument("--port", type=int, default=8900, help="tail stub port; the outage stub uses the next one")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so point them at the stub first.
+    os.environ.update(stub_env(args.port))
+    tail = start_in_process(args.port, args.latency, 0.0, args.slow_rate, args.slow_latency)
+    outage = start_in_process(args.port + 1, args.latency, 1.0)
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        tail.terminate()
+        outage.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+End-to-end load benchmark for the MCP server over streamable-http.
+
+Starts the upstream stubs (benchmarks.stub_upstreams) and main.py's FastMCP
+server pointed at them, then drives concurrent MCP client sessions through a
+weighted mix of tool calls. Reports throughput, p50/p95/p99 latency per tool
+and the server's memory use (summed over its worker processes). Runs entirely on localhost, and a fixed seed makes
+the call sequence reproducible between runs.
+
+Run with:
+    python -m benchmarks.load --clients 20 --duration 30 --latency 0.1
+    python -m benchmarks.load --failure-rate 0.2 --json results.json
+    python -m benchmarks.load --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import date, timedelta
+from pathlib import Path
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from benchmarks.stub_upstreams import start_in_process, stub_env, wait_for_port
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DESTINATIONS = ["Kandy", "Ella", "Galle", "Sigiriya", "Nuwara Eliya", "Jaffna", "Trincomalee", "Colombo"]
+USERS = ["alice", "bob", "chathura", "dilini", "eranga"]
+
+
+def _day(offset: int) -> str:
+    return (date.today() + timedelta(days=offset)).isoformat()
+
+
+# (weight, tool name, argument factory) for a typical trip-planning session
+TOOL_MIX = [
+    (10, "validate_future_date", lambda rng: {"date": _day(rng.randint(-5, 200))}),
+    (20, "get_weather", lambda rng: {"location": rng.choice(DESTINATIONS), "date": _day(rng.randint(-10, 20))}),
+    (5, "get_weather_range", lambda rng: {"location": rng.choice(DESTINATIONS), "start_date": _day(rng.randint(1, 5)), "end_date": _day(rng.randint(6, 12))}),
+    (15, "get_nearby_location_activities", lambda rng: {"location": rng.choice(DESTINATIONS)}),
+    (15, "get_all_location_for_designation", lambda rng: {"location": rng.choice(DESTINATIONS)}),
+    (10, "get_past_activities", lambda rng: {"user": rng.choice(USERS)}),
+    (10, "get_past_locations", lambda rng: {"user": rng.choice(USERS)}),
+    (5, "get_weather_batch", lambda rng: {"locations": rng.sample(DESTINATIONS, 3), "date": _day(rng.randint(1, 10))}),
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the pct-th percentile of a non-empty list using nearest rank."""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))]
+
+
+def _process_tree(pid: int) -> list[int]:
+    pids = [pid]
+    for parent in pids:
+        try:
+            with open(f"/proc/{parent}/task/{parent}/children") as f:
+                pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+def read_memory_kb(pid: int) -> dict:
+    """Read the current (VmRSS) and peak (VmHWM) resident memory of a process and its workers on Linux."""
+    memory = {}
+    for process in _process_tree(pid):
+        try:
+            with open(f"/proc/{process}/status") as f:
+                for line in f:
+                    if line.startswith(("VmRSS:", "VmHWM:")):
+                        key, value = line.split(":")
+                        memory[key] = memory.get(key, 0) + int(value.split()[0])
+        except OSError:
+            pass
+    return memory
+
+
+async def run_client(url: str, seed: int, deadline: float, max_calls: int | None, samples: dict, errors: dict) -> None:
+    """Open one MCP session and issue weighted random tool calls until the deadline."""
+    rng = random.Random(seed)
+    weights = [weight for weight, _, _ in TOOL_MIX]
+    async with streamablehttp_client(url) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            calls = 0
+            while time.monotonic() < deadline and (max_calls is None or calls < max_calls):
+                _, name, make_args = rng.choices(TOOL_MIX, weights)[0]
+                start = time.perf_counter()
+                try:
+                    result = await session.call_tool(name, make_args(rng))
+                    if result.isError:
+                        errors[name] = errors.get(name, 0) + 1
+                except Exception:
+                    errors[name] = errors.get(name, 0) + 1
+                samples.setdefault(name, []).append(time.perf_counter() - start)
+                calls += 1
+
+
+async def drive(url: str, server_pid: int, args: argparse.Namespace) -> dict:
+    """Run every client concurrently while sampling server memory, and summarize the results."""
+    samples: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    memory_before = read_memory_kb(server_pid)
+    rss_samples = []
+
+    async def sample_memory() -> None:
+        while True:
+            rss_samples.append(read_memory_kb(server_pid).get("VmRSS", 0))
+            await asyncio.sleep(0.5)
+
+    sampler = asyncio.create_task(sample_memory())
+    deadline = time.monotonic() + args.duration
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(url, args.seed + i, deadline, args.calls_per_client, samples, errors)
+        for i in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+    memory_after = read_memory_kb(server_pid)
+
+    total = sum(len(v) for v in samples.values())
+    per_tool = {
+        name: {
+            "calls": len(latencies),
+            "errors": errors.get(name, 0),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        }
+        for name, latencies in sorted(samples.items())
+    }
+    all_latencies = [latency for values in samples.values() for latency in values]
+    return {
+        "config": {
+            "clients": args.clients,
+            "workers": args.workers,
+            "duration_s": args.duration,
+            "calls_per_client": args.calls_per_client,
+            "latency_s": args.latency,
+            "failure_rate": args.failure_rate,
+            "seed": args.seed,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "calls": total,
+        "throughput_calls_per_s": round(total / elapsed, 2),
+        "overall": {
+            "p50_ms": round(percentile(all_latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(all_latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(all_latencies, 99) * 1000, 2),
+        } if all_latencies else {},
+        "tools": per_tool,
+        "memory_kb": {
+            "rss_before": memory_before.get("VmRSS"),
+            "rss_after": memory_after.get("VmRSS"),
+            "rss_peak": memory_after.get("VmHWM"),
+            "rss_mean_under_load": round(statistics.fmean(rss_samples)) if rss_samples else None,
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    config = report["config"]
+    print(
+        f"{config['clients']} clients, {config['workers']} workers, {report['elapsed_s']:.1f} s, upstream latency "
+        f"{config['latency_s'] * 1000:.0f} ms, failure rate {config['failure_rate']:.0%}"
+    )
+    print(f"{report['calls']} calls, {report['throughput_calls_per_s']:.1f} calls/s")
+    print(f"{'tool':<36} {'calls':>6} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, stats in report["tools"].items():
+        print(f"{name:<36} {stats['calls']:>6} {stats['errors']:>6} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}")
+    if report["overall"]:
+        overall = report["overall"]
+        print(f"{'all tools':<36} {report['calls']:>6} {'':>6} {overall['p50_ms']:>8.1f} {overall['p95_ms']:>8.1f} {overall['p99_ms']:>8.1f}")
+    memory = report["memory_kb"]
+    print(
+        f"server RSS: {memory['rss_before']} kB before, {memory['rss_after']} kB after, "
+        f"{memory['rss_peak']} kB peak"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=20, help="concurrent MCP sessions")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--calls-per-client", type=int, default=None, help="stop each client after this many calls")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds of simulated upstream latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of upstream requests failing with 503")
+    parser.add_argument("--workers", type=int, default=1, help="server worker processes")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--server-port", type=int, default=8765)
+    parser.add_argument("--stub-port", type=int, default=8900)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    stub = start_in_process(args.stub_port, args.latency, args.failure_rate)
+    env = {
+        **os.environ,
+        **stub_env(args.stub_port),
+        "SERVER_PORT": str(args.server_port),
+        "SERVER_WORKERS": str(args.workers),
+        "LOG_LEVEL": "WARNING",
+    }
+    server = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, env=env)
+    try:
+        wait_for_port(args.server_port)
+        url = f"http://127.0.0.1:{args.server_port}/mcp"
+        report = asyncio.run(drive(url, server.pid, args))
+        with urllib.request.urlopen(f"http://127.0.0.1:{args.server_port}/stats", timeout=5) as resp:
+            report["server_stats"] = json.load(resp)
+    finally:
+        server.terminate()
+        server.wait()
+        stub.terminate()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Local stand-ins for the localhost:3000 backend API and the Open-Meteo endpoints.
+
+Every route sleeps for a configurable latency before answering and fails a
+configurable fraction of requests with HTTP 503, so benchmarks can measure how
+the tools behave against slow or flaky upstreams without any network. A
+fraction of requests can be made much slower to simulate a latency tail, and
+the stub can be limited to serving a number of requests at once, queueing the
+rest, to simulate a saturated upstream.
+
+Run standalone with:
+    python -m benchmarks.stub_upstreams --port 8900 --latency 0.2 --failure-rate 0.05
+"""
+
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import random
+import socket
+import time
+from datetime import date, timedelta
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+ACTIVITIES = [
+    {"activity": "Hiking to Ella Rock viewpoint", "date": "2025-11-15", "budget": 2500, "category": ["hiking", "nature"]},
+    {"activity": "Rainforest trekking in Sinharaja", "date": "2025-11-16", "budget": 3000, "category": ["nature", "wildlife"]},
+    {"activity": "Climb Pidurangala Rock", "date": "2025-11-18", "budget": 2000, "category": ["hiking", "cultural"]},
+]
+
+LOCATIONS = [
+    {"location": "Ella Rock, Badulla", "date": "2025-11-15", "group_size": 4, "category": ["hiking", "nature"]},
+    {"location": "Sinharaja Forest Reserve, Deniyaya", "date": "2025-11-16", "group_size": 5, "category": ["nature", "wildlife"]},
+    {"location": "Pidurangala Rock, Sigiriya", "date": "2025-11-18", "group_size": 2, "category": ["hiking", "cultural"]},
+]
+
+PLACES = [
+    {
+        "name": "Temple of the Tooth Relic",
+        "location": "Temple of the Tooth Relic",
+        "distance_km": 1.0,
+        "activities": ["Cultural sightseeing", "Religious worship"],
+        "category": ["cultural", "religious", "historical"],
+        "description": "Sacred Buddhist temple. Budget: 500-1000 LKR (entrance fee). Allow 2-3 hours.",
+    },
+    {
+        "name": "Peradeniya Botanical Garden",
+        "location": "Peradeniya Botanical Garden",
+        "distance_km": 6.0,
+        "activities": ["Nature walk", "Photography", "Picnic"],
+        "category": ["nature", "photography", "family"],
+        "description": "Royal botanical garden. Budget: 1500-2500 LKR (entrance fee plus refreshments). Allow 3-4 hours.",
+    },
+    {
+        "name": "Udawattakele Forest Reserve",
+        "location": "Udawattakele Forest Reserve",
+        "distance_km": 2.5,
+        "activities": ["Nature walk", "Bird watching"],
+        "category": ["nature", "wildlife", "hiking"],
+        "description": "Historic forest sanctuary. Budget: 300-800 LKR (entrance fee). Allow 2-4 hours.",
+    },
+]
+
+
+def create_app(
+    latency: float = 0.0,
+    failure_rate: float = 0.0,
+    slow_rate: float = 0.0,
+    slow_latency: float = 1.0,
+    capacity: int = 0,
+) -> Starlette:
+    """
+    Build the stub upstream application.
+
+    Args:
+        latency: Seconds every route waits before responding
+        failure_rate: Fraction of requests answered with HTTP 503
+        slow_rate: Fraction of requests that wait `slow_latency` seconds instead
+        slow_latency: Seconds a slow request waits before responding
+        capacity: Requests served at once, the rest waiting their turn; 0 for no limit
+
+    Returns:
+        A Starlette app serving the backend and Open-Meteo routes.
+    """
+
+    slots = asyncio.Semaphore(capacity) if capacity else contextlib.nullcontext()
+
+    async def respond(payload) -> JSONResponse:
+        delay = slow_latency if slow_rate and random.random() < slow_rate else latency
+        if delay:
+            async with slots:
+                await asyncio.sleep(delay)
+        if failure_rate and random.random() < failure_rate:
+            return JSONResponse({"error": "stub failure"}, status_code=503)
+        return JSONResponse(payload)
+
+    def since(request: Request, rows: list) -> list:
+        # History routes return only rows dated on or after ?since=, like the delta sync expects
+        first = request.query_params.get("since", "")
+        return [row for row in rows if row["date"] >= first]
+
+    async def activities(request: Request) -> JSONResponse:
+        return await respond(since(request, ACTIVITIES))
+
+    async def locations(request: Request) -> JSONResponse:
+        return await respond(since(request, LOCATIONS))
+
+    async def location(request: Request) -> JSONResponse:
+        return await respond(PLACES)
+
+    async def search(request: Request) -> JSONResponse:
+        name = request.query_params.get("name", "")
+        seed = sum(map(ord, name.lower()))
+        return await respond({
+            "results": [{
+                "name": name.title(),
+                "latitude": 6.0 + (seed % 300) / 100,
+                "longitude": 80.0 + (seed % 170) / 100,
+                "country": "Sri Lanka",
+            }]
+        })
+
+    async def daily(request: Request) -> JSONResponse:
+        params = request.query_params
+        if "current" in params:
+            return await respond({
+                "current": {
+                    "time": time.strftime("%Y-%m-%dT%H:%M"),
+                    "temperature_2m": 27.1,
+                    "relative_humidity_2m": 78,
+                    "apparent_temperature": 29.4,
+                    "precipitation": 0.0,
+                    "weather_code": 2,
+                    "wind_speed_10m": 9.5,
+                }
+            })
+        start = date.fromisoformat(params["start_date"])
+        end = date.fromisoformat(params["end_date"])
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        return await respond({
+            "daily": {
+                "time": [d.isoformat() for d in days],
+                "temperature_2m_max": [29.0 + d.day % 3 for d in days],
+                "temperature_2m_min": [19.0 + d.day % 2 for d in days],
+                "temperature_2m_mean": [24.0 for _ in days],
+                "precipitation_sum": [float(d.day % 5) for d in days],
+                "weather_code": [(0, 2, 3, 61, 80)[d.day % 5] for d in days],
+                "wind_speed_10m_max": [10.0 + d.day % 4 for d in days],
+            }
+        })
+
+    return Starlette(routes=[
+        Route("/api/activities", activities),
+        Route("/api/locations", locations),
+        Route("/api/location", location),
+        Route("/v1/search", search),
+        Route("/v1/forecast", daily),
+        Route("/v1/archive", daily),
+    ])
+
+
+def stub_env(port: int) -> dict:
+    """
+    Environment variables that point the tools at a stub on the given port.
+
+    Args:
+        port: Port the stub server listens on
+
+    Returns:
+        A mapping of setting names to stub URLs.
+    """
+    base = f"http://127.0.0.1:{port}"
+    return {
+        "BACKEND_API_URL": f"{base}/api",
+        "GEOCODING_URL": f"{base}/v1/search",
+        "FORECAST_URL": f"{base}/v1/forecast",
+        "ARCHIVE_URL": f"{base}/v1/archive",
+    }
+
+
+def serve(
+    port: int,
+    latency: float = 0.0,
+    failure_rate: float = 0.0,
+    slow_rate: float = 0.0,
+    slow_latency: float = 1.0,
+    capacity: int = 0,
+) -> None:
+    """
+    Serve the stub app in the foreground until interrupted.
+
+    Args:
+        port: Port to listen on
+        latency: Seconds every route waits before responding
+        failure_rate: Fraction of requests answered with HTTP 503
+        slow_rate: Fraction of requests that wait `slow_latency` seconds instead
+        slow_latency: Seconds a slow request waits before responding
+        capacity: Requests served at once, the rest waiting their turn; 0 for no limit
+    """
+    uvicorn.run(
+        create_app(latency, failure_rate, slow_rate, slow_latency, capacity), host="127.0.0.1", port=port, log_level="warning"
+    )
+
+
+def start_in_process(
+    port: int,
+    latency: float = 0.0,
+    failure_rate: float = 0.0,
+    slow_rate: float = 0.0,
+    slow_latency: float = 1.0,
+    capacity: int = 0,
+) -> multiprocessing.Process:
+    """
+    Serve the stub app from a child process and wait until it accepts connections.
+
+    A separate process keeps the stub from competing with the benchmarked
+    event loop for the GIL.
+
+    Args:
+        port: Port to listen on
+        latency: Seconds every route waits before responding
+        failure_rate: Fraction of requests answered with HTTP 503
+        slow_rate: Fraction of requests that wait `slow_latency` seconds instead
+        slow_latency: Seconds a slow request waits before responding
+        capacity: Requests served at once, the rest waiting their turn; 0 for no limit
+
+    Returns:
+        The running process; call `terminate()` to stop it.
+    """
+    process = multiprocessing.Process(
+        target=serve, args=(port, latency, failure_rate, slow_rate, slow_latency, capacity), daemon=True
+    )
+    process.start()
+    wait_for_port(port)
+    return process
+
+
+def wait_for_port(port: int, timeout: float = 30) -> None:
+    """
+    Block until something accepts TCP connections on a local port.
+
+    Args:
+        port: Port to poll
+        timeout: Seconds to wait before giving up
+
+    Raises:
+        TimeoutError: If nothing is listening after `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Nothing is listening on port {port}")
+            time.sleep(0.05)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds of simulated upstream latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 503")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="fraction of requests answered after --slow-latency")
+    parser.add_argument("--slow-latency", type=float, default=1.0, help="seconds a slow request waits")
+    parser.add_argument("--capacity", type=int, default=0, help="requests served at once; 0 for no limit")
+    args = parser.parse_args()
+    serve(args.port, args.latency, args.failure_rate, args.slow_rate, args.slow_latency, args.capacity)
+
+
+if __name__ == "__main__":
+    main()
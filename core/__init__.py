@@ -0,0 +1 @@
+"""Shared infrastructure used by the MCP Server tools."""
@@ -0,0 +1,243 @@
+"""Admission control for tool calls: concurrency caps, a bounded priority queue and load shedding."""
+
+import asyncio
+import bisect
+import functools
+import inspect
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from core.settings import (
+    ADMISSION_MAX_CONCURRENT,
+    ADMISSION_PER_SESSION,
+    ADMISSION_PRIORITY_TOOLS,
+    ADMISSION_QUEUE_SIZE,
+    ADMISSION_QUEUE_TIMEOUT,
+)
+from core.tracing import span
+
+# Queue priorities; lower is served first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+
+
+class Busy(Exception):
+    """Raised when a call is shed instead of admitted."""
+
+    def __init__(self, reason: str, retry_after: float) -> None:
+        super().__init__(f"Server busy ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def result(self, tool: str) -> dict:
+        """
+        Build the structured result returned to the client in place of the tool's.
+
+        Args:
+            tool: Name of the shed tool
+
+        Returns:
+            Dictionary with an error message, the reason and a suggested retry delay.
+        """
+        return {
+            "error": "Server is busy, please retry shortly",
+            "busy": True,
+            "reason": self.reason,
+            "tool": tool,
+            "retry_after_s": self.retry_after,
+        }
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    session: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class AdmissionController:
+    """
+    Caps how many tool calls run at once, overall and per session. Calls
+    with no session key ("") count only against the overall cap.
+
+    A call that cannot start waits in a queue ordered by priority, then
+    arrival. Whenever a call finishes, the first waiter whose session is
+    under its cap starts. A call is shed with Busy when the queue is full or
+    it has waited `queue_timeout` seconds. A high-priority arrival finding
+    the queue full takes the place of the newest lower-priority waiter,
+    which is shed instead.
+    """
+
+    def __init__(self, max_concurrent: int, per_session: int, queue_size: int, queue_timeout: float) -> None:
+        """
+        Args:
+            max_concurrent: Calls running at once across all sessions; 0 for no limit
+            per_session: Calls running at once per session; 0 for no limit
+            queue_size: Calls allowed to wait; 0 sheds every call that cannot start
+            queue_timeout: Seconds a call waits before it is shed
+        """
+        self.max_concurrent = max_concurrent
+        self.per_session = per_session
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.admitted = 0
+        self.queued = 0
+        self.shed: dict[str, int] = {}
+        self.peak_queue = 0
+        self._sessions: dict[str, int] = {}
+        self._queue: list[_Waiter] = []
+        self._seq = itertools.count()
+        # Moving average of call durations, for the retry hint
+        self._service_time = 0.1
+
+    def _has_room(self, session: str) -> bool:
+        if self.max_concurrent and self.in_flight >= self.max_concurrent:
+            return False
+        if not self.per_session or not session:
+            return True
+        return self._sessions.get(session, 0) < self.per_session
+
+    def _start(self, session: str) -> None:
+        self.in_flight += 1
+        self.admitted += 1
+        self._sessions[session] = self._sessions.get(session, 0) + 1
+
+    def _busy(self, reason: str) -> Busy:
+        self.shed[reason] = self.shed.get(reason, 0) + 1
+        slots = self.max_concurrent or max(self.in_flight, 1)
+        retry_after = self._service_time * (len(self._queue) + 1) / slots
+        return Busy(reason, round(min(max(retry_after, 0.1), self.queue_timeout or 1.0), 2))
+
+    def _dispatch(self) -> None:
+        for waiter in list(self._queue):
+            if self.max_concurrent and self.in_flight >= self.max_concurrent:
+                break
+            if self._has_room(waiter.session):
+                self._queue.remove(waiter)
+                self._start(waiter.session)
+                waiter.future.set_result(None)
+
+    async def acquire(self, session: str, priority: int = PRIORITY_NORMAL) -> None:
+        """
+        Wait until a call may start.
+
+        Args:
+            session: Key of the calling session; "" if it has none
+            priority: PRIORITY_HIGH or PRIORITY_NORMAL
+
+        Raises:
+            Busy: If the call is shed.
+        """
+        if self._has_room(session):
+            self._start(session)
+            return
+        if len(self._queue) >= self.queue_size:
+            if not self._queue or self._queue[-1].priority <= priority:
+                raise self._busy("queue_full")
+            displaced = self._queue.pop()
+            displaced.future.set_exception(self._busy("queue_full"))
+
+        waiter = _Waiter(priority, next(self._seq), session, asyncio.get_running_loop().create_future())
+        bisect.insort(self._queue, waiter)
+        self.queued += 1
+        self.peak_queue = max(self.peak_queue, len(self._queue))
+        try:
+            with span("admission wait", waiting=len(self._queue)):
+                await asyncio.wait([waiter.future], timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.exception():
+                self.release(session)
+            elif waiter in self._queue:
+                self._queue.remove(waiter)
+            raise
+        if not waiter.future.done():
+            self._queue.remove(waiter)
+            waiter.future.cancel()
+            raise self._busy("queue_timeout")
+        waiter.future.result()
+
+    def release(self, session: str, duration: float | None = None) -> None:
+        """
+        Record that a call finished and start waiting calls that now fit.
+
+        Args:
+            session: Key of the session the call belonged to
+            duration: How long the call ran, in seconds
+        """
+        self.in_flight -= 1
+        remaining = self._sessions[session] - 1
+        if remaining:
+            self._sessions[session] = remaining
+        else:
+            del self._sessions[session]
+        if duration is not None:
+            self._service_time += 0.1 * (duration - self._service_time)
+        self._dispatch()
+
+    def stats(self) -> dict:
+        """
+        Report running and waiting calls, and how many were admitted, queued and shed.
+
+        Returns:
+            Dictionary of gauges and counters.
+        """
+        return {
+            "in_flight": self.in_flight,
+            "waiting": len(self._queue),
+            "sessions": len(self._sessions),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "peak_queue": self.peak_queue,
+            "shed_queue_full": self.shed.get("queue_full", 0),
+            "shed_queue_timeout": self.shed.get("queue_timeout", 0),
+            "max_concurrent": self.max_concurrent,
+            "per_session": self.per_session,
+        }
+
+
+admission = AdmissionController(
+    ADMISSION_MAX_CONCURRENT, ADMISSION_PER_SESSION, ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT
+)
+
+
+def admission_controlled(fn: Callable, session: Callable[[], str]) -> Callable:
+    """
+    Wrap a tool so every call passes admission control first.
+
+    The wrapper keeps the tool's name, docstring and signature, so it can be
+    registered with mcp.tool() in place of the tool itself. Tools listed in
+    ADMISSION_PRIORITY_TOOLS are queued ahead of the others.
+
+    Args:
+        fn: Tool function, sync or async
+        session: Returns the key of the session making the current call, or
+            "" if it cannot be told apart from other clients
+
+    Returns:
+        An async function that runs the tool once admitted, or returns a busy
+        result if the call is shed.
+    """
+    name = fn.__name__
+    priority = PRIORITY_HIGH if name in ADMISSION_PRIORITY_TOOLS else PRIORITY_NORMAL
+
+    @functools.wraps(fn)
+    async def wrapper(**kwargs) -> Any:
+        key = session()
+        try:
+            await admission.acquire(key, priority)
+        except Busy as busy:
+            return busy.result(name)
+        start = time.perf_counter()
+        try:
+            result = fn(**kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        finally:
+            admission.release(key, time.perf_counter() - start)
+
+    return wrapper
@@ -0,0 +1,67 @@
+"""Concurrent fan-out of tool calls for the batch and composite tools."""
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from core.fallback import call_tracking_fallback
+from core.settings import BATCH_CONCURRENCY, BATCH_MAX_ITEMS
+
+
+async def run_tracked(fn: Callable[..., Awaitable[Any]], **kwargs) -> dict:
+    """
+    Call a tool and describe how its call went.
+
+    Args:
+        fn: Async tool function to call
+        **kwargs: Arguments for the tool
+
+    Returns:
+        Dictionary with a status of "ok", "fallback" or "error", and the tool's
+        data, the fallback reason or the error message.
+    """
+    try:
+        data, fallback_reason = await call_tracking_fallback(fn, **kwargs)
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+    if isinstance(data, dict) and isinstance(data.get("error"), str):
+        return {"status": "error", "error": data["error"], "data": data}
+    if fallback_reason is not None:
+        return {"status": "fallback", "reason": fallback_reason, "data": data}
+    return {"status": "ok", "data": data}
+
+
+async def fan_out(fn: Callable[..., Awaitable[Any]], key: str, values: list[str], **kwargs) -> dict:
+    """
+    Call a tool once per input value with bounded parallelism and combine the results.
+
+    Args:
+        fn: Async tool function to call
+        key: Name of the tool argument each value is passed as (e.g., "location")
+        values: Input values, one tool call each
+        **kwargs: Extra arguments passed to every call
+
+    Returns:
+        Dictionary with per-status counts and a "results" list in input order. Each
+        item holds its input value, a status of "ok", "fallback" or "error", and
+        the tool's data (or the error message).
+    """
+    if len(values) > BATCH_MAX_ITEMS:
+        return {
+            "error": f"Too many items requested ({len(values)}). Please send at most {BATCH_MAX_ITEMS} per batch.",
+            "count": len(values)
+        }
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run_one(value: str) -> dict:
+        async with semaphore:
+            return {key: value, **await run_tracked(fn, **{key: value}, **kwargs)}
+
+    results = await asyncio.gather(*(run_one(value) for value in values))
+    return {
+        "count": len(results),
+        "ok": sum(1 for r in results if r["status"] == "ok"),
+        "fallback": sum(1 for r in results if r["status"] == "fallback"),
+        "error": sum(1 for r in results if r["status"] == "error"),
+        "results": results
+    }
@@ -0,0 +1,96 @@
+"""Per-upstream circuit breakers that fail fast while an upstream is down."""
+
+import time
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one upstream.
+
+    The circuit opens after `failure_threshold` consecutive failures and
+    rejects calls immediately. Once `reset_timeout` seconds have passed it
+    turns half-open and lets a single probe call through. A successful probe
+    closes the circuit; a failed one opens it again for another timeout.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        """
+        Args:
+            name: Name of the upstream the breaker protects
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before probing the upstream
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+        self._probing = False
+
+    def before_call(self) -> None:
+        """
+        Check whether a call may go to the upstream.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe already running.
+        """
+        if self.state == "closed":
+            return
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError(f"Circuit for upstream '{self.name}' is open")
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """
+        Record that a call ended with neither outcome, e.g. because it was cancelled.
+
+        If it was the half-open probe, the next call probes instead; without
+        this the circuit would reject every call for good.
+        """
+        if self.state == "half_open":
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if the threshold is reached or a probe failed."""
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.trips += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def stats(self) -> dict:
+        """
+        Report the breaker's state and counters.
+
+        Returns:
+            Dictionary with state, consecutive failures, trips, rejected calls and
+            seconds until the next probe when open.
+        """
+        stats = {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+        if self.state == "open":
+            stats["retry_in_s"] = round(max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)), 3)
+        return stats
@@ -0,0 +1,214 @@
+"""Bounded in-memory caches with TTL and LRU eviction."""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Least-recently-used cache whose entries also expire after a time-to-live.
+
+    Keys must be strings so the cache can optionally be persisted to a JSON
+    file and reloaded on the next start. Changes are written at most once
+    every `save_delay` seconds, from a worker thread, and on flush() at
+    shutdown, so storing an entry never blocks the event loop. With a shared
+    store, entries are also written through to it, and local misses are
+    looked up there, so worker processes share what any of them cached. The
+    store queues those writes for a worker thread, but a lookup on a local
+    miss is a synchronous primary-key read of the store's database.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        path: str | None = None,
+        shared: Any = None,
+        namespace: str = "",
+        save_delay: float = 5.0,
+    ) -> None:
+        """
+        Args:
+            maxsize: Maximum number of entries kept before the oldest is evicted
+            ttl: Default lifetime of an entry in seconds
+            path: Optional JSON file the cache is loaded from and saved to
+            shared: Optional core.shared.SharedStore backing the cache
+            namespace: Name of the cache's entries in the shared store
+            save_delay: Seconds after a change before the cache file is rewritten
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.shared = shared
+        self.namespace = namespace
+        self.save_delay = save_delay
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._dirty = False
+        self._save_task: asyncio.Task | None = None
+        self._save_lock = asyncio.Lock()
+        if path:
+            self.load()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Return the cached value for a key, or `default` if it is missing or expired.
+
+        Args:
+            key: Cache key to look up
+            default: Value returned on a miss
+
+        Returns:
+            The cached value or `default`.
+        """
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.time():
+            if entry is not None:
+                del self._data[key]
+            entry = self.shared.get(self.namespace, key) if self.shared is not None else None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._insert(key, entry[0], entry[1])
+            self.hits += 1
+            return entry[1]
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: Cache key to store under
+            value: Value to cache
+            ttl: Lifetime in seconds; defaults to the cache's ttl
+        """
+        ttl = self.ttl if ttl is None else ttl
+        self._insert(key, time.time() + ttl, value)
+        if self.shared is not None:
+            self.shared.set(self.namespace, key, value, ttl)
+        if self.path:
+            self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        self._dirty = True
+        if self._save_task is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to defer to, e.g. a script filling the cache
+            self.save()
+            return
+        self._save_task = loop.create_task(self._save_later())
+
+    async def _save_later(self) -> None:
+        try:
+            await asyncio.sleep(self.save_delay)
+        finally:
+            self._save_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write pending changes to the cache file from a worker thread, if it has one; a failure is logged."""
+        if not self.path:
+            return
+        async with self._save_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            try:
+                await asyncio.to_thread(self._write, dict(self._data))
+            except Exception as e:
+                # Keep the changes pending so the next save or flush tries again
+                self._dirty = True
+                logger.warning("Saving cache file %s failed: %s", self.path, e)
+
+    def expires_in(self, key: str) -> float | None:
+        """
+        Return how long a locally cached entry has left, without counting a lookup.
+
+        Args:
+            key: Cache key to look up
+
+        Returns:
+            Seconds until the entry expires, or None if it is not cached here.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        remaining = entry[0] - time.time()
+        return remaining if remaining > 0 else None
+
+    def _insert(self, key: str, expires: float, value: Any) -> None:
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit and miss counters."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """
+        Report the cache size and hit/miss counters.
+
+        Returns:
+            Dictionary with size, maxsize, hits, misses and hit_ratio.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def load(self) -> None:
+        """Load unexpired entries from the cache file, ignoring a missing or corrupt file."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, (expires, value) in entries.items():
+            if expires >= now:
+                self._data[key] = (expires, value)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def save(self) -> None:
+        """Atomically write the current entries to the cache file, blocking until done."""
+        self._dirty = False
+        self._write(dict(self._data))
+
+    def _write(self, entries: dict) -> None:
+        # Worker processes may share the cache file, so each writes its own temporary file
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
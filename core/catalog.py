@@ -0,0 +1,215 @@
+"""Indexed in-memory catalog of the locations around a designated place."""
+
+import asyncio
+import bisect
+import copy
+import re
+import urllib.parse
+
+from core.cache import TTLCache
+from core.datasets import KANDY_LOCATIONS
+from core.geocoding import normalize_location
+from core.settings import BACKEND_API_URL, BACKEND_FRESH_TTL, BACKEND_TIMEOUT, CATALOG_SIZE
+from core.shaping import shape
+from core.shared import shared_store
+from core.swr import get_backend_json
+from core.tracing import spanned
+
+_BUDGET = re.compile(r"Budget:\s*([^.]*)", re.IGNORECASE)
+# Amounts are the ends of a range or followed by the currency, which skips e.g. "4WD"
+_AMOUNT = re.compile(r"(\d[\d,]*)\s*(?:-|to\b|LKR)", re.IGNORECASE)
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(?:\s*(?:-|to)\s*(\d+(?:\.\d+)?))?\s*(hours?|minutes?)\b", re.IGNORECASE)
+# Durations given in words, checked in order, as (min hours, max hours)
+_DURATION_WORDS = [
+    ("half to full day", (4.0, 8.0)),
+    ("full day", (8.0, 8.0)),
+    ("half day", (4.0, 4.0)),
+]
+
+
+def parse_budget(description: str) -> tuple[float, float] | None:
+    """
+    Extract the budget range in LKR from a location description.
+
+    Args:
+        description: Free text containing e.g. "Budget: 500-1000 LKR (entrance fee)."
+
+    Returns:
+        (minimum, maximum) in LKR, with "Free" counting as a minimum of 0, or
+        None if the description states no budget.
+    """
+    match = _BUDGET.search(description)
+    if not match:
+        return None
+    text = match.group(1)
+    amounts = [float(amount.replace(",", "")) for amount in _AMOUNT.findall(text)]
+    free = "free" in text.lower()
+    if not amounts and not free:
+        return None
+    return (0.0 if free else min(amounts), max(amounts, default=0.0))
+
+
+def parse_duration(description: str) -> tuple[float, float] | None:
+    """
+    Extract the suggested visit duration in hours from a location description.
+
+    Args:
+        description: Free text containing e.g. "Allow 2-3 hours." or "Full day trek"
+
+    Returns:
+        (minimum, maximum) in hours, or None if the description states no duration.
+    """
+    match = _DURATION.search(description)
+    if match:
+        low = float(match.group(1))
+        high = float(match.group(2) or low)
+        if match.group(3).lower().startswith("minute"):
+            low, high = low / 60, high / 60
+        return (low, high)
+    lowered = description.lower()
+    for words, hours in _DURATION_WORDS:
+        if words in lowered:
+            return hours
+    return None
+
+
+class LocationIndex:
+    """
+    Location rows for one designated place, indexed for filtered lookups.
+
+    Categories are kept in an inverted index, and the minimum budget and
+    minimum duration of each row in sorted arrays, so a filter only touches
+    the matching rows.
+    """
+
+    def __init__(self, rows: list) -> None:
+        """
+        Args:
+            rows: Location rows as returned by the backend's /location endpoint
+        """
+        self.rows = rows
+        self.by_category: dict[str, list[int]] = {}
+        budgets = []
+        durations = []
+        for position, row in enumerate(rows):
+            if not isinstance(row, dict):
+                continue
+            for category in row.get("category") or []:
+                self.by_category.setdefault(category.casefold(), []).append(position)
+            description = row.get("description") or ""
+            budget = parse_budget(description)
+            if budget is not None:
+                budgets.append((budget[0], position))
+            duration = parse_duration(description)
+            if duration is not None:
+                durations.append((duration[0], position))
+        budgets.sort()
+        durations.sort()
+        self._budget_keys = [value for value, _ in budgets]
+        self._budget_rows = [position for _, position in budgets]
+        self._duration_keys = [value for value, _ in durations]
+        self._duration_rows = [position for _, position in durations]
+
+    def query(
+        self,
+        categories: list[str] | None = None,
+        max_budget: float | None = None,
+        max_duration_hours: float | None = None,
+        fields: list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list:
+        """
+        Return the rows matching every given filter, in their original order.
+
+        Rows whose description states no budget or duration never match a
+        budget or duration filter.
+
+        Args:
+            categories: Categories a row must all have (e.g., ["nature", "hiking"])
+            max_budget: Highest acceptable minimum cost in LKR
+            max_duration_hours: Highest acceptable minimum visit length in hours
+            fields: Field names to keep in each row, or None for all
+            limit: Maximum number of rows to return, or None for all
+            offset: Number of leading matches to skip
+
+        Returns:
+            Copies of the requested page of matching rows.
+        """
+        candidates = []
+        for category in categories or []:
+            candidates.append(self.by_category.get(category.casefold(), []))
+        if max_budget is not None:
+            candidates.append(self._budget_rows[:bisect.bisect_right(self._budget_keys, max_budget)])
+        if max_duration_hours is not None:
+            candidates.append(self._duration_rows[:bisect.bisect_right(self._duration_keys, max_duration_hours)])
+
+        if not candidates:
+            matches = range(len(self.rows))
+        else:
+            candidates.sort(key=len)
+            matching = set(candidates[0])
+            for positions in candidates[1:]:
+                matching.intersection_update(positions)
+            matches = sorted(matching)
+        return copy.deepcopy(shape([self.rows[position] for position in matches], fields, limit, offset))
+
+
+# Built-in datasets, indexed once at startup and served when the backend is unavailable
+BUILTIN_INDEXES = {
+    "kandy": LocationIndex(KANDY_LOCATIONS),
+}
+
+# Indexes of backend payloads, rebuilt when the backend copy may have changed
+catalog_cache = TTLCache(CATALOG_SIZE, BACKEND_FRESH_TTL)
+
+
+@spanned("catalog")
+async def location_index(location: str, refresh: bool = False) -> LocationIndex:
+    """
+    Return the indexed locations around a designated place, loading them from the backend on a miss.
+
+    Args:
+        location: The designated location (e.g., "Kandy")
+        refresh: Reload the rows from the backend even if they are cached
+
+    Returns:
+        A LocationIndex over the backend's rows for the location.
+
+    Raises:
+        Exception: If the location is not cached and the backend request fails.
+    """
+    key = normalize_location(location)
+    index = catalog_cache.get(key) if not refresh else None
+    if index is not None:
+        return index
+
+    # Other workers may have loaded the rows already; the index itself is per process
+    entry = None
+    if shared_store is not None and not refresh:
+        entry = await asyncio.to_thread(shared_store.get, "catalog", key)
+    if entry is not None:
+        rows = entry[1]
+    else:
+        encoded = urllib.parse.quote(location)
+        url = f"{BACKEND_API_URL}/location?location={encoded}"
+        rows = await get_backend_json(url, timeout=BACKEND_TIMEOUT, refresh=refresh)
+        if shared_store is not None:
+            shared_store.set("catalog", key, rows, BACKEND_FRESH_TTL)
+
+    index = LocationIndex(rows)
+    catalog_cache.set(key, index)
+    return index
+
+
+def builtin_index(location: str) -> LocationIndex | None:
+    """
+    Return the built-in indexed dataset for a designated place, if there is one.
+
+    Args:
+        location: The designated location (e.g., "Kandy")
+
+    Returns:
+        The LocationIndex, or None if no built-in dataset covers the location.
+    """
+    return BUILTIN_INDEXES.get(normalize_location(location))
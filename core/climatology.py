@@ -0,0 +1,157 @@
+"""Memory-mapped table of monthly climate normals for offline weather estimates."""
+
+import mmap
+import struct
+
+from core.geocoding import normalize_location
+from core.settings import CLIMATOLOGY_PATH
+from core.spatial import SpatialIndex
+
+# File layout (little-endian): a header, then one fixed-size record per
+# station holding its name, country, coordinates and, for each month,
+# FIELDS as float32 values.
+MAGIC = b"CLIM"
+VERSION = 1
+FIELDS = ("temperature_max", "temperature_min", "precipitation_mm", "wind_speed_max_kmh", "weather_code")
+HEADER = struct.Struct("<4sHHI")
+STATION = struct.Struct("<32s32sff")
+NORMALS = struct.Struct("<" + "f" * len(FIELDS))
+RECORD_SIZE = STATION.size + 12 * NORMALS.size
+
+
+def write_table(path: str, stations: list[dict]) -> None:
+    """
+    Write a climatology table file.
+
+    Args:
+        path: Output file
+        stations: Stations, each with name, country, latitude, longitude and
+                  "months": twelve dictionaries keyed by FIELDS, January first
+    """
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 12, len(stations)))
+        for station in stations:
+            f.write(STATION.pack(
+                station["name"].encode()[:32],
+                station["country"].encode()[:32],
+                station["latitude"],
+                station["longitude"],
+            ))
+            for month in station["months"]:
+                f.write(NORMALS.pack(*(month[field] for field in FIELDS)))
+
+
+class ClimatologyTable:
+    """
+    Read-only view of a climatology table file.
+
+    Station names and coordinates are read once at open and indexed; the
+    monthly normals stay in the memory-mapped file and are unpacked only for
+    the station and month asked for.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path: Table file written by write_table
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not a climatology table.
+        """
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, months, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or months != 12:
+            raise ValueError(f"{path} is not a climatology table")
+        if len(self._map) < HEADER.size + count * RECORD_SIZE:
+            raise ValueError(f"{path} is truncated")
+
+        self.stations: list[dict] = []
+        self._by_name: dict[str, int] = {}
+        self._index = SpatialIndex(1.0)
+        for position in range(count):
+            name, country, latitude, longitude = STATION.unpack_from(self._map, self._offset(position))
+            station = {
+                "name": name.rstrip(b"\0").decode(),
+                "country": country.rstrip(b"\0").decode(),
+                "latitude": round(latitude, 4),
+                "longitude": round(longitude, 4),
+                "position": position,
+            }
+            self.stations.append(station)
+            self._by_name[normalize_location(station["name"])] = position
+            self._index.add(station["latitude"], station["longitude"], station)
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    @staticmethod
+    def _offset(position: int) -> int:
+        return HEADER.size + position * RECORD_SIZE
+
+    def find(self, location: str) -> dict | None:
+        """
+        Find a station by place name, without any network call.
+
+        Args:
+            location: Place name, optionally followed by a region (e.g., "Kandy, Sri Lanka")
+
+        Returns:
+            The station, or None if no station has that name.
+        """
+        position = self._by_name.get(normalize_location(location.split(",")[0]))
+        return self.stations[position] if position is not None else None
+
+    def nearest(self, latitude: float, longitude: float, max_km: float) -> dict | None:
+        """
+        Find the station closest to a point.
+
+        Args:
+            latitude: Latitude in degrees
+            longitude: Longitude in degrees
+            max_km: Ignore stations farther than this many kilometres
+
+        Returns:
+            The station with a "distance_km" field added, or None if none is close enough.
+        """
+        found = self._index.nearest(latitude, longitude, 1, max_km)
+        if not found:
+            return None
+        distance, station = found[0]
+        return {**station, "distance_km": round(distance, 1)}
+
+    def normals(self, station: dict, month: int) -> dict:
+        """
+        Read a station's normals for one month.
+
+        Args:
+            station: Station returned by find or nearest
+            month: Month number, 1 for January
+
+        Returns:
+            Dictionary keyed by FIELDS.
+        """
+        offset = self._offset(station["position"]) + STATION.size + (month - 1) * NORMALS.size
+        return dict(zip(FIELDS, NORMALS.unpack_from(self._map, offset)))
+
+
+_table: ClimatologyTable | None = None
+_loaded = False
+
+
+def climatology_table() -> ClimatologyTable | None:
+    """
+    Return the table at CLIMATOLOGY_PATH, opening it on first use.
+
+    Returns:
+        The table, or None if the file is missing or invalid.
+    """
+    global _table, _loaded
+    if not _loaded:
+        _loaded = True
+        try:
+            _table = ClimatologyTable(CLIMATOLOGY_PATH)
+        except (OSError, ValueError):
+            _table = None
+    return _table
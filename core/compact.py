@@ -0,0 +1,258 @@
+"""Compact tool output: columnar tables, references to data already sent and truncated text."""
+
+import functools
+import hashlib
+import inspect
+import json
+import re
+from collections import OrderedDict
+from typing import Any, Callable
+
+from mcp.types import CallToolResult, TextContent
+
+from core.settings import COMPACT_MAX_SESSIONS, COMPACT_REFS_PER_SESSION
+
+# Objects smaller than this many bytes of JSON are repeated rather than referenced
+MIN_REF_BYTES = 64
+
+_OPTIONS_DOC = [
+    'compact: Return lists of objects as {"columns", "rows"} tables, and objects already sent to this session'
+    ' as {"$ref": id} naming the "$id" they were sent with',
+    "max_text_chars: Shorten longer texts to their leading sentences, ending in an ellipsis",
+]
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """
+    Shorten a text to at most `max_chars` characters.
+
+    Whole leading sentences are kept if they fill at least half of the limit,
+    otherwise whole words; a trailing ellipsis marks the cut.
+
+    Args:
+        text: Text to shorten
+        max_chars: Maximum length of the result, ellipsis included
+
+    Returns:
+        The text itself if it fits, else its shortened form.
+    """
+    if len(text) <= max_chars:
+        return text
+    head = text[:max(max_chars - 1, 0)]
+    for boundary in (". ", " "):
+        cut = head.rfind(boundary)
+        if cut >= max_chars // 2:
+            return head[:cut + 1].rstrip() + "…"
+    return head + "…"
+
+
+def columnar(rows: list) -> dict | None:
+    """
+    Encode a list of objects as a table.
+
+    Args:
+        rows: Rows to encode
+
+    Returns:
+        {"columns": [...], "rows": [[...], ...]}, with "same" holding the
+        columns whose value is equal in every row, or None if the list has
+        fewer than two rows or holds anything but objects. A key missing from
+        a row is encoded as null.
+    """
+    if len(rows) < 2 or not all(isinstance(row, dict) for row in rows):
+        return None
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    same = {}
+    for column in columns:
+        first = rows[0].get(column)
+        if all(column in row and row[column] == first for row in rows):
+            same[column] = first
+    columns = [column for column in columns if column not in same]
+    table: dict = {"columns": columns, "rows": [[row.get(column) for column in columns] for row in rows]}
+    if same:
+        table["same"] = same
+    return table
+
+
+def _fingerprint(value: dict) -> tuple[str, int]:
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=6).hexdigest(), len(encoded)
+
+
+class SessionReferences:
+    """
+    Remembers which objects each session was sent, so they are sent only once.
+
+    Every object of at least MIN_REF_BYTES is sent with an "$id" the first
+    time and replaced by {"$ref": id} afterwards. Ids are derived from the
+    object's content, so an object changed since it was sent is sent again.
+    Each session keeps its most recently used `per_session` ids, and the
+    least recently active sessions are forgotten beyond `max_sessions`.
+    """
+
+    def __init__(self, max_sessions: int, per_session: int) -> None:
+        """
+        Args:
+            max_sessions: Sessions remembered at once
+            per_session: Ids remembered per session
+        """
+        self.max_sessions = max_sessions
+        self.per_session = per_session
+        self.sent = 0
+        self.referenced = 0
+        self._sessions: OrderedDict[str, OrderedDict[str, None]] = OrderedDict()
+
+    def _seen(self, session: str) -> OrderedDict[str, None]:
+        seen = self._sessions.get(session)
+        if seen is None:
+            seen = self._sessions[session] = OrderedDict()
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session)
+        return seen
+
+    def encode(self, value: Any, session: str) -> Any:
+        """
+        Replace objects the session was already sent by references to them.
+
+        Args:
+            value: Encoded result
+            session: Key of the receiving session
+
+        Returns:
+            The result with "$id" added to newly sent objects and earlier ones
+            replaced by {"$ref": id}.
+        """
+        seen = self._seen(session)
+
+        def walk(item: Any) -> Any:
+            if isinstance(item, list):
+                return [walk(element) for element in item]
+            if not isinstance(item, dict):
+                return item
+            ref, size = _fingerprint(item)
+            if size < MIN_REF_BYTES:
+                return {key: walk(element) for key, element in item.items()}
+            if ref in seen:
+                seen.move_to_end(ref)
+                self.referenced += 1
+                return {"$ref": ref}
+            seen[ref] = None
+            if len(seen) > self.per_session:
+                seen.popitem(last=False)
+            self.sent += 1
+            return {"$id": ref, **{key: walk(element) for key, element in item.items()}}
+
+        return walk(value)
+
+    def stats(self) -> dict:
+        """
+        Report remembered sessions and ids, and how many objects were sent and referenced.
+
+        Returns:
+            Dictionary of gauges and counters.
+        """
+        return {
+            "sessions": len(self._sessions),
+            "ids": sum(len(seen) for seen in self._sessions.values()),
+            "sent": self.sent,
+            "referenced": self.referenced,
+        }
+
+
+session_references = SessionReferences(COMPACT_MAX_SESSIONS, COMPACT_REFS_PER_SESSION)
+
+
+def compact_result(value: Any, compact: bool = False, max_text_chars: int | None = None, session: str = "") -> Any:
+    """
+    Encode a tool result for the wire.
+
+    Args:
+        value: Tool result; it is not modified
+        compact: Encode lists of objects as tables and, if `session` is set,
+                 replace objects already sent to it by references
+        max_text_chars: Shorten longer texts to this many characters, or None
+        session: Key of the receiving session, or "" to send every object in full
+
+    Returns:
+        The encoded result, or `value` itself if there is nothing to do.
+    """
+    if not compact and max_text_chars is None:
+        return value
+
+    def walk(item: Any) -> Any:
+        if isinstance(item, str):
+            return truncate_text(item, max_text_chars) if max_text_chars is not None else item
+        if isinstance(item, dict):
+            return {key: walk(element) for key, element in item.items()}
+        if isinstance(item, list):
+            table = columnar(item) if compact else None
+            if table is None:
+                return [walk(element) for element in item]
+            return {key: walk(element) for key, element in table.items()}
+        return item
+
+    encoded = walk(value)
+    if compact and session:
+        encoded = session_references.encode(encoded, session)
+    return encoded
+
+
+def compact_output(fn: Callable, session: Callable[[], str]) -> Callable:
+    """
+    Add the compact and max_text_chars output options to a tool.
+
+    The wrapper's signature is the tool's with the two options appended, and
+    its docstring documents them, so mcp.tool() advertises them to clients.
+    The declared return type is kept, so FastMCP gives the tool an output
+    schema, and structured content, only if it had one before.
+
+    Args:
+        fn: Tool function, sync or async
+        session: Returns the MCP session id of the current call, or "" if it
+                 has none; objects are referenced only within a session
+
+    Returns:
+        An async function returning the tool's result encoded as requested;
+        a compact result is returned as a CallToolResult holding only
+        unindented JSON text.
+    """
+
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(compact: bool = False, max_text_chars: int | None = None, **kwargs) -> Any:
+        result = fn(**kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        result = compact_result(result, compact, max_text_chars, session() if compact else "")
+        if not compact:
+            return result
+        # Send the text without the indentation FastMCP would add
+        text = json.dumps(result, ensure_ascii=False, separators=(",", ":"), default=str)
+        return CallToolResult(content=[TextContent(type="text", text=text)])
+
+    wrapper.__signature__ = signature.replace(
+        parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("compact", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=False, annotation=bool),
+            inspect.Parameter(
+                "max_text_chars", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=None, annotation=int | None
+            ),
+        ],
+    )
+
+    doc = fn.__doc__ or ""
+    args = re.search(r"^([ \t]*)Args:\n", doc, re.MULTILINE)
+    indent = args.group(1) if args else ""
+    options = "".join(f"{indent}    {line}\n" for line in _OPTIONS_DOC)
+    # Append to the Args section, which ends at the next blank line
+    end = doc.find("\n\n", args.end()) + 1 if args else 0
+    if end > 0:
+        wrapper.__doc__ = doc[:end] + options + doc[end:]
+    elif args:
+        wrapper.__doc__ = doc.rstrip("\n") + "\n" + options
+    else:
+        wrapper.__doc__ = f"{doc.rstrip()}\n\n{indent}Args:\n{options}"
+    return wrapper
@@ -0,0 +1,300 @@
+"""Built-in datasets of locations and attractions."""
+
+# Attractions around Kandy, as returned by GET /location?location=Kandy
+KANDY_LOCATIONS = [
+    {
+        "location": "Temple of the Tooth Relic (Sri Dalada Maligawa)",
+        "category": ["cultural", "religious", "historical"],
+        "description": "Sacred Buddhist temple housing the relic of the tooth of Buddha. One of the most revered places of worship in Sri Lanka. Perfect for cultural and religious exploration. Budget: 500-1000 LKR (entrance fee). Best visited during morning or evening puja ceremonies. Suitable for families, history enthusiasts, and spiritual travelers. Allow 2-3 hours for complete visit including museum."
+    },
+    {
+        "location": "Peradeniya Botanical Garden",
+        "category": ["nature", "photography", "family"],
+        "description": "Stunning 147-acre royal botanical garden featuring over 4000 species of plants including orchids, spices, and medicinal plants. Famous for the giant Javan fig tree and bamboo collection. Budget: 1500-2500 LKR (entrance fee plus refreshments). Ideal for nature lovers, photographers, families, and couples. Perfect for picnics and leisurely walks. Allow 3-4 hours to explore fully."
+    },
+    {
+        "location": "Bahirawakanda Vihara Buddha Statue",
+        "category": ["cultural", "photography", "hiking"],
+        "description": "Giant white Buddha statue overlooking Kandy city from a hilltop location. Offers breathtaking panoramic views of the entire city and surrounding mountains. Budget: Free entry, 200-500 LKR for transportation. Best visited during sunset for spectacular views. Suitable for photography enthusiasts and sightseers. Quick visit of 1-2 hours. Moderate climb required."
+    },
+    {
+        "location": "Udawattakele Forest Reserve",
+        "category": ["nature", "wildlife", "hiking"],
+        "description": "Historic forest sanctuary and biodiversity hotspot in the heart of Kandy. Features diverse flora, fauna including monkeys, and ancient Buddhist meditation sites. Budget: 300-800 LKR (entrance fee). Perfect for nature walks, bird watching, and trekking. Suitable for adventure seekers and wildlife enthusiasts. Allow 2-4 hours. Wear comfortable hiking shoes."
+    },
+    {
+        "location": "Kandy Lake (Bogambara Lake)",
+        "category": ["nature", "family", "relaxation"],
+        "description": "Scenic artificial lake in the heart of Kandy city, created by the last Kandyan monarch. Perfect for peaceful evening walks along the well-maintained 3.5 km circular path. Budget: Free, 500-1500 LKR for lakeside cafes. Ideal for romantic walks, jogging, and relaxation. Best visited during early morning or evening. Suitable for all ages. Allow 1-2 hours."
+    },
+    {
+        "location": "Royal Palace of Kandy",
+        "category": ["cultural", "historical", "photography"],
+        "description": "Historic palace complex showcasing Kandyan architecture and colonial history. Houses the National Museum with royal regalia, jewelry, and artifacts. Budget: 500-1000 LKR (entrance fee). Excellent for history buffs and cultural enthusiasts. Combined visit with Temple of the Tooth recommended. Allow 1-2 hours. Photography permitted in most areas."
+    },
+    {
+        "location": "Kandy Garrison Cemetery",
+        "category": ["historical", "cultural"],
+        "description": "Historic colonial cemetery dating to 1817, featuring well-preserved British-era graves and monuments. Peaceful garden setting with beautiful landscaping and historical significance. Budget: Free entry, donations appreciated. Suitable for history enthusiasts and those interested in colonial heritage. Quiet and reflective atmosphere. Allow 30-60 minutes. Best visited during morning hours."
+    },
+    {
+        "location": "Knuckles Mountain Range",
+        "category": ["hiking", "nature", "adventure", "camping"],
+        "description": "UNESCO World Heritage Site with dramatic landscapes, cloud forests, and diverse ecosystems. Named for its resemblance to a clenched fist. Features 34 peaks, cascading waterfalls, and remote villages. Budget: 2000-5000 LKR (permits, guide, and transportation). Perfect for serious trekkers and nature photographers. Multi-day camping treks available. Moderate to challenging difficulty. Best visited November to March."
+    },
+    {
+        "location": "Riverston Peak and Pitawala Pathana",
+        "category": ["hiking", "nature", "photography"],
+        "description": "Stunning mini-world's end with sheer cliff drops and expansive grassland plateau. Part of Knuckles range offering breathtaking views of surrounding valleys and tea estates. Budget: 1500-3500 LKR (transportation and guide). Ideal for day hikers and landscape photographers. Moderate trek of 3-4 hours. Cool climate year-round. Watch for endemic wildlife and birds."
+    },
+    {
+        "location": "Dunhinda Falls Forest Trail",
+        "category": ["nature", "hiking", "photography"],
+        "description": "Magnificent 64-meter waterfall cascading through dense rainforest near Badulla. Scenic forest trail along Badulu Oya river with rich biodiversity. Budget: 500-1500 LKR (entrance and refreshments). Perfect for nature walks and waterfall photography. Easy to moderate 1 km trail taking 1-2 hours. Best visited during rainy season for maximum flow. Swimming not recommended due to strong currents."
+    },
+    {
+        "location": "Corbett's Gap and Dothalugala Peak",
+        "category": ["hiking", "nature", "wildlife", "adventure"],
+        "description": "Misty mountain pass at 1800m altitude leading to Sri Lanka's 7th highest peak. Features pristine cloud forests, rare endemic species, and panoramic mountain views. Budget: 2500-4500 LKR (permits, guide, and 4WD transport). Ideal for serious hikers and birdwatchers. Full day trek (6-8 hours). Often shrouded in clouds adding mystical atmosphere. Best accessed October to April."
+    },
+    {
+        "location": "Victoria-Randenigala-Rantambe Forest Reserve",
+        "category": ["nature", "wildlife", "photography"],
+        "description": "Expansive forest reserve surrounding three major reservoirs with rich wildlife including elephants, leopards, and endemic birds. Features forest trails, boat safaris, and wildlife observation points. Budget: 1000-3000 LKR (entrance, boat rides optional). Perfect for wildlife enthusiasts and birdwatchers. Half to full day visit. Early morning best for wildlife sightings. Photography paradise with lake and forest vistas."
+    }
+]
+
+# Places near Kandy, as returned by GET /location?location=Kandy for nearby activities
+KANDY_NEARBY = [
+    {
+        "name": "Temple of the Tooth Relic (Sri Dalada Maligawa)",
+        "distance_km": 1.0,
+        "activities": [
+            "Cultural sightseeing",
+            "Historical exploration",
+            "Religious worship"
+        ],
+        "category": ["cultural", "religious", "historical"]
+    },
+    {
+        "name": "Peradeniya Botanical Garden",
+        "distance_km": 6.0,
+        "activities": [
+            "Nature walk",
+            "Photography",
+            "Picnic",
+            "Botanical exploration"
+        ],
+        "category": ["nature", "photography", "family"]
+    },
+    {
+        "name": "Bahirawakanda Temple",
+        "distance_km": 2.0,
+        "activities": [
+            "Hilltop hike",
+            "Panoramic city view",
+            "Temple visit"
+        ],
+        "category": ["hiking", "cultural", "photography"]
+    }
+]
+
+# Known attractions with coordinates, indexed for nearby queries while the backend is unavailable
+ATTRACTIONS = [
+    {
+        "name": "Temple of the Tooth Relic (Sri Dalada Maligawa)",
+        "latitude": 7.2936,
+        "longitude": 80.6413,
+        "activities": ["Cultural sightseeing", "Historical exploration", "Religious worship"],
+        "category": ["cultural", "religious", "historical"]
+    },
+    {
+        "name": "Royal Palace of Kandy",
+        "latitude": 7.2939,
+        "longitude": 80.6404,
+        "activities": ["Museum visit", "Historical exploration", "Photography"],
+        "category": ["cultural", "historical", "photography"]
+    },
+    {
+        "name": "Kandy Lake (Bogambara Lake)",
+        "latitude": 7.2920,
+        "longitude": 80.6436,
+        "activities": ["Lakeside walk", "Jogging", "Cafe hopping"],
+        "category": ["nature", "family", "relaxation"]
+    },
+    {
+        "name": "Kandy Garrison Cemetery",
+        "latitude": 7.2950,
+        "longitude": 80.6428,
+        "activities": ["Historical exploration", "Quiet reflection"],
+        "category": ["historical", "cultural"]
+    },
+    {
+        "name": "Udawattakele Forest Reserve",
+        "latitude": 7.2994,
+        "longitude": 80.6422,
+        "activities": ["Nature walk", "Bird watching", "Trekking"],
+        "category": ["nature", "wildlife", "hiking"]
+    },
+    {
+        "name": "Bahirawakanda Temple",
+        "latitude": 7.2965,
+        "longitude": 80.6305,
+        "activities": ["Hilltop hike", "Panoramic city view", "Temple visit"],
+        "category": ["hiking", "cultural", "photography"]
+    },
+    {
+        "name": "Peradeniya Botanical Garden",
+        "latitude": 7.2682,
+        "longitude": 80.5966,
+        "activities": ["Nature walk", "Photography", "Picnic", "Botanical exploration"],
+        "category": ["nature", "photography", "family"]
+    },
+    {
+        "name": "Hanthana Mountain Range",
+        "latitude": 7.2560,
+        "longitude": 80.6290,
+        "activities": ["Hiking", "Tea estate walk", "Photography"],
+        "category": ["hiking", "nature", "photography"]
+    },
+    {
+        "name": "Embekke Devalaya",
+        "latitude": 7.2236,
+        "longitude": 80.5669,
+        "activities": ["Wood carving viewing", "Temple visit"],
+        "category": ["cultural", "historical"]
+    },
+    {
+        "name": "Gadaladeniya Temple",
+        "latitude": 7.2608,
+        "longitude": 80.5628,
+        "activities": ["Temple visit", "Historical exploration"],
+        "category": ["cultural", "religious", "historical"]
+    },
+    {
+        "name": "Lankathilaka Temple",
+        "latitude": 7.2489,
+        "longitude": 80.5647,
+        "activities": ["Temple visit", "Panoramic view"],
+        "category": ["cultural", "religious", "historical"]
+    },
+    {
+        "name": "Ambuluwawa Tower",
+        "latitude": 7.1600,
+        "longitude": 80.5460,
+        "activities": ["Tower climb", "Panoramic view", "Photography"],
+        "category": ["cultural", "photography", "adventure"]
+    },
+    {
+        "name": "Pinnawala Elephant Orphanage",
+        "latitude": 7.3003,
+        "longitude": 80.3867,
+        "activities": ["Elephant watching", "River bathing viewing", "Photography"],
+        "category": ["wildlife", "family", "photography"]
+    },
+    {
+        "name": "Victoria-Randenigala-Rantambe Forest Reserve",
+        "latitude": 7.2406,
+        "longitude": 80.7853,
+        "activities": ["Boat safari", "Wildlife observation", "Bird watching"],
+        "category": ["nature", "wildlife", "photography"]
+    },
+    {
+        "name": "Corbett's Gap and Dothalugala Peak",
+        "latitude": 7.3711,
+        "longitude": 80.8503,
+        "activities": ["Mountain trek", "Bird watching", "Cloud forest walk"],
+        "category": ["hiking", "nature", "wildlife", "adventure"]
+    },
+    {
+        "name": "Knuckles Mountain Range",
+        "latitude": 7.4500,
+        "longitude": 80.8000,
+        "activities": ["Multi-day trekking", "Camping", "Waterfall visits"],
+        "category": ["hiking", "nature", "adventure", "camping"]
+    },
+    {
+        "name": "Riverston Peak and Pitawala Pathana",
+        "latitude": 7.5286,
+        "longitude": 80.7367,
+        "activities": ["Day hike", "Landscape photography", "Bird watching"],
+        "category": ["hiking", "nature", "photography"]
+    },
+    {
+        "name": "Dunhinda Falls Forest Trail",
+        "latitude": 7.0167,
+        "longitude": 81.0658,
+        "activities": ["Waterfall visit", "Forest trail walk", "Photography"],
+        "category": ["nature", "hiking", "photography"]
+    },
+    {
+        "name": "Nine Arch Bridge",
+        "latitude": 6.8768,
+        "longitude": 81.0608,
+        "activities": ["Train spotting", "Photography", "Tea estate walk"],
+        "category": ["photography", "historical", "nature"]
+    },
+    {
+        "name": "Ella Rock",
+        "latitude": 6.8510,
+        "longitude": 81.0470,
+        "activities": ["Hiking", "Panoramic view"],
+        "category": ["hiking", "nature"]
+    },
+    {
+        "name": "Horton Plains National Park",
+        "latitude": 6.8020,
+        "longitude": 80.8060,
+        "activities": ["World's End hike", "Wildlife spotting", "Photography"],
+        "category": ["hiking", "nature", "wildlife"]
+    },
+    {
+        "name": "Gregory Lake",
+        "latitude": 6.9570,
+        "longitude": 80.7800,
+        "activities": ["Boat ride", "Lakeside walk", "Picnic"],
+        "category": ["nature", "family", "relaxation"]
+    },
+    {
+        "name": "Sigiriya Rock Fortress",
+        "latitude": 7.9570,
+        "longitude": 80.7603,
+        "activities": ["Rock climb", "Fresco viewing", "Historical exploration"],
+        "category": ["cultural", "historical", "hiking"]
+    },
+    {
+        "name": "Pidurangala Rock",
+        "latitude": 7.9667,
+        "longitude": 80.7581,
+        "activities": ["Sunrise hike", "Panoramic view"],
+        "category": ["hiking", "photography", "cultural"]
+    },
+    {
+        "name": "Dambulla Cave Temple",
+        "latitude": 7.8567,
+        "longitude": 80.6492,
+        "activities": ["Cave temple visit", "Historical exploration"],
+        "category": ["cultural", "religious", "historical"]
+    },
+    {
+        "name": "Galle Fort",
+        "latitude": 6.0260,
+        "longitude": 80.2170,
+        "activities": ["Rampart walk", "Museum visit", "Photography"],
+        "category": ["historical", "cultural", "photography"]
+    },
+    {
+        "name": "Unawatuna Beach",
+        "latitude": 6.0100,
+        "longitude": 80.2490,
+        "activities": ["Swimming", "Snorkeling", "Relaxation"],
+        "category": ["beach", "relaxation", "family"]
+    },
+    {
+        "name": "Sinharaja Forest Reserve",
+        "latitude": 6.4000,
+        "longitude": 80.5000,
+        "activities": ["Rainforest trek", "Bird watching"],
+        "category": ["nature", "wildlife", "hiking"]
+    }
+]
@@ -0,0 +1,41 @@
+"""Tracking of tool calls that answered with fallback data instead of upstream data."""
+
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable
+
+from core.tracing import event
+
+_fallback_reason: ContextVar[str | None] = ContextVar("fallback_reason", default=None)
+
+
+def mark_fallback(error: Exception) -> None:
+    """
+    Record that the current tool call is answering with fallback data.
+
+    Args:
+        error: The exception that prevented fetching real data
+    """
+    reason = str(error) or type(error).__name__
+    _fallback_reason.set(reason)
+    event("fallback", reason=reason, error=type(error).__name__)
+
+
+async def call_tracking_fallback(fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> tuple[Any, str | None]:
+    """
+    Await a tool and report whether it fell back to built-in data.
+
+    Args:
+        fn: Async tool function to call
+        *args: Positional arguments for the tool
+        **kwargs: Keyword arguments for the tool
+
+    Returns:
+        Tuple of the tool result and the fallback reason, or None if the
+        result came from the upstream.
+    """
+    token = _fallback_reason.set(None)
+    try:
+        result = await fn(*args, **kwargs)
+        return result, _fallback_reason.get()
+    finally:
+        _fallback_reason.reset(token)
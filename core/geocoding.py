@@ -0,0 +1,70 @@
+"""Cached geocoding of location names through the Open-Meteo geocoding API."""
+
+import urllib.parse
+
+from core.cache import TTLCache
+from core.http import get_json
+from core.settings import (
+    GEOCODE_CACHE_PATH,
+    GEOCODE_CACHE_SIZE,
+    GEOCODE_CACHE_TTL,
+    GEOCODING_URL,
+    WEATHER_TIMEOUT,
+)
+from core.shared import shared_store
+from core.tracing import spanned
+
+geocode_cache = TTLCache(
+    GEOCODE_CACHE_SIZE, GEOCODE_CACHE_TTL, GEOCODE_CACHE_PATH or None, shared=shared_store, namespace="geocode"
+)
+
+
+def normalize_location(location: str) -> str:
+    """
+    Normalize a location name so that spelling variants share a cache entry.
+
+    Args:
+        location: Location name as given by the caller (e.g., "  kandy ")
+
+    Returns:
+        The case-folded name with surrounding and repeated whitespace removed.
+    """
+    return " ".join(location.split()).casefold()
+
+
+@spanned("geocode")
+async def geocode(location: str) -> dict | None:
+    """
+    Resolve a location name to coordinates, answering repeat names from the cache.
+
+    Args:
+        location: City name or location (e.g., "Kandy")
+
+    Returns:
+        Dictionary with latitude, longitude, name and country, or None if the
+        geocoding API does not know the location.
+
+    Raises:
+        Exception: If the geocoding request fails.
+    """
+    key = normalize_location(location)
+    place = geocode_cache.get(key)
+    if place is not None:
+        return place
+
+    encoded_location = urllib.parse.quote(location)
+    geocoding_url = f"{GEOCODING_URL}?name={encoded_location}&count=1&language=en&format=json"
+    geo_data = await get_json(geocoding_url, timeout=WEATHER_TIMEOUT, upstream="geocoding")
+
+    if not geo_data.get("results"):
+        return None
+
+    result = geo_data["results"][0]
+    place = {
+        "latitude": result["latitude"],
+        "longitude": result["longitude"],
+        "name": result["name"],
+        "country": result.get("country", ""),
+    }
+    geocode_cache.set(key, place)
+    return place
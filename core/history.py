@@ -0,0 +1,334 @@
+"""Local SQLite store of user histories, kept current by incremental syncs with the backend."""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import urllib.parse
+
+from core.http import get_json
+from core.settings import BACKEND_API_URL, BACKEND_TIMEOUT, HISTORY_DB_PATH, HISTORY_SYNC_INTERVAL
+from core.tracing import spanned
+
+# Sorts after every date, as the upper bound of an open date range
+_LAST = "\uffff"
+
+
+def _row_key(row: dict) -> str:
+    return hashlib.blake2b(json.dumps(row, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+
+def _categories(row: dict) -> set[str]:
+    return {str(category).casefold() for category in row.get("category") or []}
+
+
+def filter_rows(
+    rows: list,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    categories: list[str] | None = None,
+) -> list:
+    """
+    Apply the HistoryStore.query filters to rows held in memory.
+
+    Args:
+        rows: History rows
+        start_date: Keep rows dated on or after this YYYY-MM-DD date
+        end_date: Keep rows dated on or before this YYYY-MM-DD date
+        categories: Keep rows having all of these categories
+
+    Returns:
+        The matching rows, in their original order.
+    """
+    wanted = {category.casefold() for category in categories or []}
+    return [
+        row for row in rows
+        if isinstance(row, dict)
+        and (not start_date or str(row.get("date", "")) >= start_date)
+        and (not end_date or str(row.get("date", "")) <= end_date)
+        and wanted <= _categories(row)
+    ]
+
+
+class HistoryStore:
+    """
+    Every user's past activities and locations in a local SQLite database.
+
+    Rows are stored once each, keyed by their content, with indexes on date
+    and on category, so a page of a user's history is read without loading
+    the rest of it. Each user and kind also records the latest date seen and
+    when it was last synced, so a sync only asks the backend for newer rows.
+    A sync replaces the stored rows of the dates it fetched, so rows edited or
+    deleted on the backend do not linger.
+
+    The methods block on SQLite, so async code calls them through
+    asyncio.to_thread; every thread gets a connection of its own.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path: Database file, created if missing
+        """
+        self.path = path
+        self.syncs = 0
+        self.rows_added = 0
+        self.rows_removed = 0
+        self._local = threading.local()
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # Open lazily per thread, and again after a fork: connections must not cross processes
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(
+                "CREATE TABLE IF NOT EXISTS history ("
+                " id INTEGER PRIMARY KEY, user TEXT NOT NULL, kind TEXT NOT NULL, date TEXT NOT NULL,"
+                " row_key TEXT NOT NULL, row TEXT NOT NULL, UNIQUE (user, kind, row_key));"
+                "CREATE INDEX IF NOT EXISTS history_by_date ON history (user, kind, date, id);"
+                "CREATE TABLE IF NOT EXISTS history_categories ("
+                " user TEXT NOT NULL, kind TEXT NOT NULL, category TEXT NOT NULL, date TEXT NOT NULL,"
+                " id INTEGER NOT NULL, PRIMARY KEY (user, kind, category, date, id)) WITHOUT ROWID;"
+                "CREATE TABLE IF NOT EXISTS history_removals ("
+                " user TEXT NOT NULL, kind TEXT NOT NULL, removed INTEGER NOT NULL,"
+                " PRIMARY KEY (user, kind)) WITHOUT ROWID;"
+                "CREATE TABLE IF NOT EXISTS history_sync ("
+                " user TEXT NOT NULL, kind TEXT NOT NULL, last_date TEXT NOT NULL, synced_at REAL NOT NULL,"
+                " PRIMARY KEY (user, kind)) WITHOUT ROWID;"
+            )
+            local.db = db
+            local.pid = os.getpid()
+        return local.db
+
+    def add(self, user: str, kind: str, rows: list, since: str = "") -> list:
+        """
+        Store the rows of a sync, replacing the stored rows of the window it covered.
+
+        The backend returns every row dated on or after `since`, so a stored
+        row in that window that it no longer returns was edited or deleted
+        there, and is removed. Rows stored before and returned again keep
+        their place.
+
+        Args:
+            user: Username
+            kind: "activities" or "locations"
+            rows: Rows as returned by the backend
+            since: First date the fetch covered, or "" if it covered every row
+
+        Returns:
+            The rows that were new, in their original order.
+        """
+        fetched = {}
+        for row in rows:
+            if isinstance(row, dict):
+                fetched.setdefault(_row_key(row), row)
+        added = []
+        db = self.db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            stored = db.execute(
+                "SELECT id, row_key FROM history WHERE user = ? AND kind = ? AND date >= ?", (user, kind, since)
+            ).fetchall()
+            gone = [(row_id,) for row_id, key in stored if key not in fetched]
+            if gone:
+                db.execute(
+                    "INSERT INTO history_removals (user, kind, removed) VALUES (?, ?, ?)"
+                    " ON CONFLICT (user, kind) DO UPDATE SET removed = removed + excluded.removed",
+                    (user, kind, len(gone)),
+                )
+                db.executemany("DELETE FROM history WHERE id = ?", gone)
+                db.executemany(
+                    "DELETE FROM history_categories WHERE user = ? AND kind = ? AND id = ?",
+                    [(user, kind, row_id) for (row_id,) in gone],
+                )
+            kept = {key for _, key in stored}
+            for key, row in fetched.items():
+                if key in kept:
+                    continue
+                day = str(row.get("date", ""))
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO history (user, kind, date, row_key, row) VALUES (?, ?, ?, ?, ?)",
+                    (user, kind, day, key, json.dumps(row)),
+                )
+                if cursor.rowcount:
+                    db.executemany(
+                        "INSERT INTO history_categories (user, kind, category, date, id) VALUES (?, ?, ?, ?, ?)",
+                        [(user, kind, category, day, cursor.lastrowid) for category in _categories(row)],
+                    )
+                    added.append(row)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        self.rows_added += len(added)
+        self.rows_removed += len(gone)
+        return added
+
+    def rows_after(self, user: str, kind: str, after_id: int) -> tuple[int, list[tuple[int, dict]]]:
+        """
+        Read the rows stored after a given row, for folding into a running summary.
+
+        Row ids only grow, so a summary that remembers the last id it folded
+        takes every newer row exactly once, whichever process stored it. A
+        summary must start over when rows it folded were removed, which the
+        removal count reveals.
+
+        Args:
+            user: Username
+            kind: "activities" or "locations"
+            after_id: Id of the last row already folded, or 0 for none
+
+        Returns:
+            Tuple of how many rows were ever removed from the history, and the
+            (id, row) pairs stored after `after_id`, in id order.
+        """
+        db = self.db
+        removed = db.execute(
+            "SELECT removed FROM history_removals WHERE user = ? AND kind = ?", (user, kind)
+        ).fetchone()
+        rows = db.execute(
+            "SELECT id, row FROM history WHERE user = ? AND kind = ? AND id > ? ORDER BY id", (user, kind, after_id)
+        ).fetchall()
+        return (removed[0] if removed else 0), [(row_id, json.loads(row)) for row_id, row in rows]
+
+    def sync_state(self, user: str, kind: str) -> tuple[str, float] | None:
+        """
+        Return the latest date seen and the time of the last sync.
+
+        Args:
+            user: Username
+            kind: "activities" or "locations"
+
+        Returns:
+            Tuple of the latest row date ("" if none had one) and the epoch time
+            of the last sync, or None if the history was never synced.
+        """
+        return self.db.execute(
+            "SELECT last_date, synced_at FROM history_sync WHERE user = ? AND kind = ?", (user, kind)
+        ).fetchone()
+
+    def mark_synced(self, user: str, kind: str) -> None:
+        """
+        Record a successful sync and the latest date now stored.
+
+        Args:
+            user: Username
+            kind: "activities" or "locations"
+        """
+        self.syncs += 1
+        last_date = self.db.execute(
+            "SELECT COALESCE(MAX(date), '') FROM history WHERE user = ? AND kind = ?", (user, kind)
+        ).fetchone()[0]
+        self.db.execute(
+            "INSERT OR REPLACE INTO history_sync (user, kind, last_date, synced_at) VALUES (?, ?, ?, ?)",
+            (user, kind, last_date, time.time()),
+        )
+
+    def query(
+        self,
+        user: str,
+        kind: str,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        categories: list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list:
+        """
+        Read a page of a user's history in date order.
+
+        Args:
+            user: Username
+            kind: "activities" or "locations"
+            start_date: Only rows dated on or after this YYYY-MM-DD date
+            end_date: Only rows dated on or before this YYYY-MM-DD date
+            categories: Only rows having all of these categories
+            limit: Maximum number of rows to return, or None for all
+            offset: Number of matching rows to skip
+
+        Returns:
+            The matching rows.
+        """
+        dates = [start_date or "", end_date or _LAST]
+        wanted = sorted({category.casefold() for category in categories or []})
+        if not wanted:
+            sql = "SELECT row FROM history WHERE user = ? AND kind = ? AND date >= ? AND date <= ? ORDER BY date, id"
+            params: list = [user, kind, *dates]
+        else:
+            # Walk the first category's index in date order; the others are point lookups
+            sql = (
+                "SELECT h.row FROM history_categories c JOIN history h ON h.id = c.id"
+                " WHERE c.user = ? AND c.kind = ? AND c.category = ? AND c.date >= ? AND c.date <= ?"
+                + "".join(
+                    " AND EXISTS (SELECT 1 FROM history_categories o WHERE o.user = c.user AND o.kind = c.kind"
+                    " AND o.category = ? AND o.date = c.date AND o.id = c.id)"
+                    for _ in wanted[1:]
+                )
+                + " ORDER BY c.date, c.id"
+            )
+            params = [user, kind, wanted[0], *dates, *wanted[1:]]
+        sql += " LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else max(limit, 0), max(offset, 0)]
+        return [json.loads(row) for (row,) in self.db.execute(sql, params)]
+
+    def stats(self) -> dict:
+        """
+        Report stored rows and users, and this process's sync counts.
+
+        Returns:
+            Dictionary with rows, users, syncs, rows_added and rows_removed.
+        """
+        return {
+            "rows": self.db.execute("SELECT COUNT(*) FROM history").fetchone()[0],
+            "users": self.db.execute("SELECT COUNT(DISTINCT user) FROM history_sync").fetchone()[0],
+            "syncs": self.syncs,
+            "rows_added": self.rows_added,
+            "rows_removed": self.rows_removed,
+        }
+
+
+history_store = HistoryStore(HISTORY_DB_PATH or os.path.join(tempfile.gettempdir(), "mcp-history.sqlite"))
+
+
+@spanned("history sync")
+async def sync_history(user: str, kind: str) -> list:
+    """
+    Bring a user's stored history up to date with the backend.
+
+    Only rows dated on or after the latest stored date are requested, and
+    they replace the stored rows of those dates. A history synced less than
+    HISTORY_SYNC_INTERVAL seconds ago is not requested at all.
+
+    Args:
+        user: Username
+        kind: "activities" or "locations"
+
+    Returns:
+        The rows that were new.
+
+    Raises:
+        Exception: If the backend request fails or does not return a list.
+    """
+    state = await asyncio.to_thread(history_store.sync_state, user, kind)
+    if state is not None and time.time() - state[1] < HISTORY_SYNC_INTERVAL:
+        return []
+
+    url = f"{BACKEND_API_URL}/{kind}?user={urllib.parse.quote(user)}"
+    since = state[0] if state is not None else ""
+    if since:
+        # Rows from the latest stored day may still be arriving, so it is requested again
+        url += f"&since={urllib.parse.quote(since)}"
+    rows = await get_json(url, timeout=BACKEND_TIMEOUT, upstream="backend")
+    if not isinstance(rows, list):
+        raise ValueError(f"Backend returned a {type(rows).__name__} instead of a list of {kind}")
+
+    added = await asyncio.to_thread(history_store.add, user, kind, rows, since)
+    await asyncio.to_thread(history_store.mark_synced, user, kind)
+    return added
@@ -0,0 +1,329 @@
+"""Shared async HTTP clients and connection pools for all upstream-calling tools."""
+
+import asyncio
+import time
+import weakref
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import httpx
+
+from core.breaker import CircuitBreaker, CircuitOpenError
+from core.metrics import upstream_decode, upstream_duration, upstream_requests
+from core.settings import (
+    BACKEND_KEEPALIVE_EXPIRY,
+    BACKEND_MAX_CONNECTIONS,
+    BACKEND_MAX_KEEPALIVE,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    RETRY_BUDGET_MIN_PER_SECOND,
+    RETRY_BUDGET_RATIO,
+    UPSTREAM_HEDGE,
+    UPSTREAM_MIN_TIMEOUT,
+    UPSTREAM_POLICIES,
+    UPSTREAM_RETRIES,
+    UPSTREAM_RETRY_BACKOFF,
+    UPSTREAM_TIMEOUT_MULTIPLIER,
+)
+from core.resilience import RetryBudget, Upstream, UpstreamPolicy, UpstreamStatusError
+from core.singleflight import SingleFlight
+from core.tracing import event, span
+
+# Connection limits for each named pool. "backend" serves the localhost:3000
+# API; "default" serves everything else (the Open-Meteo endpoints).
+POOL_LIMITS = {
+    "backend": httpx.Limits(
+        max_connections=BACKEND_MAX_CONNECTIONS,
+        max_keepalive_connections=BACKEND_MAX_KEEPALIVE,
+        keepalive_expiry=BACKEND_KEEPALIVE_EXPIRY,
+    ),
+    "default": httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    ),
+}
+
+
+@dataclass
+class PoolStats:
+    """Counters describing how requests were served by a connection pool."""
+
+    requests: int = 0
+    hits: int = 0
+    misses: int = 0
+    waits: int = 0
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Response body stream that runs a callback once the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close) -> None:
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None
+
+
+class PooledTransport(httpx.AsyncHTTPTransport):
+    """
+    Keep-alive transport that records whether each request reused a connection.
+
+    A request is a hit when it was served over a connection that had carried
+    an earlier request and a miss when a new connection was opened for it.
+    It counts as a wait when every connection was busy as it arrived.
+    """
+
+    def __init__(self, limits: httpx.Limits) -> None:
+        super().__init__(limits=limits)
+        self.limits = limits
+        self.stats = PoolStats()
+        self._in_flight = 0
+        self._seen_streams = weakref.WeakSet()
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats.requests += 1
+        if self.limits.max_connections is not None and self._in_flight >= self.limits.max_connections:
+            self.stats.waits += 1
+
+        self._in_flight += 1
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            self._release()
+            raise
+
+        stream = response.extensions.get("network_stream")
+        if stream is not None:
+            if stream in self._seen_streams:
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+                self._seen_streams.add(stream)
+        response.stream = _TrackedStream(response.stream, self._release)
+        return response
+
+    def snapshot(self) -> dict:
+        """
+        Return the pool counters together with its current connection counts.
+
+        Returns:
+            Dictionary of request counters, open and idle connections, and limits.
+        """
+        connections = self._pool.connections
+        return {
+            **asdict(self.stats),
+            "in_flight": self._in_flight,
+            "open_connections": len(connections),
+            "idle_connections": sum(1 for conn in connections if conn.is_idle()),
+            "max_connections": self.limits.max_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+        }
+
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_transports: dict[str, PooledTransport] = {}
+
+# Shared by every upstream GET so identical concurrent requests are coalesced
+single_flight = SingleFlight()
+
+# Connection pool used for each upstream; anything not listed uses "default"
+UPSTREAM_POOLS = {"backend": "backend"}
+
+breakers: dict[str, CircuitBreaker] = {}
+
+# Shared by every upstream so retries and hedges stay bounded overall
+retry_budget = RetryBudget(RETRY_BUDGET_RATIO, RETRY_BUDGET_MIN_PER_SECOND)
+
+upstreams: dict[str, Upstream] = {}
+
+
+def get_breaker(upstream: str) -> CircuitBreaker:
+    """
+    Return the circuit breaker for an upstream, creating it on first use.
+
+    Args:
+        upstream: Name of the upstream
+
+    Returns:
+        The upstream's CircuitBreaker.
+    """
+    breaker = breakers.get(upstream)
+    if breaker is None:
+        breaker = CircuitBreaker(upstream, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT)
+        breakers[upstream] = breaker
+    return breaker
+
+
+def get_upstream(upstream: str) -> Upstream:
+    """
+    Return the call policy runner for an upstream, creating it on first use.
+
+    Args:
+        upstream: Name of the upstream
+
+    Returns:
+        The upstream's Upstream, with the defaults overridden by its UPSTREAM_POLICIES entry.
+    """
+    runner = upstreams.get(upstream)
+    if runner is None:
+        policy = UpstreamPolicy(
+            min_timeout=UPSTREAM_MIN_TIMEOUT,
+            timeout_multiplier=UPSTREAM_TIMEOUT_MULTIPLIER,
+            retries=UPSTREAM_RETRIES,
+            retry_backoff=UPSTREAM_RETRY_BACKOFF,
+            hedge=UPSTREAM_HEDGE,
+        )
+        for field, value in UPSTREAM_POLICIES.get(upstream, {}).items():
+            setattr(policy, field, value)
+        runner = Upstream(upstream, policy, get_breaker(upstream), retry_budget)
+        upstreams[upstream] = runner
+    return runner
+
+
+def get_client(pool: str = "default") -> httpx.AsyncClient:
+    """
+    Return the process-wide async HTTP client for a pool, creating it on first use.
+
+    Args:
+        pool: Name of the connection pool ("backend" or "default")
+
+    Returns:
+        The shared httpx.AsyncClient instance for that pool.
+    """
+    client = _clients.get(pool)
+    if client is None or client.is_closed:
+        transport = PooledTransport(POOL_LIMITS[pool])
+        client = httpx.AsyncClient(transport=transport)
+        _clients[pool] = client
+        _transports[pool] = transport
+    return client
+
+
+def pool_stats() -> dict:
+    """
+    Report hit, miss and wait counts and open connections for every pool in use.
+
+    Returns:
+        Dictionary mapping pool name to its statistics.
+    """
+    return {name: transport.snapshot() for name, transport in _transports.items()}
+
+
+async def aclose() -> None:
+    """Close every shared HTTP client and release its connections."""
+    for client in _clients.values():
+        await client.aclose()
+    _clients.clear()
+    _transports.clear()
+
+
+async def _fetch_json(url: str, timeout: float, upstream: str) -> Any:
+    breaker = get_breaker(upstream)
+    start = time.perf_counter()
+    with span("request", timeout=round(timeout, 3)) as request:
+        try:
+            resp = await get_client(UPSTREAM_POOLS.get(upstream, "default")).get(url, timeout=timeout)
+        except Exception:
+            upstream_duration.observe(time.perf_counter() - start, upstream)
+            upstream_requests.inc(upstream, "error")
+            breaker.record_failure()
+            raise
+        request.set(status=resp.status_code)
+    upstream_duration.observe(time.perf_counter() - start, upstream)
+    # Only server errors mean the upstream is unhealthy; a 4xx is still an answer.
+    if resp.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    if resp.status_code != 200:
+        upstream_requests.inc(upstream, f"http_{resp.status_code}")
+        raise UpstreamStatusError(resp.status_code)
+    upstream_requests.inc(upstream, "ok")
+
+    start = time.perf_counter()
+    with span("decode", bytes=len(resp.content)):
+        payload = resp.json()
+    upstream_decode.observe(time.perf_counter() - start, upstream)
+    return payload
+
+
+async def get_json(url: str, timeout: float = 5, upstream: str = "default") -> Any:
+    """
+    Fetch a URL and decode its JSON body without blocking the event loop.
+
+    Concurrent requests for the same URL share a single upstream fetch; each
+    caller still receives its own copy of the decoded payload. While the
+    upstream's circuit breaker is open the call fails immediately. Slow
+    attempts are hedged and failed ones retried under the upstream's policy.
+
+    Args:
+        url: The URL to fetch
+        timeout: Request timeout in seconds, covering every attempt
+        upstream: Name of the upstream being called ("backend", "geocoding",
+                  "forecast" or "archive"); selects the circuit breaker and
+                  connection pool
+
+    Returns:
+        The decoded JSON payload.
+
+    Raises:
+        CircuitOpenError: If the upstream's circuit is open.
+        Exception: If the upstream returns a non-200 status or the request fails.
+    """
+    try:
+        get_breaker(upstream).before_call()
+    except CircuitOpenError:
+        upstream_requests.inc(upstream, "circuit_open")
+        event("circuit_open", upstream=upstream)
+        raise
+    runner = get_upstream(upstream)
+    try:
+        with span(f"http {upstream}", url=url):
+            return await single_flight.do(
+                f"{upstream} {url}",
+                lambda: runner.call(lambda attempt_timeout: _fetch_json(url, attempt_timeout, upstream), timeout),
+            )
+    except asyncio.CancelledError:
+        # A cancelled call records no outcome, so it must not keep the half-open probe
+        get_breaker(upstream).release_probe()
+        raise
+
+
+def upstream_stats() -> dict:
+    """
+    Report observed latencies and retry and hedge counts of every upstream,
+    and the state of the shared retry budget.
+
+    Returns:
+        Dictionary mapping upstream name to its statistics, plus "retry_budget".
+    """
+    return {
+        **{name: runner.stats() for name, runner in upstreams.items()},
+        "retry_budget": retry_budget.stats(),
+    }
+
+
+def breaker_stats() -> dict:
+    """
+    Report the circuit breaker state of every upstream.
+
+    Returns:
+        Dictionary mapping upstream name to its breaker statistics.
+    """
+    return {name: breaker.stats() for name, breaker in breakers.items()}
@@ -0,0 +1,215 @@
+"""Lightweight Prometheus-style metrics for tool calls and upstream requests."""
+
+import bisect
+import functools
+import inspect
+import random
+import time
+from typing import Any, Callable
+
+import pydantic_core
+from mcp.types import CallToolResult
+
+from core.fallback import call_tracking_fallback
+from core.settings import METRICS_SIZE_SAMPLE_RATE
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonically increasing count, optionally split by labels."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """
+        Increase the count for a label combination.
+
+        Args:
+            *label_values: One value per label, in declaration order
+            amount: How much to add
+        """
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for values, count in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, values)} {count:g}")
+        return lines
+
+
+class Histogram:
+    """Distribution of observed values over fixed buckets, optionally split by labels."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # Per label combination: [bucket counts..., +Inf count], sum, count
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """
+        Record one observation for a label combination.
+
+        Args:
+            value: Observed value (seconds for latencies, bytes for sizes)
+            *label_values: One value per label, in declaration order
+        """
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for values, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                le = f'le="{bound:g}"' if bound != "+Inf" else 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, values)} {total:g}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, values)} {count}")
+        return lines
+
+
+tool_calls = Counter("mcp_tool_calls_total", "Tool calls received.", ("tool",))
+tool_errors = Counter("mcp_tool_errors_total", "Tool calls that raised or returned an error.", ("tool",))
+tool_fallbacks = Counter("mcp_tool_fallbacks_total", "Tool calls answered with fallback data.", ("tool",))
+tool_duration = Histogram("mcp_tool_duration_seconds", "Wall time of a whole tool call.", ("tool",))
+tool_response_bytes = Histogram("mcp_tool_response_bytes", "JSON size of a sample of tool results.", ("tool",), SIZE_BUCKETS)
+upstream_requests = Counter("mcp_upstream_requests_total", "Upstream HTTP requests by outcome.", ("upstream", "outcome"))
+upstream_duration = Histogram("mcp_upstream_request_duration_seconds", "Time until an upstream responded or failed.", ("upstream",))
+upstream_decode = Histogram("mcp_upstream_decode_seconds", "Time spent decoding upstream JSON bodies.", ("upstream",))
+
+METRICS = [
+    tool_calls,
+    tool_errors,
+    tool_fallbacks,
+    tool_duration,
+    tool_response_bytes,
+    upstream_requests,
+    upstream_duration,
+    upstream_decode,
+]
+
+
+def instrument_tool(fn: Callable) -> Callable:
+    """
+    Wrap a tool so every call updates the per-tool metrics.
+
+    The wrapper keeps the tool's name, docstring and signature, so it can be
+    registered with mcp.tool() in place of the tool itself.
+
+    Args:
+        fn: Tool function, sync or async
+
+    Returns:
+        An async function recording call counts, latency, fallbacks and errors
+        around each call, and the response size of a sample of them.
+    """
+    name = fn.__name__
+
+    async def call(**kwargs) -> Any:
+        result = fn(**kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    @functools.wraps(fn)
+    async def wrapper(**kwargs) -> Any:
+        tool_calls.inc(name)
+        start = time.perf_counter()
+        try:
+            result, fallback_reason = await call_tracking_fallback(call, **kwargs)
+        except Exception:
+            tool_errors.inc(name)
+            raise
+        finally:
+            tool_duration.observe(time.perf_counter() - start, name)
+
+        if fallback_reason is not None:
+            tool_fallbacks.inc(name)
+        # Batch results carry an integer "error" count; only a message marks a failed call
+        if isinstance(result, dict) and isinstance(result.get("error"), str):
+            tool_errors.inc(name)
+        if random.random() < METRICS_SIZE_SAMPLE_RATE:
+            if isinstance(result, CallToolResult):
+                size = len(result.model_dump_json(exclude_none=True))
+            else:
+                size = len(pydantic_core.to_json(result, fallback=str))
+            tool_response_bytes.observe(size, name)
+        return result
+
+    return wrapper
+
+
+def render_metrics(gauges: dict[str, float] | None = None) -> str:
+    """
+    Render every metric in the Prometheus text exposition format.
+
+    Args:
+        gauges: Extra point-in-time values to export as untyped gauges,
+                keyed by their full sample name (labels included)
+
+    Returns:
+        The exposition text.
+    """
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for sample, value in (gauges or {}).items():
+        lines.append(f"{sample} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def stats_gauges(stats: dict) -> dict[str, float]:
+    """
+    Flatten the GET /stats report into gauge samples.
+
+    Sections holding named entries (e.g., pools, caches, breakers) become one
+    sample per field with a name label; string fields such as a breaker's state
+    become a sample with the string as a label and the value 1.
+
+    Args:
+        stats: Report mapping section name to its statistics
+
+    Returns:
+        Dictionary mapping sample name (labels included) to value.
+    """
+    gauges = {}
+
+    def add(prefix: str, fields: dict, labels: str) -> None:
+        for field, value in fields.items():
+            if isinstance(value, bool):
+                value = int(value)
+            if isinstance(value, (int, float)):
+                gauges[f"{prefix}_{field}{{{labels}}}" if labels else f"{prefix}_{field}"] = value
+            elif isinstance(value, str):
+                label = f'{field}="{value}"'
+                gauges[f"{prefix}_{field}{{{labels + ',' if labels else ''}{label}}}"] = 1
+
+    for section, values in stats.items():
+        prefix = f"mcp_{section}"
+        if values and all(isinstance(v, dict) for v in values.values()):
+            for name, fields in values.items():
+                add(prefix, fields, f'name="{name}"')
+        else:
+            add(prefix, values, "")
+    return gauges
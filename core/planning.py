@@ -0,0 +1,64 @@
+"""Merging of the per-tool results combined by plan_trip."""
+
+import re
+
+_PARENTHETICAL = re.compile(r"\([^)]*\)")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def place_key(name: str) -> str:
+    """
+    Normalize a place name so that variants from different tools match.
+
+    Args:
+        name: Place name (e.g., "Temple of the Tooth Relic (Sri Dalada Maligawa)")
+
+    Returns:
+        The name without parenthetical notes, punctuation, case or repeated
+        whitespace (e.g., "temple of the tooth relic").
+    """
+    name = _PUNCTUATION.sub(" ", _PARENTHETICAL.sub(" ", name))
+    return " ".join(name.split()).casefold()
+
+
+def merge_places(nearby: list, catalog: list, visited: list) -> list[dict]:
+    """
+    Combine nearby places and catalog locations into one list without duplicates.
+
+    Nearby places keep their order (nearest first) and catalog-only locations
+    follow. A place listed by both tools gets the union of their fields and
+    categories.
+
+    Args:
+        nearby: Result of get_nearby_location_activities
+        catalog: Result of get_all_location_for_designation
+        visited: Result of get_past_locations, used to flag places the user has been to
+
+    Returns:
+        A list of places, each with name, category and visited_before, plus
+        distance_km, activities and description where known.
+    """
+    visited_keys = {
+        place_key(str(row["location"]).split(",")[0])
+        for row in visited
+        if isinstance(row, dict) and row.get("location")
+    }
+    merged: dict[str, dict] = {}
+    for row in [*nearby, *catalog]:
+        if not isinstance(row, dict):
+            continue
+        name = row.get("name") or row.get("location")
+        if not name:
+            continue
+        key = place_key(name)
+        place = merged.get(key)
+        if place is None:
+            place = merged[key] = {"name": name, "category": []}
+        for field in ("distance_km", "activities", "description"):
+            if field in row and field not in place:
+                place[field] = row[field]
+        for category in row.get("category") or []:
+            if category not in place["category"]:
+                place["category"].append(category)
+        place["visited_before"] = key in visited_keys
+    return list(merged.values())
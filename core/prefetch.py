@@ -0,0 +1,289 @@
+"""Background prefetching that keeps popular destinations warm in the caches."""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from core.catalog import catalog_cache, location_index
+from core.geocoding import geocode, geocode_cache, normalize_location
+from core.settings import (
+    PREFETCH_CALLS_PER_MINUTE,
+    PREFETCH_CONCURRENCY,
+    PREFETCH_INTERVAL,
+    PREFETCH_SEEDS,
+    PREFETCH_TOP,
+    SERVER_WORKERS,
+)
+from core.weather import fetch_current, fetch_forecast, weather_cache, weather_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Demand scores are multiplied by DECAY after every run and forgotten below
+# FORGET, so a destination stops being refreshed a few runs after its last request.
+DECAY = 0.5
+FORGET = 0.1
+# Most destinations tracked at once; further ones are ignored until scores decay
+MAX_TRACKED = 4096
+
+
+class CallBudget:
+    """
+    Token bucket limiting how many upstream calls prefetching makes per minute.
+
+    Up to a minute's worth of calls can be spent in a burst; spending never
+    waits, so work that does not fit the budget is left for a later run.
+    """
+
+    def __init__(self, calls_per_minute: float) -> None:
+        """
+        Args:
+            calls_per_minute: Calls allowed per minute; 0 allows none
+        """
+        self.capacity = calls_per_minute
+        self.rate = calls_per_minute / 60
+        self.tokens = calls_per_minute
+        self._updated = time.monotonic()
+
+    def try_spend(self, calls: int = 1) -> bool:
+        """
+        Spend tokens for upstream calls if enough are left.
+
+        Args:
+            calls: Number of calls about to be made
+
+        Returns:
+            True if the calls fit the budget and were charged to it.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self.tokens < calls:
+            return False
+        self.tokens -= calls
+        return True
+
+
+class Prefetcher:
+    """
+    Tracks which destinations are requested most and refreshes their cached
+    forecasts and location catalogs before they expire.
+
+    Tools record each request; a background task then runs every `interval`
+    seconds, so hot destinations are answered from the caches instead of
+    waiting on the upstream APIs.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        top: int,
+        concurrency: int,
+        calls_per_minute: float,
+        seeds: list[str],
+    ) -> None:
+        """
+        Args:
+            interval: Seconds between runs
+            top: Number of most requested forecasts and catalogs kept warm
+            concurrency: Most fetches in flight at once
+            calls_per_minute: Budget of upstream calls per minute
+            seeds: Locations geocoded and whose catalogs are loaded at startup
+        """
+        self.interval = interval
+        self.top = top
+        self.concurrency = concurrency
+        self.seeds = seeds
+        self.budget = CallBudget(calls_per_minute)
+        self.runs = 0
+        self.refreshed = 0
+        self.failures = 0
+        self.deferred = 0
+        # (kind, normalized location, date) -> [score, location as last requested]
+        self._demand: dict[tuple[str, str, str], list] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget.capacity > 0 and self.top > 0
+
+    def _record(self, kind: str, location: str, date: str = "") -> None:
+        key = (kind, normalize_location(location), date)
+        entry = self._demand.get(key)
+        if entry is not None:
+            entry[0] += 1
+            entry[1] = location
+        elif len(self._demand) < MAX_TRACKED:
+            self._demand[key] = [1.0, location]
+
+    def record_weather(self, location: str, date: str = "") -> None:
+        """
+        Count a weather request. Only current conditions and dates within the
+        forecast horizon are tracked; past dates are cached for a long time anyway.
+
+        Args:
+            location: Location as given by the caller
+            date: Date in YYYY-MM-DD format, or "" for current weather
+        """
+        if date:
+            try:
+                days_ahead = (datetime.strptime(date, "%Y-%m-%d").date() - datetime.now().date()).days
+            except ValueError:
+                return
+            if not 0 <= days_ahead <= 16:
+                return
+        self._record("weather", location, date)
+
+    def record_catalog(self, location: str) -> None:
+        """
+        Count a request for the location catalog of a designated place.
+
+        Args:
+            location: Location as given by the caller
+        """
+        self._record("catalog", location)
+
+    def hot(self) -> list[tuple[str, str, str]]:
+        """
+        Return the most requested forecasts and catalogs, most requested first.
+
+        Returns:
+            Up to `top` (kind, location, date) tuples of each kind.
+        """
+        ranked = sorted(self._demand.items(), key=lambda item: item[1][0], reverse=True)
+        counts = {"weather": 0, "catalog": 0}
+        hot = []
+        for (kind, _, date), (_, location) in ranked:
+            if counts[kind] < self.top:
+                counts[kind] += 1
+                hot.append((kind, location, date))
+        return hot
+
+    def _due(self, remaining: float | None) -> bool:
+        # Refresh anything that would expire before the run after next
+        return remaining is None or remaining < 2 * self.interval
+
+    def _spend(self) -> bool:
+        if self.budget.try_spend():
+            return True
+        self.deferred += 1
+        return False
+
+    async def _place(self, location: str) -> dict | None:
+        if geocode_cache.expires_in(normalize_location(location)) is None and not self._spend():
+            return None
+        return await geocode(location)
+
+    async def refresh_weather(self, location: str, date: str) -> None:
+        """
+        Refresh a cached forecast or current conditions if they are about to expire.
+
+        Args:
+            location: Location as given by the caller
+            date: Date in YYYY-MM-DD format, or "" for current weather
+        """
+        if date and datetime.strptime(date, "%Y-%m-%d").date() < datetime.now().date():
+            self._demand.pop(("weather", normalize_location(location), date), None)
+            return
+        place = await self._place(location)
+        if place is None:
+            return
+        data_type = "forecast" if date else "current"
+        key = weather_cache_key(place["latitude"], place["longitude"], date or "current", data_type)
+        if not self._due(weather_cache.expires_in(key)) or not self._spend():
+            return
+        if date:
+            await fetch_forecast(place, date)
+        else:
+            await fetch_current(place)
+        self.refreshed += 1
+
+    async def refresh_catalog(self, location: str) -> None:
+        """
+        Reload the location catalog of a designated place if it is about to expire.
+
+        Args:
+            location: Location as given by the caller
+        """
+        if not self._due(catalog_cache.expires_in(normalize_location(location))) or not self._spend():
+            return
+        await location_index(location, refresh=True)
+        self.refreshed += 1
+
+    async def _guarded(self, semaphore: asyncio.Semaphore, job) -> None:
+        async with semaphore:
+            try:
+                await job
+            except Exception as e:
+                self.failures += 1
+                logger.debug("Prefetch failed: %s", e)
+
+    async def run_once(self) -> None:
+        """Refresh the hot destinations that are due, then decay the demand scores."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        jobs = [
+            self.refresh_weather(location, date) if kind == "weather" else self.refresh_catalog(location)
+            for kind, location, date in self.hot()
+        ]
+        await asyncio.gather(*(self._guarded(semaphore, job) for job in jobs))
+        self.runs += 1
+        for key in list(self._demand):
+            entry = self._demand[key]
+            entry[0] *= DECAY
+            if entry[0] < FORGET:
+                del self._demand[key]
+
+    async def warm(self) -> None:
+        """Geocode the seed locations and load their catalogs."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self._guarded(semaphore, self._place(seed)) for seed in self.seeds))
+        await asyncio.gather(*(self._guarded(semaphore, self.refresh_catalog(seed)) for seed in self.seeds))
+
+    async def _run(self) -> None:
+        await self.warm()
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
+
+    def start(self) -> None:
+        """Start the background task in the running event loop, if prefetching is enabled."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background task and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        """
+        Report tracked destinations, run counts and the remaining call budget.
+
+        Returns:
+            Dictionary of counters.
+        """
+        return {
+            "running": self._task is not None,
+            "tracked": len(self._demand),
+            "runs": self.runs,
+            "refreshed": self.refreshed,
+            "failures": self.failures,
+            "deferred": self.deferred,
+            "budget_remaining": round(self.budget.tokens, 1),
+        }
+
+
+# Every worker prefetches for its own requests, so the budget is split between them
+prefetcher = Prefetcher(
+    PREFETCH_INTERVAL,
+    PREFETCH_TOP,
+    PREFETCH_CONCURRENCY,
+    PREFETCH_CALLS_PER_MINUTE / max(SERVER_WORKERS, 1),
+    PREFETCH_SEEDS,
+)
@@ -0,0 +1,62 @@
+"""On-demand sampling profiler reporting the server's hot stacks in the folded format."""
+
+import sys
+import threading
+import time
+from collections import Counter
+
+# Longest profile one request may take, in seconds
+MAX_SECONDS = 60.0
+
+
+def _frame_name(frame) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+def sample_stacks(seconds: float, interval: float) -> Counter:
+    """
+    Sample the stacks of every other thread of the process.
+
+    Meant to run on a thread of its own, e.g. through asyncio.to_thread, so
+    the event loop keeps serving, and being sampled, meanwhile.
+
+    Args:
+        seconds: How long to sample
+        interval: Seconds between samples
+
+    Returns:
+        Counter mapping each stack, outermost frame first and prefixed by
+        the thread name, to the number of samples it was seen in.
+    """
+    seconds = min(max(seconds, 0.0), MAX_SECONDS)
+    interval = max(interval, 0.001)
+    own = threading.get_ident()
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            frames = []
+            while frame is not None:
+                frames.append(_frame_name(frame))
+                frame = frame.f_back
+            frames.append(names.get(ident, f"thread-{ident}"))
+            stacks[";".join(reversed(frames))] += 1
+        time.sleep(interval)
+    return stacks
+
+
+def folded(stacks: Counter) -> str:
+    """
+    Render sampled stacks in the folded format read by flamegraph.pl and speedscope.
+
+    Args:
+        stacks: Samples per stack, as returned by sample_stacks
+
+    Returns:
+        One "frame;frame;frame count" line per stack, most sampled first.
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
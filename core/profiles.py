@@ -0,0 +1,291 @@
+"""Per-user preference profiles aggregated incrementally from past activities and locations."""
+
+import asyncio
+import bisect
+import hashlib
+import json
+import math
+from collections import OrderedDict
+from datetime import date
+
+from core.cache import TTLCache
+from core.history import history_store, sync_history
+from core.settings import PROFILE_CACHE_SIZE, PROFILE_HALF_LIFE_DAYS, PROFILE_SEEN_ROWS, PROFILE_TTL
+
+# Recency weights grow by 2 every half-life from this day on. Only their
+# ratios matter, so interests decay without rescaling stored weights. They are
+# kept as base-2 logarithms, which stay small for any date and half-life.
+_EPOCH = date(2000, 1, 1).toordinal()
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    """Linearly interpolated percentile of a sorted, non-empty list."""
+    position = (len(ordered) - 1) * pct / 100
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def _fingerprint(row: dict) -> str:
+    return hashlib.blake2b(json.dumps(row, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+
+def _log2_add(a: float, b: float) -> float:
+    """log2(2**a + 2**b) without computing either power."""
+    if a < b:
+        a, b = b, a
+    if b == -math.inf:
+        return a
+    return a + math.log2(1 + 2 ** (b - a))
+
+
+def _ordinal(value) -> int | None:
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return None
+
+
+class UserProfile:
+    """
+    Running summary of one user's history.
+
+    Each history row is folded in once: category counts, recency weights,
+    sorted budgets and group-size totals are updated in place, so adding new
+    rows never revisits old ones. A profile built from the history store
+    remembers, per kind, the last row id it folded and the store's removal
+    count at the time.
+    """
+
+    def __init__(self, half_life_days: float, seen_rows: int = PROFILE_SEEN_ROWS) -> None:
+        """
+        Args:
+            half_life_days: Days after which a category's interest weight halves
+            seen_rows: Fingerprints of folded rows kept to skip repeats; the
+                       oldest are forgotten beyond this many
+        """
+        self.half_life_days = half_life_days
+        self.activities = 0
+        self.locations = 0
+        self.categories: dict[str, int] = {}
+        self.seen_rows = seen_rows
+        # log2 of each category's summed recency weight
+        self.interest_log_weights: dict[str, float] = {}
+        self.place_counts: dict[str, int] = {}
+        self.budgets: list[float] = []
+        self.group_sizes: list[int] = []
+        self.first_date: int | None = None
+        self.folded: dict[str, tuple[int, int]] = {}
+        self.last_date: int | None = None
+        self._seen: OrderedDict[str, None] = OrderedDict()
+
+    def _is_new(self, key: str) -> bool:
+        if key in self._seen:
+            return False
+        self._seen[key] = None
+        if len(self._seen) > self.seen_rows:
+            self._seen.popitem(last=False)
+        return True
+
+    def _add_common(self, row: dict) -> None:
+        day = _ordinal(row.get("date", ""))
+        if day is not None:
+            self.first_date = day if self.first_date is None else min(self.first_date, day)
+            self.last_date = day if self.last_date is None else max(self.last_date, day)
+        log_weight = (day - _EPOCH) / self.half_life_days if day is not None else -math.inf
+        for category in row.get("category") or []:
+            category = str(category).casefold()
+            self.categories[category] = self.categories.get(category, 0) + 1
+            self.interest_log_weights[category] = _log2_add(
+                self.interest_log_weights.get(category, -math.inf), log_weight
+            )
+
+    def add_activities(self, rows: list) -> int:
+        """
+        Fold new past-activity rows into the profile.
+
+        Args:
+            rows: Rows as returned by get_past_activities; rows seen before are skipped
+
+        Returns:
+            Number of rows that were new.
+        """
+        added = 0
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            if not self._is_new("a:" + _fingerprint(row)):
+                continue
+            self._add_common(row)
+            if isinstance(row.get("budget"), (int, float)):
+                bisect.insort(self.budgets, float(row["budget"]))
+            self.activities += 1
+            added += 1
+        return added
+
+    def add_locations(self, rows: list) -> int:
+        """
+        Fold new past-location rows into the profile.
+
+        Args:
+            rows: Rows as returned by get_past_locations; rows seen before are skipped
+
+        Returns:
+            Number of rows that were new.
+        """
+        added = 0
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            if not self._is_new("l:" + _fingerprint(row)):
+                continue
+            self._add_common(row)
+            if isinstance(row.get("group_size"), int):
+                bisect.insort(self.group_sizes, row["group_size"])
+            if row.get("location"):
+                self.place_counts[row["location"]] = self.place_counts.get(row["location"], 0) + 1
+            self.locations += 1
+            added += 1
+        return added
+
+    def summary(self, top: int = 5) -> dict:
+        """
+        Build the compact profile served to the agent.
+
+        Args:
+            top: Number of entries to keep in the ranked lists
+
+        Returns:
+            Dictionary with history counts and dates, category frequencies,
+            recency-weighted interests, budget percentiles, group-size
+            statistics and the most visited places.
+        """
+        # Weights relative to the largest, which is 1
+        top_log_weight = max(self.interest_log_weights.values(), default=-math.inf)
+        weights = {
+            category: 2 ** (log_weight - top_log_weight)
+            for category, log_weight in self.interest_log_weights.items()
+            if log_weight > -math.inf
+        }
+        total_weight = sum(weights.values())
+        interests = sorted(weights.items(), key=lambda item: item[1], reverse=True)
+        summary = {
+            "activities": self.activities,
+            "locations": self.locations,
+            "first_date": date.fromordinal(self.first_date).isoformat() if self.first_date else None,
+            "last_date": date.fromordinal(self.last_date).isoformat() if self.last_date else None,
+            "categories": dict(sorted(self.categories.items(), key=lambda item: (-item[1], item[0]))),
+            "interests": {
+                category: round(weight / total_weight, 3)
+                for category, weight in interests[:top]
+            } if total_weight else {},
+            "budget": None,
+            "group_size": None,
+            "top_locations": [
+                place for place, _ in sorted(self.place_counts.items(), key=lambda item: -item[1])[:top]
+            ],
+        }
+        if self.budgets:
+            summary["budget"] = {
+                "min": self.budgets[0],
+                "p25": round(_percentile(self.budgets, 25), 1),
+                "median": round(_percentile(self.budgets, 50), 1),
+                "p75": round(_percentile(self.budgets, 75), 1),
+                "p90": round(_percentile(self.budgets, 90), 1),
+                "max": self.budgets[-1],
+                "mean": round(sum(self.budgets) / len(self.budgets), 1),
+            }
+        if self.group_sizes:
+            summary["group_size"] = {
+                "min": self.group_sizes[0],
+                "median": _percentile(self.group_sizes, 50),
+                "max": self.group_sizes[-1],
+                "mean": round(sum(self.group_sizes) / len(self.group_sizes), 1),
+                "solo_share": round(self.group_sizes.count(1) / len(self.group_sizes), 3),
+            }
+        return summary
+
+
+profile_cache = TTLCache(PROFILE_CACHE_SIZE, PROFILE_TTL)
+
+
+def user_profile(user: str) -> UserProfile:
+    """
+    Return the cached profile for a user, creating an empty one on a miss.
+
+    Args:
+        user: Username
+
+    Returns:
+        The user's UserProfile.
+    """
+    profile = profile_cache.get(user)
+    if profile is None:
+        profile = UserProfile(PROFILE_HALF_LIFE_DAYS)
+        profile_cache.set(user, profile)
+    return profile
+
+
+def _fold(profile: UserProfile, kind: str, removed: int, rows: list[tuple[int, dict]]) -> None:
+    last_id = profile.folded.get(kind, (0, 0))[1]
+    # Another call may have folded some of the rows while these were read
+    rows = [(row_id, row) for row_id, row in rows if row_id > last_id]
+    if kind == "activities":
+        profile.add_activities([row for _, row in rows])
+    else:
+        profile.add_locations([row for _, row in rows])
+    profile.folded[kind] = (removed, rows[-1][0] if rows else last_id)
+
+
+async def fold_history(user: str, kind: str) -> UserProfile:
+    """
+    Fold the stored rows of one kind that a user's cached profile has not seen yet.
+
+    Rows are picked by id from the history store rather than taken from this
+    process's last sync, so rows another worker synced are folded too. If
+    rows the profile folded were removed from the store since, because the
+    backend edited or deleted them, the profile is rebuilt from the store.
+
+    Args:
+        user: Username
+        kind: "activities" or "locations"
+
+    Returns:
+        The user's up-to-date profile.
+    """
+    profile = user_profile(user)
+    removed, rows = await asyncio.to_thread(history_store.rows_after, user, kind, profile.folded.get(kind, (0, 0))[1])
+    if kind not in profile.folded or profile.folded[kind][0] == removed:
+        _fold(profile, kind, removed, rows)
+        return profile
+
+    profile = UserProfile(PROFILE_HALF_LIFE_DAYS)
+    for each in ("activities", "locations"):
+        _fold(profile, each, *await asyncio.to_thread(history_store.rows_after, user, each, 0))
+    profile_cache.set(user, profile)
+    return profile
+
+
+async def sync_profile(user: str, kind: str) -> bool:
+    """
+    Bring a user's cached profile up to date with one kind of history.
+
+    Only rows new since the last sync are requested from the backend, and
+    the profile folds in whatever stored rows it has not seen yet.
+
+    Args:
+        user: Username
+        kind: "activities" or "locations"
+
+    Returns:
+        True if the profile reflects the stored history, False if the sync
+        failed and nothing is stored for the user yet.
+    """
+    try:
+        await sync_history(user, kind)
+    except Exception:
+        # With a stored history, use it; the next call tries the sync again
+        if await asyncio.to_thread(history_store.sync_state, user, kind) is None:
+            return False
+    await fold_history(user, kind)
+    return True
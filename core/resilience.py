@@ -0,0 +1,304 @@
+"""Adaptive timeouts, hedged requests and budgeted retries for upstream calls."""
+
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from core.breaker import CircuitBreaker, CircuitOpenError
+from core.tracing import event
+
+# Latencies observed before timeouts and hedging adapt to them
+MIN_SAMPLES = 20
+
+
+class UpstreamStatusError(Exception):
+    """Raised when an upstream answers with a status other than 200."""
+
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"API returned status {status_code}")
+        self.status_code = status_code
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Tell whether a failed upstream call may succeed if repeated.
+
+    Args:
+        error: The exception the call raised
+
+    Returns:
+        True for transport errors and timeouts, server errors and HTTP 429.
+    """
+    if isinstance(error, UpstreamStatusError):
+        return error.status_code >= 500 or error.status_code == 429
+    return isinstance(error, httpx.TransportError)
+
+
+@dataclass
+class UpstreamPolicy:
+    """How calls to one upstream are timed out, hedged and retried."""
+
+    min_timeout: float = 0.5
+    timeout_multiplier: float = 3.0
+    retries: int = 2
+    retry_backoff: float = 0.1
+    hedge: bool = True
+
+
+class LatencyWindow:
+    """Latencies of an upstream's most recent calls, with percentiles over them."""
+
+    def __init__(self, size: int = 256) -> None:
+        """
+        Args:
+            size: Number of most recent latencies kept
+        """
+        self._samples: deque[float] = deque(maxlen=size)
+        self._sorted: list[float] | None = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._sorted = None
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Return a percentile of the kept latencies.
+
+        Args:
+            q: Percentile between 0 and 1 (e.g., 0.95)
+
+        Returns:
+            The latency in seconds, or None if fewer than MIN_SAMPLES were observed.
+        """
+        if len(self._samples) < MIN_SAMPLES:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        return self._sorted[min(int(q * len(self._sorted)), len(self._sorted) - 1)]
+
+
+class RetryBudget:
+    """
+    Caps retries and hedged requests across all upstreams.
+
+    Every first attempt earns `ratio` of a token and tokens also accrue at
+    `min_per_second`; each retry or hedge spends one. During an outage the
+    extra load is therefore at most `ratio` times the normal request rate,
+    instead of multiplying it by the number of retries.
+    """
+
+    def __init__(self, ratio: float, min_per_second: float) -> None:
+        """
+        Args:
+            ratio: Extra calls allowed per first attempt
+            min_per_second: Extra calls allowed per second regardless of traffic
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        # Allows a burst of ten seconds' worth of the minimum rate
+        self.capacity = max(1.0, 10 * min_per_second)
+        self.tokens = self.capacity
+        self.spent = 0
+        self.denied = 0
+        self._updated = time.monotonic()
+
+    def _refill(self, earned: float = 0.0) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + earned + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def deposit(self) -> None:
+        """Record a first attempt."""
+        self._refill(self.ratio)
+
+    def try_spend(self) -> bool:
+        """
+        Take a token for a retry or hedge.
+
+        Returns:
+            True if the extra call is within budget.
+        """
+        self._refill()
+        if self.tokens < 1:
+            self.denied += 1
+            return False
+        self.tokens -= 1
+        self.spent += 1
+        return True
+
+    def stats(self) -> dict:
+        self._refill()
+        return {"tokens": round(self.tokens, 2), "spent": self.spent, "denied": self.denied}
+
+
+class Upstream:
+    """
+    Runs the calls to one upstream under its policy.
+
+    An attempt that may still be retried times out after `timeout_multiplier`
+    times the upstream's observed p99 latency, between `min_timeout` and the
+    caller's timeout; the caller's timeout also bounds every attempt together. An attempt still
+    running at the observed p95 is hedged with a duplicate, and the first
+    answer wins. Failed attempts are retried after a jittered exponential
+    backoff. Hedges and retries both draw on the shared RetryBudget and are
+    skipped while the upstream's circuit breaker is not closed.
+    """
+
+    def __init__(self, name: str, policy: UpstreamPolicy, breaker: CircuitBreaker, budget: RetryBudget) -> None:
+        """
+        Args:
+            name: Name of the upstream
+            policy: How its calls are timed out, hedged and retried
+            breaker: Its circuit breaker
+            budget: Retry budget shared by all upstreams
+        """
+        self.name = name
+        self.policy = policy
+        self.breaker = breaker
+        self.budget = budget
+        self.latency = LatencyWindow()
+        self.calls = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def attempt_timeout(self, timeout: float) -> float:
+        """
+        Return the timeout of a single attempt.
+
+        Args:
+            timeout: The caller's timeout in seconds
+
+        Returns:
+            The adaptive timeout, or `timeout` until enough latencies were observed.
+        """
+        p99 = self.latency.percentile(0.99)
+        if p99 is None:
+            return timeout
+        return min(timeout, max(self.policy.min_timeout, self.policy.timeout_multiplier * p99))
+
+    def hedge_delay(self) -> float | None:
+        """
+        Return how long an attempt runs before it is hedged.
+
+        Returns:
+            The observed p95 latency, or None if hedging is off or not enough
+            latencies were observed.
+        """
+        return self.latency.percentile(0.95) if self.policy.hedge else None
+
+    async def _timed(self, attempt: Callable[[float], Awaitable[Any]], timeout: float) -> Any:
+        start = time.perf_counter()
+        try:
+            result = await attempt(timeout)
+        except httpx.TimeoutException:
+            # Slower than the timeout; counting it keeps timeouts from shrinking under load
+            self.latency.add(time.perf_counter() - start)
+            raise
+        self.latency.add(time.perf_counter() - start)
+        return result
+
+    async def _hedged(self, attempt: Callable[[float], Awaitable[Any]], timeout: float) -> Any:
+        primary = asyncio.ensure_future(self._timed(attempt, timeout))
+        tasks = [primary]
+        try:
+            delay = self.hedge_delay()
+            if delay is None or delay >= timeout:
+                return await primary
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or self.breaker.state != "closed" or not self.budget.try_spend():
+                return await primary
+
+            self.hedges += 1
+            event("hedge", after_ms=round(delay * 1000, 1))
+            tasks.append(asyncio.ensure_future(self._timed(attempt, timeout - delay)))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+            raise primary.exception()
+        finally:
+            for task in tasks:
+                if task.done():
+                    if not task.cancelled():
+                        task.exception()
+                else:
+                    task.cancel()
+
+    async def call(self, attempt: Callable[[float], Awaitable[Any]], timeout: float) -> Any:
+        """
+        Make a call, hedging and retrying its attempts under the policy.
+
+        Args:
+            attempt: Coroutine function making one attempt with the given timeout
+            timeout: The caller's timeout, bounding all attempts together
+
+        Returns:
+            The result of the first successful attempt.
+
+        Raises:
+            Exception: The last attempt's error once it is not retryable, the
+                       retries or the retry budget are used up, the circuit
+                       opens, or too little of the timeout is left.
+        """
+        self.calls += 1
+        self.budget.deposit()
+        deadline = time.monotonic() + timeout
+        tries = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            # Cutting an attempt short only helps if a retry can follow it
+            if tries < self.policy.retries:
+                remaining = min(self.attempt_timeout(timeout), remaining)
+            try:
+                return await self._hedged(attempt, remaining)
+            except Exception as e:
+                tries += 1
+                if not is_retryable(e) or tries > self.policy.retries:
+                    raise
+                backoff = random.uniform(0, self.policy.retry_backoff * 2 ** (tries - 1))
+                if deadline - time.monotonic() - backoff < self.policy.min_timeout:
+                    raise
+                if not self.budget.try_spend():
+                    raise
+                try:
+                    self.breaker.before_call()
+                except CircuitOpenError:
+                    raise e from None
+                self.retries += 1
+                event("retry", attempt=tries, backoff_ms=round(backoff * 1000, 1))
+                await asyncio.sleep(backoff)
+
+    def stats(self) -> dict:
+        """
+        Report observed latency percentiles, the current attempt timeout and
+        retry and hedge counts.
+
+        Returns:
+            Dictionary of latencies in milliseconds and counters.
+        """
+        percentiles = {
+            f"p{round(q * 100)}_ms": round(value * 1000, 1) if value is not None else None
+            for q in (0.5, 0.95, 0.99)
+            for value in [self.latency.percentile(q)]
+        }
+        return {
+            "samples": len(self.latency),
+            **percentiles,
+            "calls": self.calls,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
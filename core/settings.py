@@ -0,0 +1,173 @@
+"""Runtime configuration for the MCP Server, read from environment variables."""
+
+import json
+import os
+
+# Upstream endpoints. Override these to point the tools at local stubs.
+BACKEND_API_URL = os.environ.get("BACKEND_API_URL", "http://localhost:3000/api")
+GEOCODING_URL = os.environ.get("GEOCODING_URL", "https://geocoding-api.open-meteo.com/v1/search")
+FORECAST_URL = os.environ.get("FORECAST_URL", "https://api.open-meteo.com/v1/forecast")
+ARCHIVE_URL = os.environ.get("ARCHIVE_URL", "https://archive-api.open-meteo.com/v1/archive")
+
+# Request timeouts in seconds
+BACKEND_TIMEOUT = float(os.environ.get("BACKEND_TIMEOUT", "5"))
+WEATHER_TIMEOUT = float(os.environ.get("WEATHER_TIMEOUT", "10"))
+
+# Connection pool for the Open-Meteo endpoints
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# Keep-alive connection pool for the backend API. Idle connections are closed
+# after BACKEND_KEEPALIVE_EXPIRY seconds.
+BACKEND_MAX_CONNECTIONS = int(os.environ.get("BACKEND_MAX_CONNECTIONS", "50"))
+BACKEND_MAX_KEEPALIVE = int(os.environ.get("BACKEND_MAX_KEEPALIVE", "50"))
+BACKEND_KEEPALIVE_EXPIRY = float(os.environ.get("BACKEND_KEEPALIVE_EXPIRY", "60"))
+
+# Geocoding cache: entries live for GEOCODE_CACHE_TTL seconds and are persisted
+# to GEOCODE_CACHE_PATH (a JSON file) when set, so warm restarts skip geocoding.
+# The file is rewritten a few seconds after a change, off the event loop, and at shutdown.
+GEOCODE_CACHE_SIZE = int(os.environ.get("GEOCODE_CACHE_SIZE", "1024"))
+GEOCODE_CACHE_TTL = float(os.environ.get("GEOCODE_CACHE_TTL", str(30 * 24 * 3600)))
+GEOCODE_CACHE_PATH = os.environ.get("GEOCODE_CACHE_PATH", "")
+
+# Weather response cache. Archive data never changes, so it is kept far longer
+# than forecasts or current conditions.
+WEATHER_CACHE_SIZE = int(os.environ.get("WEATHER_CACHE_SIZE", "4096"))
+WEATHER_TTL_HISTORICAL = float(os.environ.get("WEATHER_TTL_HISTORICAL", str(30 * 24 * 3600)))
+WEATHER_TTL_FORECAST = float(os.environ.get("WEATHER_TTL_FORECAST", "3600"))
+WEATHER_TTL_CURRENT = float(os.environ.get("WEATHER_TTL_CURRENT", "300"))
+
+# Table of monthly climate normals used for dates beyond the forecast horizon
+# and when live weather cannot be fetched (build with scripts/build_climatology.py).
+# A place uses the nearest station within CLIMATOLOGY_MAX_KM.
+CLIMATOLOGY_PATH = os.environ.get(
+    "CLIMATOLOGY_PATH", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "climatology.bin")
+)
+CLIMATOLOGY_MAX_KM = float(os.environ.get("CLIMATOLOGY_MAX_KM", "150"))
+
+# Longest span get_weather_range answers in one call
+WEATHER_RANGE_MAX_DAYS = int(os.environ.get("WEATHER_RANGE_MAX_DAYS", "92"))
+
+# Batch tools: calls run concurrently per batch, and batches are capped in size
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "8"))
+BATCH_MAX_ITEMS = int(os.environ.get("BATCH_MAX_ITEMS", "50"))
+
+# Circuit breakers: an upstream is skipped after BREAKER_FAILURE_THRESHOLD
+# consecutive failures and probed again after BREAKER_RESET_TIMEOUT seconds.
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.environ.get("BREAKER_RESET_TIMEOUT", "30"))
+
+# Upstream call policy. An attempt times out after UPSTREAM_TIMEOUT_MULTIPLIER
+# times the upstream's observed p99 latency, but after no less than
+# UPSTREAM_MIN_TIMEOUT seconds and no more than the caller's timeout (which
+# also bounds all attempts together). With UPSTREAM_HEDGE, an attempt still
+# running at the observed p95 is duplicated. A failed attempt is retried up to
+# UPSTREAM_RETRIES times after a random backoff of up to UPSTREAM_RETRY_BACKOFF
+# seconds, doubling each time. UPSTREAM_POLICIES overrides these per upstream
+# as JSON, e.g. {"archive": {"hedge": false, "retries": 0}}.
+UPSTREAM_MIN_TIMEOUT = float(os.environ.get("UPSTREAM_MIN_TIMEOUT", "0.5"))
+UPSTREAM_TIMEOUT_MULTIPLIER = float(os.environ.get("UPSTREAM_TIMEOUT_MULTIPLIER", "3"))
+UPSTREAM_RETRIES = int(os.environ.get("UPSTREAM_RETRIES", "2"))
+UPSTREAM_RETRY_BACKOFF = float(os.environ.get("UPSTREAM_RETRY_BACKOFF", "0.1"))
+UPSTREAM_HEDGE = os.environ.get("UPSTREAM_HEDGE", "true").lower() in ("1", "true", "yes")
+UPSTREAM_POLICIES = json.loads(os.environ.get("UPSTREAM_POLICIES", "{}"))
+
+# Retries and hedges across all upstreams are capped at RETRY_BUDGET_RATIO
+# extra calls per request plus RETRY_BUDGET_MIN_PER_SECOND, so they cannot
+# multiply the load on an upstream that is failing.
+RETRY_BUDGET_RATIO = float(os.environ.get("RETRY_BUDGET_RATIO", "0.1"))
+RETRY_BUDGET_MIN_PER_SECOND = float(os.environ.get("RETRY_BUDGET_MIN_PER_SECOND", "1"))
+
+# Stale-while-revalidate cache for backend payloads: served as is for
+# BACKEND_FRESH_TTL seconds, then served stale for up to BACKEND_STALE_TTL more
+# seconds while a background fetch refreshes it. Set both to 0 to disable.
+BACKEND_CACHE_SIZE = int(os.environ.get("BACKEND_CACHE_SIZE", "1024"))
+BACKEND_FRESH_TTL = float(os.environ.get("BACKEND_FRESH_TTL", "300"))
+BACKEND_STALE_TTL = float(os.environ.get("BACKEND_STALE_TTL", "3600"))
+
+# Users' past activities and locations are kept in the SQLite file at
+# HISTORY_DB_PATH (a file in the temp directory if unset). A user's history is
+# synced with the backend at most every HISTORY_SYNC_INTERVAL seconds, asking
+# only for entries dated on or after the latest one stored.
+HISTORY_DB_PATH = os.environ.get("HISTORY_DB_PATH", "")
+HISTORY_SYNC_INTERVAL = float(os.environ.get("HISTORY_SYNC_INTERVAL", str(BACKEND_FRESH_TTL)))
+
+# Number of designated places whose location catalog is kept indexed in memory
+CATALOG_SIZE = int(os.environ.get("CATALOG_SIZE", "256"))
+
+# Nearby attraction queries: default search radius and result count, and the
+# cell size in degrees of the spatial index (0.1 degrees is about 11 km)
+NEARBY_RADIUS_KM = float(os.environ.get("NEARBY_RADIUS_KM", "50"))
+NEARBY_LIMIT = int(os.environ.get("NEARBY_LIMIT", "10"))
+NEARBY_GRID_DEG = float(os.environ.get("NEARBY_GRID_DEG", "0.1"))
+
+# User profiles aggregated from past activities and locations. A profile is
+# rebuilt from scratch after PROFILE_TTL seconds; interests in a category
+# halve in weight every PROFILE_HALF_LIFE_DAYS. A profile remembers the last
+# PROFILE_SEEN_ROWS rows it folded in, so a row fetched again is not counted twice.
+PROFILE_CACHE_SIZE = int(os.environ.get("PROFILE_CACHE_SIZE", "1024"))
+PROFILE_TTL = float(os.environ.get("PROFILE_TTL", str(24 * 3600)))
+PROFILE_HALF_LIFE_DAYS = float(os.environ.get("PROFILE_HALF_LIFE_DAYS", "90"))
+PROFILE_SEEN_ROWS = int(os.environ.get("PROFILE_SEEN_ROWS", "10000"))
+
+# Prefetching of popular destinations. Every PREFETCH_INTERVAL seconds the
+# PREFETCH_TOP most requested forecasts and location catalogs are refreshed if
+# they would expire before the run after next, with at most
+# PREFETCH_CONCURRENCY fetches at a time and at most PREFETCH_CALLS_PER_MINUTE
+# upstream calls per minute across all workers (0 disables prefetching).
+# PREFETCH_SEEDS (comma-separated) are geocoded and their catalogs loaded at startup.
+PREFETCH_INTERVAL = float(os.environ.get("PREFETCH_INTERVAL", "60"))
+PREFETCH_TOP = int(os.environ.get("PREFETCH_TOP", "20"))
+PREFETCH_CONCURRENCY = int(os.environ.get("PREFETCH_CONCURRENCY", "4"))
+PREFETCH_CALLS_PER_MINUTE = float(os.environ.get("PREFETCH_CALLS_PER_MINUTE", "60"))
+PREFETCH_SEEDS = [seed.strip() for seed in os.environ.get("PREFETCH_SEEDS", "Kandy").split(",") if seed.strip()]
+
+# Admission control for tool calls. At most ADMISSION_MAX_CONCURRENT calls run
+# at once, and at most ADMISSION_PER_SESSION per client session. Further calls
+# wait in a queue of ADMISSION_QUEUE_SIZE for up to ADMISSION_QUEUE_TIMEOUT
+# seconds, with ADMISSION_PRIORITY_TOOLS (comma-separated) served first. A
+# call that finds the queue full or waits too long gets a "busy" result at
+# once. A limit of 0 disables it. A session is keyed by the MCP session id, or
+# by the X-Client-Id header when there is none, as in stateless mode; calls
+# carrying neither are limited only by ADMISSION_MAX_CONCURRENT.
+ADMISSION_MAX_CONCURRENT = int(os.environ.get("ADMISSION_MAX_CONCURRENT", "64"))
+ADMISSION_PER_SESSION = int(os.environ.get("ADMISSION_PER_SESSION", "8"))
+ADMISSION_QUEUE_SIZE = int(os.environ.get("ADMISSION_QUEUE_SIZE", "128"))
+ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", "2"))
+ADMISSION_PRIORITY_TOOLS = [
+    name.strip() for name in os.environ.get("ADMISSION_PRIORITY_TOOLS", "validate_future_date").split(",") if name.strip()
+]
+
+# Compact tool output. For each client session the server remembers the
+# COMPACT_REFS_PER_SESSION most recent objects it sent, so compact results can
+# refer to them instead of repeating them, for up to COMPACT_MAX_SESSIONS sessions.
+# Sessions are keyed by the MCP session id; without one, as in stateless mode,
+# every object is sent in full.
+COMPACT_REFS_PER_SESSION = int(os.environ.get("COMPACT_REFS_PER_SESSION", "512"))
+COMPACT_MAX_SESSIONS = int(os.environ.get("COMPACT_MAX_SESSIONS", "1024"))
+
+# Fraction of tool calls whose result is serialised a second time to record
+# its size in mcp_tool_response_bytes; the other calls skip that cost.
+METRICS_SIZE_SAMPLE_RATE = float(os.environ.get("METRICS_SIZE_SAMPLE_RATE", "0.1"))
+
+# Tracing of tool calls. A fraction TRACE_SAMPLE_RATE of calls records a span
+# timeline, and the TRACE_SLOWEST slowest traced calls are kept for GET /traces.
+# POST /traces/export writes them in the Chrome trace format to
+# TRACE_EXPORT_PATH (a per-process file in the temp directory if unset).
+TRACE_SAMPLE_RATE = float(os.environ.get("TRACE_SAMPLE_RATE", "1"))
+TRACE_SLOWEST = int(os.environ.get("TRACE_SLOWEST", "50"))
+TRACE_EXPORT_PATH = os.environ.get("TRACE_EXPORT_PATH", "")
+
+# Address the MCP server listens on, and its log level
+SERVER_HOST = os.environ.get("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.environ.get("SERVER_PORT", "8000"))
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+
+# Worker processes serving the port. With more than one, sessions are
+# stateless (any worker answers any request) and the geocoding, weather and
+# catalog caches are shared through the SQLite file at SHARED_CACHE_PATH
+# (a file in the temp directory if unset). Send SIGHUP to the server to
+# restart the workers one at a time.
+SERVER_WORKERS = int(os.environ.get("SERVER_WORKERS", "1"))
+STATELESS_HTTP = os.environ.get("STATELESS_HTTP", "").lower() in ("1", "true", "yes") or SERVER_WORKERS > 1
+SHARED_CACHE_PATH = os.environ.get("SHARED_CACHE_PATH", "")
@@ -0,0 +1,37 @@
+"""Response shaping for list results: field projection and pagination."""
+
+from typing import Any
+
+
+def project(row: Any, fields: list[str] | None) -> Any:
+    """
+    Keep only the requested fields of a row.
+
+    Args:
+        row: A result row; rows that are not dictionaries are returned unchanged
+        fields: Field names to keep, or None to keep every field
+
+    Returns:
+        A new dictionary with the requested fields present in the row, or the row itself.
+    """
+    if not fields or not isinstance(row, dict):
+        return row
+    return {field: row[field] for field in fields if field in row}
+
+
+def shape(rows: list, fields: list[str] | None = None, limit: int | None = None, offset: int = 0) -> list:
+    """
+    Project and paginate a list of rows.
+
+    Args:
+        rows: Rows to shape
+        fields: Field names to keep in each row, or None for all
+        limit: Maximum number of rows to return, or None for all
+        offset: Number of leading rows to skip
+
+    Returns:
+        The selected page of projected rows. Only those rows are copied.
+    """
+    offset = max(offset, 0)
+    end = None if limit is None else offset + max(limit, 0)
+    return [project(row, fields) for row in rows[offset:end]]
@@ -0,0 +1,184 @@
+"""SQLite-backed key-value store for sharing cached responses between worker processes."""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any
+
+from core.settings import SERVER_WORKERS, SHARED_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+
+class SharedStore:
+    """
+    Expiring key-value entries in a local SQLite database.
+
+    Every worker process opens the same file, so a value cached by one worker
+    is found by the others. The database runs in WAL mode, so readers never
+    block the writer. Values must be JSON-serializable.
+
+    Lookups are primary-key reads made where they are called. Writes are
+    queued and written together by a worker thread shortly after, so storing
+    an entry never waits on the database; this process sees queued entries at
+    once, the others once they are written.
+    """
+
+    def __init__(self, path: str, write_delay: float = 0.05) -> None:
+        """
+        Args:
+            path: Database file, created if missing
+            write_delay: Seconds writes are queued before being written together
+        """
+        self.path = path
+        self.write_delay = write_delay
+        self.hits = 0
+        self.misses = 0
+        self.write_errors = 0
+        self._local = threading.local()
+        self._pending: dict[tuple[str, str], tuple[float, Any]] = {}
+        self._write_task: asyncio.Task | None = None
+        self._write_lock = asyncio.Lock()
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # Open lazily per thread, and again after a fork: connections must not cross processes
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, expires_at REAL NOT NULL, value TEXT NOT NULL,"
+                " PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+            )
+            local.db = db
+            local.pid = os.getpid()
+        return local.db
+
+    def get(self, namespace: str, key: str) -> tuple[float, Any] | None:
+        """
+        Look up an entry that has not expired.
+
+        Args:
+            namespace: Cache the entry belongs to (e.g., "geocode")
+            key: Key within the namespace
+
+        Returns:
+            Tuple of the entry's expiry time (epoch seconds) and value, or None on a miss.
+        """
+        pending = self._pending.get((namespace, key))
+        if pending is not None and pending[0] > time.time():
+            self.hits += 1
+            return pending
+        row = self.db.execute(
+            "SELECT expires_at, value FROM entries WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (namespace, key, time.time()),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0], json.loads(row[1])
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        """
+        Store an entry, replacing any previous value.
+
+        Args:
+            namespace: Cache the entry belongs to (e.g., "geocode")
+            key: Key within the namespace
+            value: JSON-serializable value
+            ttl: Lifetime in seconds
+        """
+        self._pending[(namespace, key)] = (time.time() + ttl, value)
+        if self._write_task is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to defer to, e.g. a script filling the cache
+            self._write(self._take_pending())
+            return
+        self._write_task = loop.create_task(self._write_later())
+
+    def _take_pending(self) -> dict[tuple[str, str], tuple[float, Any]]:
+        pending, self._pending = self._pending, {}
+        return pending
+
+    async def _write_later(self) -> None:
+        try:
+            await asyncio.sleep(self.write_delay)
+        finally:
+            self._write_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write queued entries from a worker thread; a failed write is logged and dropped."""
+        async with self._write_lock:
+            pending = self._take_pending()
+            if not pending:
+                return
+            try:
+                await asyncio.to_thread(self._write, pending)
+            except Exception as e:
+                # The entries are only a cache, so losing them costs a refetch
+                self.write_errors += 1
+                logger.warning("Writing %d shared cache entries failed: %s", len(pending), e)
+
+    def _write(self, entries: dict[tuple[str, str], tuple[float, Any]]) -> None:
+        db = self.db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(
+                "INSERT OR REPLACE INTO entries (namespace, key, expires_at, value) VALUES (?, ?, ?, ?)",
+                [(namespace, key, expires, json.dumps(value)) for (namespace, key), (expires, value) in entries.items()],
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def purge(self) -> int:
+        """
+        Delete expired entries.
+
+        Returns:
+            Number of entries deleted.
+        """
+        return self.db.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def stats(self) -> dict:
+        """
+        Report the number of stored entries and this process's hit counts.
+
+        Returns:
+            Dictionary with entries, queued writes, failed writes, hits, misses and hit_ratio.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0],
+            "pending": len(self._pending),
+            "write_errors": self.write_errors,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _store_path() -> str:
+    if SHARED_CACHE_PATH:
+        return SHARED_CACHE_PATH
+    if SERVER_WORKERS > 1:
+        return os.path.join(tempfile.gettempdir(), "mcp-shared-cache.sqlite")
+    return ""
+
+
+# Shared between workers when several are configured, otherwise unused
+shared_store = SharedStore(_store_path()) if _store_path() else None
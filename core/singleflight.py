@@ -0,0 +1,80 @@
+"""Coalescing of concurrent identical upstream requests into a single fetch."""
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable
+
+
+class _Call:
+    """An in-flight call and the number of callers waiting on it."""
+
+    __slots__ = ("task", "callers")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.callers = 1
+
+
+class SingleFlight:
+    """
+    Share one in-flight call among every concurrent caller asking for the same key.
+
+    The first caller for a key starts the call; callers that arrive before it
+    finishes wait for the same result. When a result is shared, each caller
+    receives its own deep copy so none can see another's mutations. The call
+    runs as its own task, so a cancelled caller does not cancel it for the rest.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        self._calls: dict[str, _Call] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` for a key, or join the call already in flight for it.
+
+        Args:
+            key: Identity of the call (e.g., the request URL)
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            The call's result, copied if it was shared with other callers.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+        """
+        call = self._calls.get(key)
+        if call is None or call.task.done():
+            self.calls += 1
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._finish(key, call))
+        else:
+            self.coalesced += 1
+            call.callers += 1
+
+        result = await asyncio.shield(call.task)
+        if call.callers > 1:
+            return copy.deepcopy(result)
+        return result
+
+    def _finish(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every caller was cancelled.
+        if not call.task.cancelled():
+            call.task.exception()
+
+    def stats(self) -> dict:
+        """
+        Report how many calls were made and how many callers joined one in flight.
+
+        Returns:
+            Dictionary with calls, coalesced and in_flight counts.
+        """
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
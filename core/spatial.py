@@ -0,0 +1,247 @@
+"""Grid-based spatial index for distance-bounded queries over known attractions."""
+
+import heapq
+import math
+
+from core.datasets import ATTRACTIONS
+from core.settings import NEARBY_GRID_DEG
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance between two points.
+
+    Args:
+        lat1: Latitude of the first point in degrees
+        lon1: Longitude of the first point in degrees
+        lat2: Latitude of the second point in degrees
+        lon2: Longitude of the second point in degrees
+
+    Returns:
+        The distance in kilometres.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class SpatialIndex:
+    """
+    Points bucketed into a grid of square cells of `cell_deg` degrees.
+
+    A query only measures the points in the cells around its origin: a
+    radius query scans the cells overlapping the radius, and a nearest query
+    scans rings of cells outwards until no unscanned point can be closer.
+    """
+
+    def __init__(self, cell_deg: float) -> None:
+        """
+        Args:
+            cell_deg: Cell size in degrees of latitude and longitude
+        """
+        self.cell_deg = cell_deg
+        self._cells: dict[tuple[int, int], list[tuple[float, float, dict]]] = {}
+        self._size = 0
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return (math.floor(latitude / self.cell_deg), math.floor(longitude / self.cell_deg))
+
+    def add(self, latitude: float, longitude: float, item: dict) -> None:
+        """
+        Index an item at a position.
+
+        Args:
+            latitude: Latitude in degrees
+            longitude: Longitude in degrees
+            item: Data returned for the point by queries
+        """
+        self._cells.setdefault(self._cell(latitude, longitude), []).append((latitude, longitude, item))
+        self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _ring(self, center: tuple[int, int], ring: int):
+        row, col = center
+        if ring == 0:
+            yield center
+            return
+        for d in range(-ring, ring + 1):
+            yield (row - ring, col + d)
+            yield (row + ring, col + d)
+        for d in range(-ring + 1, ring):
+            yield (row + d, col - ring)
+            yield (row + d, col + ring)
+
+    def _ring_clearance_km(self, latitude: float, ring: int) -> float:
+        # Any point outside rings 0..ring is at least this far from the origin.
+        # Longitude degrees shrink towards the poles, so use the widest latitude
+        # the scanned cells reach.
+        widest = min(90.0, abs(latitude) + (ring + 1) * self.cell_deg)
+        return ring * self.cell_deg * KM_PER_DEGREE * math.cos(math.radians(widest))
+
+    def within(self, latitude: float, longitude: float, radius_km: float) -> list[tuple[float, dict]]:
+        """
+        Find every point within a radius of an origin.
+
+        Args:
+            latitude: Latitude of the origin in degrees
+            longitude: Longitude of the origin in degrees
+            radius_km: Search radius in kilometres
+
+        Returns:
+            (distance_km, item) pairs ordered by distance.
+        """
+        lat_span = radius_km / KM_PER_DEGREE
+        widest = min(89.9, abs(latitude) + lat_span)
+        lon_span = radius_km / (KM_PER_DEGREE * math.cos(math.radians(widest)))
+        low_row, low_col = self._cell(latitude - lat_span, longitude - lon_span)
+        high_row, high_col = self._cell(latitude + lat_span, longitude + lon_span)
+
+        found = []
+        if (high_row - low_row + 1) * (high_col - low_col + 1) > len(self._cells):
+            cells = [points for (row, col), points in self._cells.items()
+                     if low_row <= row <= high_row and low_col <= col <= high_col]
+        else:
+            cells = [self._cells.get((row, col), ()) for row in range(low_row, high_row + 1)
+                     for col in range(low_col, high_col + 1)]
+        for points in cells:
+            for lat, lon, item in points:
+                distance = haversine_km(latitude, longitude, lat, lon)
+                if distance <= radius_km:
+                    found.append((distance, item))
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+    def nearest(self, latitude: float, longitude: float, k: int, max_km: float = math.inf) -> list[tuple[float, dict]]:
+        """
+        Find the k points closest to an origin.
+
+        Args:
+            latitude: Latitude of the origin in degrees
+            longitude: Longitude of the origin in degrees
+            k: Number of points to return
+            max_km: Ignore points farther than this many kilometres
+
+        Returns:
+            Up to k (distance_km, item) pairs ordered by distance.
+        """
+        if k <= 0 or not self._size:
+            return []
+        center = self._cell(latitude, longitude)
+        # Max-heap of the best k so far, as (-distance, tie breaker, item)
+        best: list[tuple[float, int, dict]] = []
+        seen = 0
+        ring = 0
+        while seen < self._size:
+            if (2 * ring + 1) ** 2 > 4 * len(self._cells):
+                # The origin is far from every point, so measure the remaining
+                # cells directly instead of walking mostly empty rings.
+                cells = [cell for cell in self._cells
+                         if max(abs(cell[0] - center[0]), abs(cell[1] - center[1])) >= ring]
+                ring = math.inf
+            else:
+                cells = list(self._ring(center, ring))
+            for cell in cells:
+                for lat, lon, item in self._cells.get(cell, ()):
+                    seen += 1
+                    distance = haversine_km(latitude, longitude, lat, lon)
+                    if distance > max_km:
+                        continue
+                    entry = (-distance, id(item), item)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, entry)
+            if ring == math.inf:
+                break
+            clearance = self._ring_clearance_km(latitude, ring)
+            if clearance > max_km or (len(best) == k and clearance >= -best[0][0]):
+                break
+            ring += 1
+        return sorted(((-negative, item) for negative, _, item in best), key=lambda pair: pair[0])
+
+
+attraction_index = SpatialIndex(NEARBY_GRID_DEG)
+for _attraction in ATTRACTIONS:
+    attraction_index.add(_attraction["latitude"], _attraction["longitude"], _attraction)
+
+
+def nearby_attractions(
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    limit: int,
+    categories: list[str] | None = None,
+) -> list[dict]:
+    """
+    Find known attractions around an origin.
+
+    Without categories this is a k-nearest query bounded by the radius. With
+    categories, every attraction within the radius is ranked by how many of
+    the categories it has, then by distance.
+
+    Args:
+        latitude: Latitude of the origin in degrees
+        longitude: Longitude of the origin in degrees
+        radius_km: Only return attractions within this many kilometres
+        limit: Maximum number of attractions to return
+        categories: Categories to rank matching attractions first by (e.g., ["hiking"])
+
+    Returns:
+        A list of attractions with name, distance_km, activities, category and coordinates.
+    """
+    if categories:
+        wanted = {category.casefold() for category in categories}
+        ranked = [
+            (-len(wanted.intersection(c.casefold() for c in item["category"])), distance, item)
+            for distance, item in attraction_index.within(latitude, longitude, radius_km)
+        ]
+        pairs = [(distance, item) for _, distance, item in heapq.nsmallest(limit, ranked, key=lambda r: r[:2])]
+    else:
+        pairs = attraction_index.nearest(latitude, longitude, limit, radius_km)
+
+    return [
+        {
+            "name": item["name"],
+            "distance_km": round(distance, 1),
+            "activities": list(item["activities"]),
+            "category": list(item["category"]),
+            "latitude": item["latitude"],
+            "longitude": item["longitude"],
+        }
+        for distance, item in pairs
+    ]
+
+
+def trim_by_distance(rows: list, radius_km: float, limit: int, categories: list[str] | None = None) -> list:
+    """
+    Drop rows farther than a radius by their distance_km field, then cap the count.
+
+    Args:
+        rows: Location rows, each optionally carrying distance_km
+        radius_km: Drop rows whose distance_km is greater than this
+        limit: Maximum number of rows to keep
+        categories: Categories to rank matching rows first by (e.g., ["hiking"])
+
+    Returns:
+        The remaining rows, those having more of the categories first and
+        otherwise in their original order; rows without a distance are kept.
+    """
+    kept = [
+        row for row in rows
+        if not isinstance(row, dict) or not isinstance(row.get("distance_km"), (int, float))
+        or row["distance_km"] <= radius_km
+    ]
+    if categories:
+        wanted = {category.casefold() for category in categories}
+        kept.sort(key=lambda row: -len(wanted.intersection(
+            str(c).casefold() for c in (row.get("category") or [] if isinstance(row, dict) else [])
+        )))
+    return kept[:limit]
@@ -0,0 +1,155 @@
+"""Stale-while-revalidate caching for backend API payloads."""
+
+import asyncio
+import copy
+import time
+from typing import Any, Awaitable, Callable
+
+from core.cache import TTLCache
+from core.http import get_json
+from core.settings import BACKEND_CACHE_SIZE, BACKEND_FRESH_TTL, BACKEND_STALE_TTL
+from core.tracing import spanned
+
+
+class StaleWhileRevalidateCache:
+    """
+    Cache that answers from a stale copy while refreshing it in the background.
+
+    An entry younger than `fresh_ttl` is served as is. An older entry is still
+    served immediately for another `stale_ttl` seconds while one background
+    fetch refreshes it. Callers only wait on the upstream when no usable copy
+    exists.
+    """
+
+    def __init__(self, maxsize: int, fresh_ttl: float, stale_ttl: float) -> None:
+        """
+        Args:
+            maxsize: Maximum number of cached payloads
+            fresh_ttl: Seconds a payload is served without revalidation
+            stale_ttl: Further seconds a payload is served while being revalidated
+        """
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self._entries = TTLCache(maxsize, fresh_ttl + stale_ttl)
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the payload for a key, fetching it only when no usable copy is cached.
+
+        Args:
+            key: Cache key (e.g., the request URL)
+            fetch: Zero-argument coroutine function that fetches a fresh payload
+
+        Returns:
+            A copy of the cached or freshly fetched payload.
+
+        Raises:
+            Exception: Whatever `fetch` raised when there was no cached copy.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            fetched_at, payload = entry
+            if time.monotonic() - fetched_at < self.fresh_ttl:
+                self.fresh_hits += 1
+            else:
+                self.stale_hits += 1
+                self._revalidate(key, fetch)
+        else:
+            self.misses += 1
+            payload = await fetch()
+            self._store(key, payload)
+        return copy.deepcopy(payload)
+
+    async def refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Fetch a payload now and cache it, whatever the age of the cached copy.
+
+        Args:
+            key: Cache key (e.g., the request URL)
+            fetch: Zero-argument coroutine function that fetches a fresh payload
+
+        Returns:
+            A copy of the fresh payload.
+
+        Raises:
+            Exception: Whatever `fetch` raised; the cached copy is left as it was.
+        """
+        self.refreshes += 1
+        try:
+            payload = await fetch()
+        except Exception:
+            self.refresh_failures += 1
+            raise
+        self._store(key, payload)
+        return copy.deepcopy(payload)
+
+    def _store(self, key: str, payload: Any) -> None:
+        self._entries.set(key, (time.monotonic(), payload))
+
+    def _revalidate(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        self.refreshes += 1
+        task = asyncio.ensure_future(fetch())
+        self._refreshing[key] = task
+        task.add_done_callback(lambda done: self._finish_refresh(key, done))
+
+    def _finish_refresh(self, key: str, task: asyncio.Task) -> None:
+        del self._refreshing[key]
+        if task.cancelled() or task.exception() is not None:
+            # Keep serving the stale copy; it expires on its own.
+            self.refresh_failures += 1
+            return
+        self._store(key, task.result())
+
+    def stats(self) -> dict:
+        """
+        Report fresh and stale hits, misses and background refresh counts.
+
+        Returns:
+            Dictionary of counters and the number of cached payloads.
+        """
+        lookups = self.fresh_hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.fresh_hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "refreshing": len(self._refreshing),
+        }
+
+
+backend_cache = StaleWhileRevalidateCache(BACKEND_CACHE_SIZE, BACKEND_FRESH_TTL, BACKEND_STALE_TTL)
+
+
+@spanned("backend cache")
+async def get_backend_json(url: str, timeout: float, refresh: bool = False) -> Any:
+    """
+    Fetch a backend API URL through the stale-while-revalidate cache.
+
+    Args:
+        url: Backend API URL to fetch
+        timeout: Request timeout in seconds
+        refresh: Fetch the URL even if a fresh copy is cached
+
+    Returns:
+        The decoded JSON payload.
+
+    Raises:
+        Exception: If there is no usable cached copy and the request fails.
+    """
+    def fetch():
+        return get_json(url, timeout=timeout, upstream="backend")
+
+    if refresh:
+        return await backend_cache.refresh(url, fetch)
+    return await backend_cache.get(url, fetch)
@@ -0,0 +1,357 @@
+"""Per-call trace spans, a log of the slowest calls and export in the Chrome trace format."""
+
+import functools
+import heapq
+import inspect
+import itertools
+import json
+import os
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Callable
+
+from core.settings import TRACE_SAMPLE_RATE, TRACE_SLOWEST
+
+# Longest argument value kept in a trace, in characters
+MAX_ARGUMENT_CHARS = 200
+
+
+class Trace:
+    """The spans of one tool call, with times relative to the start of the call."""
+
+    def __init__(self, trace_id: int, tool: str, arguments: dict) -> None:
+        """
+        Args:
+            trace_id: Number of the call, unique within the process
+            tool: Name of the tool called
+            arguments: Arguments of the call
+        """
+        self.id = trace_id
+        self.tool = tool
+        self.arguments = {key: _short(value) for key, value in arguments.items()}
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration: float | None = None
+        self.status = "ok"
+        self.error: str | None = None
+        self.spans: list[dict] = []
+
+    def offset(self) -> float:
+        return time.perf_counter() - self.start
+
+    def add(self, span: dict) -> int:
+        """Record a span and return its index; a span of a finished call is dropped."""
+        if self.duration is not None:
+            return -1
+        self.spans.append(span)
+        return len(self.spans) - 1
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "tool": self.tool,
+            "arguments": self.arguments,
+            "started_at": self.started_at,
+            "duration_ms": round((self.duration or 0) * 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "spans": [
+                {
+                    **span,
+                    "start_ms": round(span["start_ms"], 3),
+                    "duration_ms": None if span["duration_ms"] is None else round(span["duration_ms"], 3),
+                }
+                for span in self.spans
+            ],
+        }
+
+
+def _short(value: Any) -> Any:
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return text if len(text) <= MAX_ARGUMENT_CHARS else text[:MAX_ARGUMENT_CHARS] + "…"
+
+
+_trace: ContextVar[Trace | None] = ContextVar("trace", default=None)
+_parent: ContextVar[int] = ContextVar("trace_parent", default=-1)
+
+
+class span:
+    """
+    Time a step of the current tool call.
+
+    Use as `with span("geocode", location=location):`. Keyword arguments
+    and later `set()` calls become attributes of the span; an exception
+    leaving the block is recorded as its error. Outside a traced call it does
+    nothing.
+    """
+
+    __slots__ = ("name", "attributes", "_trace", "_index", "_token", "_start")
+
+    def __init__(self, name: str, **attributes: Any) -> None:
+        self.name = name
+        self.attributes = attributes
+        self._trace = _trace.get()
+
+    def set(self, **attributes: Any) -> None:
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "span":
+        trace = self._trace
+        if trace is not None:
+            self._start = trace.offset()
+            self._index = trace.add({
+                "name": self.name,
+                "parent": _parent.get(),
+                "start_ms": self._start * 1000,
+                "duration_ms": None,
+                "attributes": self.attributes,
+            })
+            self._token = _parent.set(self._index)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        trace = self._trace
+        if trace is None:
+            return
+        _parent.reset(self._token)
+        if self._index < 0:
+            return
+        if exc is not None:
+            self.attributes["error"] = str(exc) or type(exc).__name__
+        trace.spans[self._index]["duration_ms"] = (trace.offset() - self._start) * 1000
+
+
+def event(name: str, **attributes: Any) -> None:
+    """
+    Record an instant in the current tool call, such as falling back to built-in data.
+
+    Args:
+        name: Name of the event
+        **attributes: Attributes of the event
+    """
+    trace = _trace.get()
+    if trace is not None:
+        trace.add({
+            "name": name,
+            "parent": _parent.get(),
+            "start_ms": trace.offset() * 1000,
+            "duration_ms": None,
+            "attributes": attributes,
+        })
+
+
+def spanned(name: str) -> Callable:
+    """
+    Decorate an async function so every call to it is a span of the current tool call.
+
+    Args:
+        name: Name of the span
+
+    Returns:
+        The decorator.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs) -> Any:
+            with span(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class SlowCallLog:
+    """
+    Keeps the full span timelines of the slowest sampled tool calls.
+
+    A fraction `sample_rate` of calls is traced. Of those, the `size`
+    slowest finished so far are kept, so a rare slow call stays available
+    after the fact no matter how many fast ones followed it.
+    """
+
+    def __init__(self, size: int, sample_rate: float) -> None:
+        """
+        Args:
+            size: Number of calls kept
+            sample_rate: Fraction of calls traced, between 0 and 1
+        """
+        self.size = size
+        self.sample_rate = sample_rate
+        self.traced = 0
+        self._ids = itertools.count(1)
+        self._heap: list[tuple[float, int, Trace]] = []
+
+    def start(self, tool: str, arguments: dict) -> Trace | None:
+        """Begin tracing a call, or return None if it is not sampled."""
+        if not self.size or random.random() >= self.sample_rate:
+            return None
+        return Trace(next(self._ids), tool, arguments)
+
+    def finish(self, trace: Trace) -> None:
+        """Record a finished call, keeping it if it is among the slowest."""
+        trace.duration = trace.offset()
+        self.traced += 1
+        entry = (trace.duration, trace.id, trace)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def slowest(self) -> list[Trace]:
+        """Return the kept calls, slowest first."""
+        return [trace for _, _, trace in sorted(self._heap, reverse=True)]
+
+    def clear(self) -> None:
+        self._heap.clear()
+
+    def stats(self) -> dict:
+        return {
+            "traced": self.traced,
+            "kept": len(self._heap),
+            "slowest_ms": round(max(self._heap)[0] * 1000, 1) if self._heap else None,
+            "sample_rate": self.sample_rate,
+        }
+
+
+slow_calls = SlowCallLog(TRACE_SLOWEST, TRACE_SAMPLE_RATE)
+
+
+def _lanes(spans: list[dict]) -> list[int]:
+    # Spans overlapping without nesting (concurrent fetches, hedges) go on separate lanes
+    lanes: list[list[float]] = []
+    assigned = []
+    for item in spans:
+        start = item["start_ms"]
+        end = start + (item["duration_ms"] or 0)
+        for lane, ends in enumerate(lanes):
+            while ends and ends[-1] <= start:
+                ends.pop()
+            if not ends or end <= ends[-1]:
+                ends.append(end)
+                assigned.append(lane)
+                break
+        else:
+            lanes.append([end])
+            assigned.append(len(lanes) - 1)
+    return assigned
+
+
+def chrome_trace(traces: list[Trace]) -> dict:
+    """
+    Convert calls to the Chrome trace event format.
+
+    Each call appears as a process named after the tool and its duration,
+    with its spans as complete events on as many threads as overlapping
+    spans need. The result loads in chrome://tracing, Perfetto and speedscope.
+
+    Args:
+        traces: Finished calls
+
+    Returns:
+        The trace document, ready for json.dump.
+    """
+    events = []
+    for trace in traces:
+        start_us = trace.started_at * 1_000_000
+        events.append({
+            "name": "process_name",
+            "ph": "M",
+            "pid": trace.id,
+            "args": {"name": f"{trace.tool} #{trace.id} ({(trace.duration or 0) * 1000:.0f} ms, {trace.status})"},
+        })
+        events.append({
+            "name": trace.tool,
+            "cat": "tool",
+            "ph": "X",
+            "pid": trace.id,
+            "tid": 0,
+            "ts": start_us,
+            "dur": (trace.duration or 0) * 1_000_000,
+            "args": trace.arguments,
+        })
+        for item, lane in zip(trace.spans, _lanes(trace.spans)):
+            common = {
+                "name": item["name"],
+                "cat": "span",
+                "pid": trace.id,
+                "tid": lane,
+                "ts": start_us + item["start_ms"] * 1000,
+                "args": {key: _short(value) for key, value in item["attributes"].items()},
+            }
+            if item["duration_ms"] is None:
+                events.append({**common, "ph": "i", "s": "t"})
+            else:
+                events.append({**common, "ph": "X", "dur": item["duration_ms"] * 1000})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export_traces(path: str) -> int:
+    """
+    Write the slowest calls to a file in the Chrome trace format.
+
+    Args:
+        path: File to write; it is replaced atomically
+
+    Returns:
+        The number of calls written.
+    """
+    traces = slow_calls.slowest()
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(chrome_trace(traces), f)
+    os.replace(temporary, path)
+    return len(traces)
+
+
+def traced(fn: Callable) -> Callable:
+    """
+    Wrap a tool so sampled calls are traced and the slowest kept.
+
+    The wrapper keeps the tool's name, docstring and signature, so it can be
+    registered with mcp.tool() in place of the tool itself. A call's status
+    is "error" if it raised, "fallback" if it answered with built-in data and
+    "busy" if admission control shed it.
+
+    Args:
+        fn: Tool function, sync or async
+
+    Returns:
+        An async function tracing each sampled call.
+    """
+    name = fn.__name__
+
+    async def call(**kwargs) -> Any:
+        result = fn(**kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    @functools.wraps(fn)
+    async def wrapper(**kwargs) -> Any:
+        trace = slow_calls.start(name, kwargs)
+        if trace is None:
+            return await call(**kwargs)
+        token = _trace.set(trace)
+        try:
+            result = await call(**kwargs)
+        except BaseException as e:
+            trace.status = "error"
+            trace.error = _short(str(e) or type(e).__name__)
+            raise
+        else:
+            if isinstance(result, dict) and result.get("busy"):
+                trace.status = "busy"
+            elif any(item["name"] == "fallback" for item in trace.spans):
+                trace.status = "fallback"
+            return result
+        finally:
+            _trace.reset(token)
+            slow_calls.finish(trace)
+
+    return wrapper
@@ -0,0 +1,361 @@
+"""Weather response cache and response builders shared by the weather tools."""
+
+import calendar
+import copy
+from datetime import datetime
+
+from core.cache import TTLCache
+from core.climatology import climatology_table
+from core.geocoding import geocode_cache, normalize_location
+from core.http import get_json
+from core.settings import (
+    CLIMATOLOGY_MAX_KM,
+    FORECAST_URL,
+    WEATHER_CACHE_SIZE,
+    WEATHER_TIMEOUT,
+    WEATHER_TTL_CURRENT,
+    WEATHER_TTL_FORECAST,
+    WEATHER_TTL_HISTORICAL,
+)
+from core.shared import shared_store
+from core.tracing import spanned
+
+# Lifetime of a cached response by its data_type
+WEATHER_TTLS = {
+    "historical": WEATHER_TTL_HISTORICAL,
+    "forecast": WEATHER_TTL_FORECAST,
+    "current": WEATHER_TTL_CURRENT,
+}
+
+weather_cache = TTLCache(WEATHER_CACHE_SIZE, WEATHER_TTL_FORECAST, shared=shared_store, namespace="weather")
+
+
+def weather_cache_key(latitude: float, longitude: float, date: str, data_type: str) -> str:
+    """
+    Build the cache key for a weather response.
+
+    Args:
+        latitude: Latitude of the location
+        longitude: Longitude of the location
+        date: Date in YYYY-MM-DD format, or "current" for current conditions
+        data_type: One of "historical", "forecast" or "current"
+
+    Returns:
+        A string key identifying the response.
+    """
+    return f"{latitude:.4f},{longitude:.4f}:{date}:{data_type}"
+
+
+def get_cached_weather(key: str) -> dict | None:
+    """
+    Return a copy of a cached weather response.
+
+    Args:
+        key: Key built by weather_cache_key
+
+    Returns:
+        The cached response, or None on a miss.
+    """
+    result = weather_cache.get(key)
+    return copy.deepcopy(result) if result is not None else None
+
+
+def cache_weather(key: str, result: dict) -> dict:
+    """
+    Cache a weather response for as long as its data_type allows.
+
+    Args:
+        key: Key built by weather_cache_key
+        result: Weather response with a "data_type" field
+
+    Returns:
+        The response, unchanged.
+    """
+    weather_cache.set(key, copy.deepcopy(result), ttl=WEATHER_TTLS[result["data_type"]])
+    return result
+
+
+WEATHER_CODES = {
+    0: "Clear sky",
+    1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
+    45: "Foggy", 48: "Depositing rime fog",
+    51: "Light drizzle", 53: "Moderate drizzle", 55: "Dense drizzle",
+    61: "Slight rain", 63: "Moderate rain", 65: "Heavy rain",
+    71: "Slight snow", 73: "Moderate snow", 75: "Heavy snow",
+    80: "Slight rain showers", 81: "Moderate rain showers", 82: "Violent rain showers",
+    95: "Thunderstorm", 96: "Thunderstorm with slight hail", 99: "Thunderstorm with heavy hail"
+}
+
+# Daily variables requested from the archive and forecast endpoints
+ARCHIVE_DAILY = "temperature_2m_max,temperature_2m_min,temperature_2m_mean,precipitation_sum,weather_code,wind_speed_10m_max"
+FORECAST_DAILY = "temperature_2m_max,temperature_2m_min,precipitation_sum,weather_code,wind_speed_10m_max"
+
+
+def daily_entry(place: dict, daily: dict, index: int, data_type: str) -> dict:
+    """
+    Build one day's weather response from an Open-Meteo "daily" block.
+
+    Args:
+        place: Geocoded place with latitude, longitude, name and country
+        daily: The "daily" object of an archive or forecast response
+        index: Position of the day within the daily arrays
+        data_type: "historical" or "forecast"
+
+    Returns:
+        Dictionary in the shape returned by get_weather for a single date.
+    """
+    temperature = {
+        "max": daily["temperature_2m_max"][index],
+        "min": daily["temperature_2m_min"][index]
+    }
+    if data_type == "historical":
+        temperature["mean"] = daily["temperature_2m_mean"][index]
+
+    weather_code = daily.get("weather_code", [0] * (index + 1))[index]
+    return {
+        "location": f"{place['name']}, {place['country']}",
+        "coordinates": {
+            "latitude": place["latitude"],
+            "longitude": place["longitude"]
+        },
+        "date": daily["time"][index],
+        "data_type": data_type,
+        "temperature_celsius": temperature,
+        "precipitation_mm": daily["precipitation_sum"][index],
+        "wind_speed_max_kmh": daily["wind_speed_10m_max"][index],
+        "conditions": WEATHER_CODES.get(weather_code, "Unknown")
+    }
+
+
+@spanned("forecast")
+async def fetch_forecast(place: dict, date: str) -> dict | None:
+    """
+    Fetch one day's forecast for a place and cache it.
+
+    Args:
+        place: Geocoded place with latitude, longitude, name and country
+        date: Date in YYYY-MM-DD format, today or up to 16 days ahead
+
+    Returns:
+        The forecast entry, or None if the API has no forecast for the date.
+
+    Raises:
+        Exception: If the forecast request fails.
+    """
+    weather_url = f"{FORECAST_URL}?latitude={place['latitude']}&longitude={place['longitude']}&daily={FORECAST_DAILY}&start_date={date}&end_date={date}&timezone=auto"
+
+    weather_data = await get_json(weather_url, timeout=WEATHER_TIMEOUT, upstream="forecast")
+
+    daily = weather_data.get("daily")
+    if not daily or not daily.get("time"):
+        return None
+
+    cache_key = weather_cache_key(place["latitude"], place["longitude"], date, "forecast")
+    return cache_weather(cache_key, daily_entry(place, daily, 0, "forecast"))
+
+
+@spanned("current weather")
+async def fetch_current(place: dict) -> dict:
+    """
+    Fetch the current conditions for a place and cache them.
+
+    Args:
+        place: Geocoded place with latitude, longitude, name and country
+
+    Returns:
+        The current-weather entry.
+
+    Raises:
+        Exception: If the forecast request fails.
+    """
+    latitude = place["latitude"]
+    longitude = place["longitude"]
+    weather_url = f"{FORECAST_URL}?latitude={latitude}&longitude={longitude}&current=temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,weather_code,wind_speed_10m&timezone=auto"
+
+    weather_data = await get_json(weather_url, timeout=WEATHER_TIMEOUT, upstream="forecast")
+    current = weather_data["current"]
+
+    weather_code = current.get("weather_code", 0)
+    weather_description = WEATHER_CODES.get(weather_code, "Unknown")
+
+    cache_key = weather_cache_key(latitude, longitude, "current", "current")
+    return cache_weather(cache_key, {
+        "location": f"{place['name']}, {place['country']}",
+        "coordinates": {
+            "latitude": latitude,
+            "longitude": longitude
+        },
+        "data_type": "current",
+        "temperature_celsius": current["temperature_2m"],
+        "feels_like_celsius": current["apparent_temperature"],
+        "humidity_percent": current["relative_humidity_2m"],
+        "precipitation_mm": current["precipitation"],
+        "wind_speed_kmh": current["wind_speed_10m"],
+        "conditions": weather_description,
+        "time": current["time"]
+    })
+
+
+def climate_station(location: str, latitude: float | None = None, longitude: float | None = None) -> dict | None:
+    """
+    Find the climatology station for a place, without any network call.
+
+    Args:
+        location: Place name (e.g., "Kandy")
+        latitude: Latitude of the place, if known
+        longitude: Longitude of the place, if known
+
+    Returns:
+        The nearest station within CLIMATOLOGY_MAX_KM of the coordinates, else
+        the station named like the place, else None.
+    """
+    table = climatology_table()
+    if table is None:
+        return None
+    if latitude is not None and longitude is not None:
+        station = table.nearest(latitude, longitude, CLIMATOLOGY_MAX_KM)
+        if station is not None:
+            return station
+    return table.find(location)
+
+
+def _month(date: str) -> int:
+    try:
+        return datetime.strptime(date, "%Y-%m-%d").month
+    except ValueError:
+        return datetime.now().month
+
+
+def _climate_fields(station: dict, month: int) -> dict:
+    normals = climatology_table().normals(station, month)
+    return {
+        "temperature_celsius": {
+            "max": round(normals["temperature_max"], 1),
+            "min": round(normals["temperature_min"], 1)
+        },
+        "precipitation_mm": round(normals["precipitation_mm"], 1),
+        "wind_speed_max_kmh": round(normals["wind_speed_max_kmh"], 1),
+        "conditions": WEATHER_CODES.get(int(normals["weather_code"]), "Unknown"),
+        "climate_station": station["name"]
+    }
+
+
+def estimated_entry(place: dict, date: str) -> dict:
+    """
+    Build the typical-weather estimate used for dates beyond the forecast horizon.
+
+    Uses the month's climate normals of the nearest climatology station, or
+    fixed typical values if no station is close enough.
+
+    Args:
+        place: Geocoded place with latitude, longitude, name and country
+        date: Date in YYYY-MM-DD format
+
+    Returns:
+        Dictionary in the shape returned by get_weather for an estimated date.
+    """
+    entry = {
+        "location": f"{place['name']}, {place['country']}",
+        "coordinates": {
+            "latitude": place["latitude"],
+            "longitude": place["longitude"]
+        },
+        "date": date,
+        "data_type": "estimated"
+    }
+    station = climate_station(place["name"], place["latitude"], place["longitude"])
+    if station is None:
+        entry.update({
+            "temperature_celsius": {
+                "max": 25,
+                "min": 15
+            },
+            "precipitation_mm": 0,
+            "wind_speed_max_kmh": 10,
+            "conditions": "Partly cloudy",
+            "note": "Forecast data is only available up to 16 days. Showing estimated typical weather for this location."
+        })
+        return entry
+
+    month = _month(date)
+    entry.update(_climate_fields(station, month))
+    entry["note"] = (
+        "Forecast data is only available up to 16 days. "
+        f"Showing {calendar.month_name[month]} climate normals for this location."
+    )
+    return entry
+
+
+def offline_estimate(location: str, date: str) -> dict | None:
+    """
+    Answer a date beyond the forecast horizon from the climatology table alone.
+
+    Args:
+        location: Location as given by the caller (e.g., "Kandy")
+        date: Date in YYYY-MM-DD format
+
+    Returns:
+        The estimated entry if the date is more than 16 days ahead and a
+        climatology station has the location's name, otherwise None.
+    """
+    try:
+        days_ahead = (datetime.strptime(date, "%Y-%m-%d").date() - datetime.now().date()).days
+    except ValueError:
+        return None
+    if days_ahead <= 16:
+        return None
+    table = climatology_table()
+    station = table.find(location) if table is not None else None
+    if station is None:
+        return None
+    place = {key: station[key] for key in ("name", "country", "latitude", "longitude")}
+    return estimated_entry(place, date)
+
+
+def fallback_entry(location: str, date: str, error: Exception) -> dict:
+    """
+    Build the response returned when real weather data could not be fetched.
+
+    Uses climate normals for the date's month (or the current month) when a
+    climatology station matches the location by name or by its cached
+    coordinates, or fixed typical values otherwise.
+
+    Args:
+        location: Location as given by the caller
+        date: Date in YYYY-MM-DD format, or "" for current weather
+        error: The exception that prevented fetching real data
+
+    Returns:
+        Dictionary with estimated typical weather and a note explaining why.
+    """
+    entry = {
+        "location": location,
+        "date": date if date else "current",
+        "data_type": "estimated"
+    }
+    station = climate_station(location)
+    if station is None:
+        place = geocode_cache.get(normalize_location(location))
+        if place is not None:
+            station = climate_station(location, place["latitude"], place["longitude"])
+    if station is None:
+        entry.update({
+            "temperature_celsius": {
+                "max": 25,
+                "min": 15
+            },
+            "precipitation_mm": 0,
+            "wind_speed_kmh": 10,
+            "conditions": "Partly cloudy",
+            "note": f"Could not fetch real weather data. Showing estimated typical weather. Error: {str(error)}"
+        })
+        return entry
+
+    month = _month(date)
+    entry.update(_climate_fields(station, month))
+    entry["wind_speed_kmh"] = entry.pop("wind_speed_max_kmh")
+    entry["note"] = (
+        f"Could not fetch real weather data. Showing {calendar.month_name[month]} climate normals "
+        f"for this location. Error: {str(error)}"
+    )
+    return entry
@@ -1,21 +1,220 @@
+import asyncio
+import contextlib
+import os
+import tempfile
+
+import uvicorn
 from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from core.admission import admission, admission_controlled
+from core.catalog import catalog_cache
+from core.climatology import climatology_table
+from core.compact import compact_output, session_references
+from core.geocoding import geocode_cache
+from core.history import history_store
+from core.http import breaker_stats, pool_stats, single_flight, upstream_stats
+from core.metrics import instrument_tool, render_metrics, stats_gauges
+from core.prefetch import prefetcher
+from core.profiler import folded, sample_stacks
+from core.profiles import profile_cache
+from core.settings import LOG_LEVEL, SERVER_HOST, SERVER_PORT, SERVER_WORKERS, STATELESS_HTTP, TRACE_EXPORT_PATH
+from core.shared import shared_store
+from core.swr import backend_cache
+from core.tracing import chrome_trace, export_traces, slow_calls, traced
+from core.weather import weather_cache
 from tools.get_nearby_location_activities import get_nearby_location_activities
 from tools.get_past_activities import get_past_activities
 from tools.get_past_locations import get_past_locations
 from tools.get_weather import get_weather
+from tools.get_weather_range import get_weather_range
 from tools.get_all_location_for_designation import get_all_location_for_designation
 from tools.validate_future_date import validate_future_date
+from tools.get_nearby_location_activities_batch import get_nearby_location_activities_batch
+from tools.get_all_location_for_designation_batch import get_all_location_for_designation_batch
+from tools.get_past_activities_batch import get_past_activities_batch
+from tools.get_past_locations_batch import get_past_locations_batch
+from tools.get_weather_batch import get_weather_batch
+from tools.get_user_profile import get_user_profile
+from tools.plan_trip import plan_trip
+
+mcp = FastMCP(
+    "StatefulServer",
+    host=SERVER_HOST,
+    port=SERVER_PORT,
+    log_level=LOG_LEVEL,
+    stateless_http=STATELESS_HTTP,
+)
+
+
+def current_session() -> str:
+    """
+    Identify the client making the current tool call, for per-session limits.
+
+    In stateless mode, which SERVER_WORKERS > 1 turns on, requests carry no
+    session id. The client address is not used in its place: clients behind
+    one NAT or proxy would share a single session's limits.
+
+    Returns:
+        The MCP session id, else the X-Client-Id header; "" when neither is
+        sent or outside a request, in which case only the global limits apply.
+    """
+    try:
+        request = mcp.get_context().request_context.request
+    except ValueError:
+        return ""
+    if request is None:
+        return ""
+    return request.headers.get("mcp-session-id") or request.headers.get("x-client-id") or ""
+
+
+def mcp_session_id() -> str:
+    """
+    Return the MCP session id of the current tool call, or "" if it has none.
+
+    Compact output refers to objects sent earlier only within a real
+    session, never across clients that merely share an address or client id.
+    """
+    try:
+        request = mcp.get_context().request_context.request
+    except ValueError:
+        return ""
+    if request is None:
+        return ""
+    return request.headers.get("mcp-session-id") or ""
+
+
+# Register all tools with the MCP server, adding the compact output options,
+# admitting calls under the concurrency limits, tracing sampled calls and
+# recording per-tool metrics
+for tool in (
+    get_nearby_location_activities,
+    get_past_activities,
+    get_past_locations,
+    get_weather,
+    get_weather_range,
+    get_all_location_for_designation,
+    validate_future_date,
+    get_nearby_location_activities_batch,
+    get_all_location_for_designation_batch,
+    get_past_activities_batch,
+    get_past_locations_batch,
+    get_weather_batch,
+    get_user_profile,
+    plan_trip,
+):
+    mcp.tool()(instrument_tool(traced(admission_controlled(compact_output(tool, mcp_session_id), current_session))))
+
+
+async def collect_stats() -> dict:
+    """Gather runtime statistics for the upstream connection pools, caches, circuit breakers and call policies."""
+    return {
+        "worker": {"pid": os.getpid(), "workers": SERVER_WORKERS},
+        "climatology": {"stations": len(climatology_table() or [])},
+        "history": await asyncio.to_thread(history_store.stats),
+        "pools": pool_stats(),
+        "caches": {
+            "geocode": geocode_cache.stats(),
+            "weather": weather_cache.stats(),
+            "backend": backend_cache.stats(),
+            "catalog": catalog_cache.stats(),
+            "profiles": profile_cache.stats(),
+            "shared": await asyncio.to_thread(shared_store.stats) if shared_store is not None else {},
+        },
+        "single_flight": single_flight.stats(),
+        "breakers": breaker_stats(),
+        "upstreams": upstream_stats(),
+        "prefetch": prefetcher.stats(),
+        "admission": admission.stats(),
+        "compact": session_references.stats(),
+        "tracing": slow_calls.stats(),
+    }
+
+
+@mcp.custom_route("/stats", methods=["GET"])
+async def stats(request: Request) -> JSONResponse:
+    """Report runtime statistics for the upstream connection pools, caches and circuit breakers."""
+    return JSONResponse(await collect_stats())
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> PlainTextResponse:
+    """Expose tool and upstream metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        render_metrics(stats_gauges(await collect_stats())),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@mcp.custom_route("/traces", methods=["GET"])
+async def traces(request: Request) -> JSONResponse:
+    """
+    Report the slowest traced tool calls of this worker with their span timelines.
+
+    With ?format=chrome the calls are returned in the Chrome trace format instead.
+    """
+    slowest = slow_calls.slowest()
+    if request.query_params.get("format") == "chrome":
+        return JSONResponse(chrome_trace(slowest))
+    return JSONResponse({"worker": os.getpid(), "traces": [trace.to_dict() for trace in slowest]})
+
+
+@mcp.custom_route("/traces/export", methods=["POST"])
+async def traces_export(request: Request) -> JSONResponse:
+    """Write the slowest traced tool calls of this worker to a Chrome trace file."""
+    path = TRACE_EXPORT_PATH or os.path.join(tempfile.gettempdir(), f"mcp-traces-{os.getpid()}.json")
+    count = await asyncio.to_thread(export_traces, path)
+    return JSONResponse({"worker": os.getpid(), "path": path, "traces": count})
+
+
+@mcp.custom_route("/profile", methods=["GET"])
+async def profile(request: Request) -> PlainTextResponse:
+    """
+    Sample this worker's stacks for ?seconds= (default 5) every ?interval_ms= (default 5)
+    and return the hot stacks in the folded format read by flamegraph.pl and speedscope.
+    """
+    try:
+        seconds = float(request.query_params.get("seconds", "5"))
+        interval = float(request.query_params.get("interval_ms", "5")) / 1000
+    except ValueError:
+        return PlainTextResponse("seconds and interval_ms must be numbers\n", status_code=400)
+    stacks = await asyncio.to_thread(sample_stacks, seconds, interval)
+    return PlainTextResponse(folded(stacks))
+
+
+def create_app():
+    """Build the streamable-http ASGI app; each worker process calls this once."""
+    app = mcp.streamable_http_app()
+    run_session_manager = app.router.lifespan_context
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        async with run_session_manager(app):
+            prefetcher.start()
+            try:
+                yield
+            finally:
+                await prefetcher.stop()
+                await geocode_cache.flush()
+                if shared_store is not None:
+                    await shared_store.flush()
+
+    app.router.lifespan_context = lifespan
+    return app
 
-mcp = FastMCP("StatefulServer")
 
-# Register all tools with the MCP server
-mcp.tool()(get_nearby_location_activities)
-mcp.tool()(get_past_activities)
-mcp.tool()(get_past_locations)
-mcp.tool()(get_weather)
-mcp.tool()(get_all_location_for_designation)
-mcp.tool()(validate_future_date)
+def serve() -> None:
+    """Run the server with a single process, or with SERVER_WORKERS processes sharing the port."""
+    uvicorn.run(
+        "main:create_app",
+        factory=True,
+        host=SERVER_HOST,
+        port=SERVER_PORT,
+        workers=SERVER_WORKERS,
+        log_level=LOG_LEVEL.lower(),
+    )
 
 
 if __name__ == "__main__":
-    mcp.run(transport="streamable-http")
+    serve()
@@ -0,0 +1,104 @@
+"""
+Build the climatology table used for long-range and fallback weather estimates.
+
+By default, fetches daily archive data for every station over a span of
+years and averages it into monthly normals. The normals are written both as
+readable JSON and as the compact binary table the server memory-maps.
+
+Run with:
+    python -m scripts.build_climatology --years 2015-2024
+    python -m scripts.build_climatology --from-json data/climatology.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from collections import Counter
+from datetime import date
+
+from core.climatology import FIELDS, write_table
+from core.http import aclose, get_json
+from core.settings import ARCHIVE_URL, CLIMATOLOGY_PATH
+
+DAILY = "temperature_2m_max,temperature_2m_min,precipitation_sum,wind_speed_10m_max,weather_code"
+
+
+async def station_normals(station: dict, first_year: int, last_year: int) -> list[dict]:
+    """
+    Average a station's daily archive data into twelve monthly normals.
+
+    Args:
+        station: Station with latitude and longitude
+        first_year: First year of the averaging period
+        last_year: Last year of the averaging period
+
+    Returns:
+        Twelve dictionaries keyed by FIELDS, January first.
+    """
+    url = (
+        f"{ARCHIVE_URL}?latitude={station['latitude']}&longitude={station['longitude']}"
+        f"&start_date={first_year}-01-01&end_date={last_year}-12-31&daily={DAILY}&timezone=auto"
+    )
+    daily = (await get_json(url, timeout=120, upstream="archive"))["daily"]
+
+    months = [{"values": {field: [] for field in FIELDS[:4]}, "codes": Counter()} for _ in range(12)]
+    for position, day in enumerate(daily["time"]):
+        month = months[date.fromisoformat(day).month - 1]
+        for field, key in zip(FIELDS[:4], DAILY.split(",")[:4]):
+            value = daily[key][position]
+            if value is not None:
+                month["values"][field].append(value)
+        if daily["weather_code"][position] is not None:
+            month["codes"][daily["weather_code"][position]] += 1
+
+    normals = []
+    for month in months:
+        entry = {field: round(sum(v) / len(v), 1) if v else 0.0 for field, v in month["values"].items()}
+        entry["weather_code"] = month["codes"].most_common(1)[0][0] if month["codes"] else 2
+        normals.append(entry)
+    return normals
+
+
+async def build_from_archive(stations: list[dict], first_year: int, last_year: int) -> list[dict]:
+    results = []
+    try:
+        for station in stations:
+            print(f"{station['name']}: fetching {first_year}-{last_year}")
+            results.append({**station, "months": await station_normals(station, first_year, last_year)})
+    finally:
+        await aclose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stations", default="data/climatology.json",
+                        help="JSON list of stations (name, country, latitude, longitude)")
+    parser.add_argument("--years", default="2015-2024", help="averaging period, e.g. 2015-2024")
+    parser.add_argument("--from-json", help="write the binary table from normals in this JSON file instead of fetching")
+    parser.add_argument("--json-out", default="data/climatology.json", help="where to write the normals as JSON")
+    parser.add_argument("--out", default=CLIMATOLOGY_PATH, help="where to write the binary table")
+    args = parser.parse_args()
+
+    if args.from_json:
+        with open(args.from_json, encoding="utf-8") as f:
+            stations = json.load(f)
+    else:
+        with open(args.stations, encoding="utf-8") as f:
+            stations = [
+                {key: station[key] for key in ("name", "country", "latitude", "longitude")}
+                for station in json.load(f)
+            ]
+        first_year, last_year = (int(year) for year in args.years.split("-"))
+        stations = asyncio.run(build_from_archive(stations, first_year, last_year))
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(stations, f, indent=1)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    write_table(args.out, stations)
+    print(f"Wrote {len(stations)} stations to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
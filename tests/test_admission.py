@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from core.admission import PRIORITY_HIGH, AdmissionController, Busy
+
+
+def test_full_queue_sheds_at_once():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1, per_session=0, queue_size=1, queue_timeout=1)
+        await admission.acquire("a")
+        waiter = asyncio.create_task(admission.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(Busy) as shed:
+            await admission.acquire("c")
+        assert shed.value.reason == "queue_full"
+
+        admission.release("a")
+        await waiter
+        return admission.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["shed_queue_full"] == 1
+    assert stats["admitted"] == 2
+    assert stats["in_flight"] == 1
+
+
+def test_waiting_too_long_is_shed():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1, per_session=0, queue_size=4, queue_timeout=0.05)
+        await admission.acquire("a")
+        with pytest.raises(Busy) as shed:
+            await admission.acquire("b")
+        assert shed.value.reason == "queue_timeout"
+        assert shed.value.retry_after > 0
+        return admission.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["shed_queue_timeout"] == 1
+    assert stats["waiting"] == 0
+
+
+def test_priority_call_displaces_a_normal_waiter():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1, per_session=0, queue_size=1, queue_timeout=1)
+        await admission.acquire("a")
+        normal = asyncio.create_task(admission.acquire("b"))
+        await asyncio.sleep(0)
+        priority = asyncio.create_task(admission.acquire("c", PRIORITY_HIGH))
+        await asyncio.sleep(0)
+        with pytest.raises(Busy):
+            await normal
+        admission.release("a")
+        await priority
+
+    asyncio.run(scenario())
+
+
+def test_per_session_cap_skips_calls_without_a_session():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=0, per_session=1, queue_size=0, queue_timeout=1)
+        await admission.acquire("")
+        await admission.acquire("")
+        await admission.acquire("a")
+        with pytest.raises(Busy):
+            await admission.acquire("a")
+        await admission.acquire("b")
+        return admission.stats()
+
+    assert asyncio.run(scenario())["in_flight"] == 4
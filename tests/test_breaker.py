@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import pytest
+
+import core.http
+from core.breaker import CircuitBreaker, CircuitOpenError
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats()["trips"] == 1
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+    open_breaker(breaker)
+
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_probe_opens_again():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+    open_breaker(breaker)
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert breaker.stats()["trips"] == 2
+
+
+def test_released_probe_lets_the_next_call_probe():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+    open_breaker(breaker)
+    breaker.before_call()
+    breaker.release_probe()
+
+    breaker.before_call()
+    assert breaker.state == "half_open"
+
+
+def test_cancelled_probe_is_released(monkeypatch):
+    async def hang(url, timeout, upstream):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(core.http, "_fetch_json", hang)
+    breaker = core.http.get_breaker("test cancelled probe")
+    breaker.state = "open"
+    breaker.opened_at = time.monotonic() - breaker.reset_timeout
+
+    async def cancel_probe():
+        task = asyncio.create_task(core.http.get_json("http://upstream.invalid/", upstream="test cancelled probe"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_probe())
+    assert breaker.state == "half_open"
+    breaker.before_call()
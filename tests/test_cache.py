@@ -0,0 +1,77 @@
+import asyncio
+import json
+import os
+import time
+
+from core.cache import TTLCache
+
+
+def test_expired_entry_is_a_miss(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = TTLCache(4, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=30)
+
+    now[0] += 20
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_changes_are_written_once_per_delay(tmp_path):
+    path = tmp_path / "cache.json"
+
+    async def fill():
+        cache = TTLCache(10, ttl=60, path=str(path), save_delay=0.05)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert not path.exists()
+        await asyncio.sleep(0.2)
+        return cache
+
+    asyncio.run(fill())
+    assert set(json.loads(path.read_text())) == {"a", "b"}
+    assert TTLCache(10, ttl=60, path=str(path)).get("b") == 2
+
+
+def test_save_writes_through_a_per_process_temporary_file(tmp_path, monkeypatch):
+    path = tmp_path / "cache.json"
+    replaced = []
+    real_replace = os.replace
+    monkeypatch.setattr(os, "replace", lambda src, dst: (replaced.append(src), real_replace(src, dst)))
+    TTLCache(10, ttl=60, path=str(path)).set("a", 1)
+
+    assert replaced == [f"{path}.{os.getpid()}.tmp"]
+    assert os.listdir(tmp_path) == ["cache.json"]
+
+
+def test_failed_save_is_logged_and_retried(tmp_path, caplog):
+    path = tmp_path / "missing" / "cache.json"
+
+    async def fill():
+        cache = TTLCache(10, ttl=60, path=str(path), save_delay=0.01)
+        cache.set("a", 1)
+        await asyncio.sleep(0.1)
+        # The failed save neither escapes the background task nor a flush at shutdown
+        await cache.flush()
+        path.parent.mkdir()
+        await cache.flush()
+
+    asyncio.run(fill())
+    assert caplog.text.count("Saving cache file") == 2
+    assert json.loads(path.read_text())["a"][1] == 1
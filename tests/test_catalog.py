@@ -0,0 +1,68 @@
+import pytest
+
+from core.catalog import LocationIndex, parse_budget, parse_duration
+from core.datasets import KANDY_LOCATIONS
+
+
+@pytest.mark.parametrize("description, expected", [
+    ("Budget: 500-1000 LKR (entrance fee). Allow 2-3 hours.", (500.0, 1000.0)),
+    ("Budget: 1,500 to 2,500 LKR (guide).", (1500.0, 2500.0)),
+    ("Budget: Free entry, 200-500 LKR for transportation.", (0.0, 500.0)),
+    ("Budget: Free entry, donations appreciated.", (0.0, 0.0)),
+    ("Budget: 2500-4500 LKR (permits, guide, and 4WD transport).", (2500.0, 4500.0)),
+    ("Budget: varies.", None),
+    ("Entrance fee on site.", None),
+])
+def test_parse_budget(description, expected):
+    assert parse_budget(description) == expected
+
+
+@pytest.mark.parametrize("description, expected", [
+    ("Allow 2-3 hours for complete visit.", (2.0, 3.0)),
+    ("Quick visit of 1 hour.", (1.0, 1.0)),
+    ("Allow 30-60 minutes. Best visited during morning hours.", (0.5, 1.0)),
+    ("Moderate trek of 3 to 4.5 hours.", (3.0, 4.5)),
+    ("Full day trek (6-8 hours).", (6.0, 8.0)),
+    ("Half to full day visit.", (4.0, 8.0)),
+    ("A full day out.", (8.0, 8.0)),
+    ("Multi-day camping treks available.", None),
+])
+def test_parse_duration(description, expected):
+    assert parse_duration(description) == expected
+
+
+def test_every_builtin_location_states_a_budget():
+    assert all(parse_budget(row["description"]) is not None for row in KANDY_LOCATIONS)
+
+
+def test_filters_match_a_full_scan():
+    index = LocationIndex(KANDY_LOCATIONS)
+
+    def scan(category, max_budget, max_hours):
+        rows = []
+        for row in KANDY_LOCATIONS:
+            budget = parse_budget(row["description"])
+            duration = parse_duration(row["description"])
+            if category and category not in [c.casefold() for c in row["category"]]:
+                continue
+            if max_budget is not None and (budget is None or budget[0] > max_budget):
+                continue
+            if max_hours is not None and (duration is None or duration[0] > max_hours):
+                continue
+            rows.append(row["location"])
+        return rows
+
+    for category in (None, "nature", "Cultural"):
+        for max_budget in (None, 0, 500, 2000):
+            for max_hours in (None, 1, 3):
+                result = index.query([category] if category else None, max_budget, max_hours, fields=["location"])
+                assert [row["location"] for row in result] == scan(category and category.casefold(), max_budget, max_hours)
+
+
+def test_query_pages_and_copies_rows():
+    index = LocationIndex(KANDY_LOCATIONS)
+    page = index.query(limit=2, offset=1)
+    assert [row["location"] for row in page] == [row["location"] for row in KANDY_LOCATIONS[1:3]]
+
+    page[0]["location"] = "changed"
+    assert index.rows[1]["location"] != "changed"
@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+from mcp.server.fastmcp import FastMCP
+
+from core.compact import MIN_REF_BYTES, compact_output, compact_result, truncate_text
+
+ROWS = [
+    {"name": f"Place {i}", "country": "Sri Lanka", "description": "A long description of the place. " * 3}
+    for i in range(5)
+]
+
+
+def expand(value, objects):
+    """Undo compact encoding: resolve references and turn tables back into lists."""
+    if isinstance(value, list):
+        return [expand(item, objects) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "$ref" in value:
+        return objects[value["$ref"]]
+    if set(value) - {"same"} == {"columns", "rows"}:
+        same = value.get("same", {})
+        return [
+            expand({**same, **dict(zip(value["columns"], row))}, objects)
+            for row in value["rows"]
+        ]
+    item = {key: expand(element, objects) for key, element in value.items() if key != "$id"}
+    if "$id" in value:
+        objects[value["$id"]] = item
+    return item
+
+
+def test_round_trip_without_session():
+    encoded = compact_result({"places": ROWS}, compact=True)
+    assert encoded["places"]["same"] == {"country": "Sri Lanka", "description": ROWS[0]["description"]}
+    assert expand(encoded, {}) == {"places": ROWS}
+    assert "$id" not in json.dumps(encoded)
+
+
+def test_round_trip_with_references():
+    objects = {}
+    first = compact_result({"place": ROWS[0]}, compact=True, session="test round trip")
+    second = compact_result({"again": ROWS[0]}, compact=True, session="test round trip")
+    assert second["again"] == {"$ref": first["place"]["$id"]}
+    assert expand(first, objects) == {"place": ROWS[0]}
+    assert expand(second, objects) == {"again": ROWS[0]}
+
+
+def test_small_objects_are_not_referenced():
+    small = {"a": 1}
+    assert len(json.dumps(small)) < MIN_REF_BYTES
+    compact_result(small, compact=True, session="test small")
+    assert compact_result(small, compact=True, session="test small") == small
+
+
+def test_truncate_text_keeps_whole_sentences():
+    text = "First sentence here. Second sentence is longer than the first one."
+    assert truncate_text(text, 30) == "First sentence here.…"
+    assert truncate_text(text, 40) == "First sentence here. Second sentence…"
+    assert truncate_text(text, 200) == text
+
+
+def test_compact_response_is_smaller_and_plain_one_unchanged():
+    async def tool() -> list:
+        """
+        List places.
+
+        Args:
+            none: Unused
+        """
+        return ROWS
+
+    async def sizes():
+        plain_server = FastMCP("plain")
+        server = FastMCP("compact")
+        plain_server.tool()(tool)
+        server.tool()(compact_output(tool, lambda: ""))
+        plain = await plain_server.call_tool("tool", {})
+        wrapped = await server.call_tool("tool", {})
+        compact = await server.call_tool("tool", {"compact": True})
+        listed = await server.list_tools()
+        return plain, wrapped, compact, listed[0]
+
+    plain, wrapped, compact, listed = asyncio.run(sizes())
+    assert wrapped == plain
+    assert compact.structuredContent is None
+    assert listed.outputSchema is None
+    assert {"compact", "max_text_chars"} <= set(listed.inputSchema["properties"])
+
+    text = compact.content[0].text
+    assert expand(json.loads(text), {}) == ROWS
+    assert len(text) < sum(len(block.text) for block in plain) / 2
@@ -0,0 +1,120 @@
+import asyncio
+import urllib.parse
+
+import pytest
+
+import core.history
+from core.history import HistoryStore, filter_rows, sync_history
+
+ROWS = [
+    {"activity": "Ella Rock hike", "date": "2025-11-15", "category": ["hiking", "nature"]},
+    {"activity": "Temple visit", "date": "2025-11-16", "category": ["cultural"]},
+    {"activity": "Horton Plains walk", "date": "2025-11-17", "category": ["Hiking", "wildlife"]},
+    {"activity": "Knuckles trek", "date": "2025-11-18", "category": ["hiking", "nature", "camping"]},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / "history.sqlite"))
+
+
+def names(rows: list) -> list[str]:
+    return [row["activity"] for row in rows]
+
+
+def test_query_filters_and_pages(store):
+    store.add("alice", "activities", list(reversed(ROWS)))
+
+    assert store.query("alice", "activities") == ROWS
+    assert names(store.query("alice", "activities", start_date="2025-11-16", end_date="2025-11-17")) == [
+        "Temple visit", "Horton Plains walk"
+    ]
+    assert names(store.query("alice", "activities", categories=["HIKING", "nature"])) == [
+        "Ella Rock hike", "Knuckles trek"
+    ]
+    assert names(store.query("alice", "activities", categories=["hiking"], limit=2, offset=1)) == [
+        "Horton Plains walk", "Knuckles trek"
+    ]
+    assert store.query("bob", "activities") == []
+    assert store.query("alice", "locations") == []
+
+
+def test_query_matches_filter_rows(store):
+    store.add("alice", "activities", ROWS)
+    for start, end, categories in [("2025-11-16", None, ["nature"]), (None, "2025-11-17", ["hiking"]), (None, None, None)]:
+        assert store.query("alice", "activities", start, end, categories) == filter_rows(ROWS, start, end, categories)
+
+
+def test_rows_returned_again_are_not_added_twice(store):
+    assert store.add("alice", "activities", ROWS) == ROWS
+    assert store.add("alice", "activities", ROWS[2:], since="2025-11-17") == []
+    assert store.query("alice", "activities") == ROWS
+
+
+def test_sync_replaces_edited_and_deleted_rows_of_its_window(store):
+    store.add("alice", "activities", ROWS)
+    edited = {**ROWS[3], "activity": "Knuckles trek and camp"}
+
+    added = store.add("alice", "activities", [ROWS[2], edited], since="2025-11-17")
+
+    assert added == [edited]
+    assert names(store.query("alice", "activities")) == [
+        "Ella Rock hike", "Temple visit", "Horton Plains walk", "Knuckles trek and camp"
+    ]
+    assert names(store.query("alice", "activities", categories=["camping"])) == ["Knuckles trek and camp"]
+
+    store.add("alice", "activities", [edited], since="2025-11-17")
+    assert names(store.query("alice", "activities", categories=["hiking"])) == [
+        "Ella Rock hike", "Knuckles trek and camp"
+    ]
+    assert store.stats()["rows_removed"] == 2
+
+
+def test_sync_asks_only_for_new_dates(store, monkeypatch):
+    requested = []
+    backend = list(ROWS[:2])
+
+    async def get_json(url, timeout, upstream):
+        since = urllib.parse.parse_qs(urllib.parse.urlparse(url).query).get("since", [""])[0]
+        requested.append(since)
+        return [row for row in backend if row["date"] >= since]
+
+    monkeypatch.setattr(core.history, "history_store", store)
+    monkeypatch.setattr(core.history, "get_json", get_json)
+    monkeypatch.setattr(core.history, "HISTORY_SYNC_INTERVAL", 0)
+
+    assert asyncio.run(sync_history("alice", "activities")) == ROWS[:2]
+    backend[1:] = ROWS[2:]
+    assert asyncio.run(sync_history("alice", "activities")) == ROWS[2:]
+
+    assert requested == ["", "2025-11-16"]
+    assert names(store.query("alice", "activities")) == ["Ella Rock hike", "Horton Plains walk", "Knuckles trek"]
+    assert store.sync_state("alice", "activities")[0] == "2025-11-18"
+
+
+def test_recent_sync_is_not_repeated(store, monkeypatch):
+    async def get_json(url, timeout, upstream):
+        return ROWS
+
+    monkeypatch.setattr(core.history, "history_store", store)
+    monkeypatch.setattr(core.history, "get_json", get_json)
+    monkeypatch.setattr(core.history, "HISTORY_SYNC_INTERVAL", 3600)
+
+    assert asyncio.run(sync_history("alice", "activities")) == ROWS
+    assert asyncio.run(sync_history("alice", "activities")) == []
+
+
+def test_concurrent_syncs_run_off_the_event_loop(store, monkeypatch):
+    async def get_json(url, timeout, upstream):
+        await asyncio.sleep(0)
+        return ROWS
+
+    monkeypatch.setattr(core.history, "history_store", store)
+    monkeypatch.setattr(core.history, "get_json", get_json)
+
+    async def sync_everyone():
+        return await asyncio.gather(*(sync_history(f"user{i}", "activities") for i in range(20)))
+
+    assert all(added == ROWS for added in asyncio.run(sync_everyone()))
+    assert store.stats()["rows"] == 20 * len(ROWS)
@@ -0,0 +1,38 @@
+import asyncio
+
+from core.batch import fan_out, run_tracked
+from core.metrics import instrument_tool, tool_errors
+
+
+async def lookup(location: str) -> dict:
+    return {"location": location}
+
+
+async def failing_lookup(location: str) -> dict:
+    return {"error": f"Unknown location '{location}'"}
+
+
+def errors(name: str) -> float:
+    return tool_errors._values.get((name,), 0)
+
+
+def test_batch_without_failures_is_not_an_error():
+    async def lookup_batch(locations: list[str]) -> dict:
+        return await fan_out(lookup, "location", locations)
+
+    result = asyncio.run(instrument_tool(lookup_batch)(locations=["Kandy", "Ella"]))
+    assert result["error"] == 0
+    assert errors("lookup_batch") == 0
+    assert asyncio.run(run_tracked(lookup_batch, locations=["Kandy"]))["status"] == "ok"
+
+
+def test_error_message_counts_as_an_error():
+    result = asyncio.run(instrument_tool(failing_lookup)(location="Atlantis"))
+    assert errors("failing_lookup") == 1
+    assert asyncio.run(run_tracked(failing_lookup, location="Atlantis"))["error"] == result["error"]
+
+
+def test_batch_counts_failed_items():
+    result = asyncio.run(fan_out(failing_lookup, "location", ["Atlantis", "Lemuria"]))
+    assert (result["ok"], result["error"]) == (0, 2)
+    assert [item["status"] for item in result["results"]] == ["error", "error"]
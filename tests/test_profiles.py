@@ -0,0 +1,42 @@
+from core.profiles import UserProfile
+
+
+def test_recent_interests_weigh_more():
+    profile = UserProfile(half_life_days=90)
+    profile.add_activities([
+        {"date": "2025-01-01", "category": ["hiking"]},
+        {"date": "2025-04-01", "category": ["Beach"]},
+    ])
+
+    summary = profile.summary()
+    assert summary["categories"] == {"beach": 1, "hiking": 1}
+    assert summary["interests"] == {"beach": 0.667, "hiking": 0.333}
+
+
+def test_short_half_life_and_far_dates_do_not_overflow():
+    profile = UserProfile(half_life_days=7)
+    profile.add_activities([
+        {"date": "1990-01-01", "category": ["old"]},
+        {"date": "2025-06-01", "category": ["recent"]},
+        {"date": "2300-01-01", "category": ["future"]},
+    ])
+
+    interests = profile.summary()["interests"]
+    assert interests["future"] == 1.0
+    assert interests["recent"] == interests["old"] == 0.0
+
+
+def test_rows_are_folded_in_once():
+    profile = UserProfile(half_life_days=90)
+    rows = [{"date": "2025-01-01", "category": ["hiking"], "budget": 2000}]
+    assert profile.add_activities(rows) == 1
+    assert profile.add_activities(rows) == 0
+    assert profile.summary()["budget"]["mean"] == 2000.0
+
+
+def test_seen_rows_are_bounded():
+    profile = UserProfile(half_life_days=90, seen_rows=2)
+    rows = [{"date": f"2025-01-0{day}", "category": ["hiking"]} for day in range(1, 5)]
+    profile.add_locations(rows)
+    assert len(profile._seen) == 2
+    assert profile.add_locations(rows[-2:]) == 0
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+import core.history
+import core.profiles
+from core.history import HistoryStore
+from core.profiles import fold_history, profile_cache
+
+ROWS = [
+    {"activity": "Ella Rock hike", "date": "2025-11-15", "budget": 2500, "category": ["hiking"]},
+    {"activity": "Temple visit", "date": "2025-11-16", "budget": 1000, "category": ["cultural"]},
+    {"activity": "Knuckles trek", "date": "2025-11-18", "budget": 3500, "category": ["hiking", "camping"]},
+]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path / "history.sqlite"))
+    monkeypatch.setattr(core.history, "history_store", store)
+    monkeypatch.setattr(core.profiles, "history_store", store)
+    profile_cache.clear()
+    return store
+
+
+def test_rows_synced_by_another_worker_are_folded(store):
+    store.add("alice", "activities", ROWS[:1])
+    assert asyncio.run(fold_history("alice", "activities")).activities == 1
+
+    # Another worker syncs the rest; this one's sync would find nothing new
+    store.add("alice", "activities", ROWS, since="2025-11-15")
+
+    profile = asyncio.run(fold_history("alice", "activities"))
+    assert profile.activities == 3
+    assert profile.summary()["budget"]["max"] == 3500
+    assert asyncio.run(fold_history("alice", "activities")).activities == 3
+
+
+def test_profile_is_rebuilt_after_rows_are_removed(store):
+    store.add("alice", "activities", ROWS)
+    store.add("alice", "locations", [{"location": "Ella", "date": "2025-11-15", "group_size": 2}])
+    asyncio.run(fold_history("alice", "activities"))
+    asyncio.run(fold_history("alice", "locations"))
+
+    # The backend edited the last activity's budget
+    store.add("alice", "activities", [{**ROWS[2], "budget": 4000}], since="2025-11-18")
+
+    profile = asyncio.run(fold_history("alice", "activities"))
+    assert profile.activities == 3
+    assert profile.locations == 1
+    assert profile.summary()["budget"]["max"] == 4000
+    assert profile_cache.get("alice") is profile
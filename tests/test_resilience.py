@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from core.breaker import CircuitBreaker
+from core.resilience import RetryBudget, Upstream, UpstreamPolicy, UpstreamStatusError
+
+
+def make_upstream(budget: RetryBudget, latency: float | None = None, **policy) -> Upstream:
+    upstream = Upstream(
+        "test",
+        UpstreamPolicy(retry_backoff=0.001, min_timeout=0.05, **policy),
+        CircuitBreaker("test", failure_threshold=100, reset_timeout=60),
+        budget,
+    )
+    if latency is not None:
+        for _ in range(50):
+            upstream.latency.add(latency)
+    return upstream
+
+
+def test_budget_allows_a_ratio_of_first_attempts():
+    budget = RetryBudget(ratio=0.5, min_per_second=0)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+
+    budget.deposit()
+    assert not budget.try_spend()
+    budget.deposit()
+    assert budget.try_spend()
+    assert budget.stats()["spent"] == 2
+    assert budget.stats()["denied"] == 2
+
+
+def test_attempt_timeout_follows_observed_latency():
+    upstream = make_upstream(RetryBudget(0.1, 1))
+    assert upstream.attempt_timeout(10) == 10
+
+    for _ in range(50):
+        upstream.latency.add(0.2)
+    assert upstream.attempt_timeout(10) == pytest.approx(0.6)
+    assert upstream.attempt_timeout(0.3) == 0.3
+
+
+def test_slow_attempt_is_hedged_and_the_first_answer_wins():
+    upstream = make_upstream(RetryBudget(0.1, 1), latency=0.01)
+    calls = []
+
+    async def attempt(timeout):
+        calls.append(timeout)
+        await asyncio.sleep(1 if len(calls) == 1 else 0)
+        return len(calls)
+
+    assert asyncio.run(upstream.call(attempt, timeout=2)) == 2
+    assert upstream.hedges == 1
+    assert upstream.hedge_wins == 1
+
+
+def test_no_hedge_without_budget():
+    upstream = make_upstream(RetryBudget(0, 0), latency=0.01)
+    upstream.budget.tokens = 0
+    calls = []
+
+    async def attempt(timeout):
+        calls.append(timeout)
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    assert asyncio.run(upstream.call(attempt, timeout=2)) == "primary"
+    assert len(calls) == 1
+    assert upstream.hedges == 0
+    assert upstream.budget.denied == 1
+
+
+def test_retryable_errors_are_retried():
+    upstream = make_upstream(RetryBudget(0.1, 1), hedge=False)
+    statuses = [503, 429]
+
+    async def attempt(timeout):
+        if statuses:
+            raise UpstreamStatusError(statuses.pop(0))
+        return "ok"
+
+    assert asyncio.run(upstream.call(attempt, timeout=2)) == "ok"
+    assert upstream.retries == 2
+
+
+def test_client_errors_and_an_empty_budget_are_not_retried():
+    upstream = make_upstream(RetryBudget(0, 0), hedge=False)
+    upstream.budget.tokens = 0
+    calls = []
+
+    async def attempt(timeout):
+        calls.append(timeout)
+        raise UpstreamStatusError(404 if len(calls) == 1 else 503)
+
+    with pytest.raises(UpstreamStatusError, match="404"):
+        asyncio.run(upstream.call(attempt, timeout=2))
+    with pytest.raises(UpstreamStatusError, match="503"):
+        asyncio.run(upstream.call(attempt, timeout=2))
+    assert len(calls) == 2
+    assert upstream.retries == 0
@@ -0,0 +1,59 @@
+import asyncio
+import sqlite3
+
+from core.cache import TTLCache
+from core.shared import SharedStore
+
+
+def test_writes_are_queued_and_written_together(tmp_path):
+    path = str(tmp_path / "shared.sqlite")
+    store = SharedStore(path, write_delay=0.05)
+    other = SharedStore(path)
+
+    async def fill():
+        for n in range(20):
+            store.set("geocode", f"k{n}", {"n": n}, ttl=60)
+        # Queued entries are visible here at once, in other processes once written
+        assert store.get("geocode", "k3")[1] == {"n": 3}
+        assert other.get("geocode", "k3") is None
+        assert store.stats()["pending"] == 20
+        await asyncio.sleep(0.2)
+
+    asyncio.run(fill())
+    assert store.stats()["pending"] == 0
+    assert other.get("geocode", "k3")[1] == {"n": 3}
+    assert other.stats()["entries"] == 20
+
+
+def test_set_without_event_loop_writes_at_once(tmp_path):
+    path = str(tmp_path / "shared.sqlite")
+    SharedStore(path).set("catalog", "kandy", [1, 2], ttl=60)
+
+    assert SharedStore(path).get("catalog", "kandy")[1] == [1, 2]
+
+
+def test_failed_write_is_logged_and_dropped(tmp_path, caplog):
+    store = SharedStore(str(tmp_path / "shared.sqlite"))
+
+    async def fill():
+        store.set("geocode", "bad", object(), ttl=60)
+        await store.flush()
+
+    asyncio.run(fill())
+    assert store.stats()["write_errors"] == 1
+    assert store.stats()["pending"] == 0
+    assert "shared cache entries failed" in caplog.text
+
+
+def test_flush_writes_queued_entries(tmp_path):
+    path = str(tmp_path / "shared.sqlite")
+    store = SharedStore(path, write_delay=60)
+
+    async def fill():
+        cache = TTLCache(10, ttl=60, shared=store, namespace="weather")
+        cache.set("colombo", {"temp": 30})
+        await store.flush()
+
+    asyncio.run(fill())
+    rows = sqlite3.connect(path).execute("SELECT namespace, key FROM entries").fetchall()
+    assert rows == [("weather", "colombo")]
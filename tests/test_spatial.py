@@ -0,0 +1,72 @@
+import asyncio
+import random
+
+import core.geocoding
+import core.swr
+from core.spatial import SpatialIndex, haversine_km, trim_by_distance
+from tools.get_nearby_location_activities import get_nearby_location_activities
+
+
+def points(count: int) -> list[tuple[float, float, dict]]:
+    rng = random.Random(13)
+    return [(rng.uniform(5.9, 9.8), rng.uniform(79.6, 81.9), {"id": i}) for i in range(count)]
+
+
+def test_queries_match_a_full_scan():
+    index = SpatialIndex(0.1)
+    every = points(500)
+    for lat, lon, item in every:
+        index.add(lat, lon, item)
+    origin = (7.29, 80.63)
+    distances = sorted((haversine_km(*origin, lat, lon), item["id"]) for lat, lon, item in every)
+
+    assert [item["id"] for _, item in index.within(*origin, 30)] == [i for d, i in distances if d <= 30]
+    assert [item["id"] for _, item in index.nearest(*origin, 7)] == [i for _, i in distances[:7]]
+    assert [item["id"] for _, item in index.nearest(*origin, 7, max_km=5)] == [i for d, i in distances[:7] if d <= 5]
+
+
+def test_nearest_from_far_away():
+    index = SpatialIndex(0.1)
+    index.add(7.0, 80.0, {"id": 1})
+    index.add(8.0, 81.0, {"id": 2})
+    assert [item["id"] for _, item in index.nearest(51.5, -0.1, 1)] == [2]
+
+
+def test_trim_by_distance_ranks_categories_first():
+    rows = [
+        {"name": "a", "distance_km": 1, "category": ["cultural"]},
+        {"name": "b", "distance_km": 80, "category": ["hiking"]},
+        {"name": "c", "distance_km": 5, "category": ["hiking", "nature"]},
+        {"name": "d", "category": ["nature"]},
+    ]
+    assert [row["name"] for row in trim_by_distance(rows, 50, 3)] == ["a", "c", "d"]
+    assert [row["name"] for row in trim_by_distance(rows, 50, 2, ["hiking", "nature"])] == ["c", "d"]
+
+
+def test_backend_rows_are_not_replaced_by_known_attractions(monkeypatch):
+    live = [{"name": "New cafe", "distance_km": 0.5, "activities": [], "category": []}]
+
+    async def backend(url, timeout):
+        return live
+
+    async def geocode(location):
+        raise AssertionError("the backend answered, so nothing should be geocoded")
+
+    monkeypatch.setattr(core.swr, "get_backend_json", backend)
+    monkeypatch.setattr(core.geocoding, "geocode", geocode)
+    assert asyncio.run(get_nearby_location_activities("Kandy")) == live
+
+
+def test_known_attractions_answer_while_the_backend_is_down(monkeypatch):
+    async def backend(url, timeout):
+        raise ConnectionError("backend down")
+
+    async def geocode(location):
+        return {"name": "Galle", "country": "Sri Lanka", "latitude": 6.0329, "longitude": 80.2168}
+
+    monkeypatch.setattr(core.swr, "get_backend_json", backend)
+    monkeypatch.setattr(core.geocoding, "geocode", geocode)
+    rows = asyncio.run(get_nearby_location_activities("Galle", radius_km=10, limit=3))
+    assert rows and len(rows) <= 3
+    assert all(row["distance_km"] <= 10 for row in rows)
+    assert [row["distance_km"] for row in rows] == sorted(row["distance_km"] for row in rows)
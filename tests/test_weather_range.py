@@ -0,0 +1,71 @@
+import asyncio
+import urllib.parse
+from datetime import date, timedelta
+
+import core.geocoding
+import core.http
+from core.batch import run_tracked
+from tools.get_weather_range import get_weather_range
+
+
+def use_place(monkeypatch, latitude: float) -> None:
+    # A place of its own per test, so no test is answered from another's cached days
+    async def geocode(location):
+        return {"name": location, "country": "Sri Lanka", "latitude": latitude, "longitude": 80.6}
+
+    monkeypatch.setattr(core.geocoding, "geocode", geocode)
+
+
+def fake_upstream(monkeypatch) -> list:
+    requested = []
+
+    async def get_json(url, timeout, upstream):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+        first = date.fromisoformat(query["start_date"][0])
+        last = date.fromisoformat(query["end_date"][0])
+        requested.append((first, last))
+        days = [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+        daily = {name: [1.0] * len(days) for name in query["daily"][0].split(",")}
+        return {"daily": {**daily, "time": days, "weather_code": [0] * len(days)}}
+
+    monkeypatch.setattr(core.http, "get_json", get_json)
+    return requested
+
+
+def test_distant_dates_are_fetched_in_separate_runs(monkeypatch):
+    use_place(monkeypatch, 7.101)
+    requested = fake_upstream(monkeypatch)
+    wanted = ["2021-03-01", "2021-03-04", "2021-03-12", "2023-08-20"]
+
+    result = asyncio.run(get_weather_range("Kandy", dates=wanted))
+
+    assert [day["date"] for day in result["days"]] == wanted
+    assert sorted(requested) == [
+        (date(2021, 3, 1), date(2021, 3, 4)),
+        (date(2021, 3, 12), date(2021, 3, 12)),
+        (date(2023, 8, 20), date(2023, 8, 20)),
+    ]
+
+
+def test_dates_a_week_apart_share_a_request(monkeypatch):
+    use_place(monkeypatch, 7.102)
+    requested = fake_upstream(monkeypatch)
+
+    asyncio.run(get_weather_range("Kandy", dates=["2022-01-01", "2022-01-08", "2022-01-15"]))
+
+    assert requested == [(date(2022, 1, 1), date(2022, 1, 15))]
+
+
+def test_failed_runs_mark_the_call_as_fallback(monkeypatch):
+    use_place(monkeypatch, 7.103)
+
+    async def get_json(url, timeout, upstream):
+        raise ConnectionError("archive down")
+
+    monkeypatch.setattr(core.http, "get_json", get_json)
+
+    tracked = asyncio.run(run_tracked(get_weather_range, location="Kandy", dates=["2020-05-01", "2022-05-01"]))
+
+    assert tracked["status"] == "fallback"
+    assert tracked["reason"] == "archive down"
+    assert len(tracked["data"]["days"]) == 2
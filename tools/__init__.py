@@ -1,13 +1,29 @@
 """Tools module for the MCP Server."""
 
+from .get_all_location_for_designation_batch import get_all_location_for_designation_batch
 from .get_nearby_location_activities import get_nearby_location_activities
+from .get_nearby_location_activities_batch import get_nearby_location_activities_batch
 from .get_past_activities import get_past_activities
+from .get_past_activities_batch import get_past_activities_batch
 from .get_past_locations import get_past_locations
+from .get_past_locations_batch import get_past_locations_batch
+from .get_user_profile import get_user_profile
 from .get_weather import get_weather
+from .get_weather_batch import get_weather_batch
+from .get_weather_range import get_weather_range
+from .plan_trip import plan_trip
 
 __all__ = [
+    'get_all_location_for_designation_batch',
     'get_nearby_location_activities',
+    'get_nearby_location_activities_batch',
     'get_past_activities',
+    'get_past_activities_batch',
     'get_past_locations',
-    'get_weather'
+    'get_past_locations_batch',
+    'get_user_profile',
+    'get_weather',
+    'get_weather_batch',
+    'get_weather_range',
+    'plan_trip'
 ]
@@ -0,0 +1,16 @@
+async def get_all_location_for_designation_batch(locations: list[str]) -> dict:
+    """
+    Get all locations near each of several designated locations in one call.
+
+    Args:
+        locations: List of designated locations to find nearby locations for (e.g., ["Kandy", "Ella"])
+
+    Returns:
+        Dictionary with ok/fallback/error counts and a "results" list in input order.
+        Each item holds its location, a status of "ok", "fallback" or "error", and the
+        data get_all_location_for_designation returns for it.
+    """
+    from core.batch import fan_out
+    from tools.get_all_location_for_designation import get_all_location_for_designation
+
+    return await fan_out(get_all_location_for_designation, "location", locations)
@@ -1,65 +1,58 @@
-def get_nearby_location_activities(location: str = "Unknown") -> list:
+async def get_nearby_location_activities(
+    location: str = "Unknown",
+    radius_km: float | None = None,
+    limit: int | None = None,
+    categories: list[str] | None = None,
+    fields: list[str] | None = None,
+) -> list:
     """
     Gather nearby locations and their activities to given designated location.
 
     Args:
         location: The location to find nearby activities for (e.g., "Kandy")
+        radius_km: Only return places within this many kilometres (default 50)
+        limit: Maximum number of places to return, nearest first (default 10)
+        categories: Rank places having more of these categories first (e.g., ["hiking", "nature"])
+        fields: Only return these fields of each place (e.g., ["name", "distance_km"])
 
     Returns:
         A list of nearby locations with their activities.
     """
+    import copy
     import urllib.parse
-    import urllib.request
-    import json
+
+    from core.datasets import KANDY_NEARBY
+    from core.fallback import mark_fallback
+    from core.geocoding import geocode
+    from core.settings import BACKEND_API_URL, BACKEND_TIMEOUT, NEARBY_LIMIT, NEARBY_RADIUS_KM
+    from core.shaping import shape
+    from core.spatial import nearby_attractions, trim_by_distance
+    from core.swr import get_backend_json
+
+    radius_km = NEARBY_RADIUS_KM if radius_km is None else radius_km
+    limit = NEARBY_LIMIT if limit is None else limit
 
     encoded = urllib.parse.quote(location)
-    url = f"http://localhost:3000/api/location?location={encoded}"
+    url = f"{BACKEND_API_URL}/location?location={encoded}"
 
     try:
-        with urllib.request.urlopen(url, timeout=5) as resp:
-            status = getattr(resp, "status", None) or resp.getcode()
-            if status != 200:
-                raise Exception(f"API returned status {status}")
-            data = json.load(resp)
-            
-            return data
+        data = await get_backend_json(url, timeout=BACKEND_TIMEOUT)
+
+        return shape(trim_by_distance(data, radius_km, limit, categories), fields) if isinstance(data, list) else data
 
     except Exception as e:
+        mark_fallback(e)
+        # Answer from the spatial index of known attractions when it covers the location
+        try:
+            place = await geocode(location)
+        except Exception:
+            place = None
+        if place is not None:
+            nearby = nearby_attractions(place["latitude"], place["longitude"], radius_km, limit, categories)
+            if nearby:
+                return shape(nearby, fields)
         if location.lower() == "kandy":
-            dummy = [
-                {
-                    "name": "Temple of the Tooth Relic (Sri Dalada Maligawa)",
-                    "distance_km": 1.0,
-                    "activities": [
-                        "Cultural sightseeing",
-                        "Historical exploration",
-                        "Religious worship"
-                    ],
-                    "category": ["cultural", "religious", "historical"]
-                },
-                {
-                    "name": "Peradeniya Botanical Garden",
-                    "distance_km": 6.0,
-                    "activities": [
-                        "Nature walk",
-                        "Photography",
-                        "Picnic",
-                        "Botanical exploration"
-                    ],
-                    "category": ["nature", "photography", "family"]
-                },
-                {
-                    "name": "Bahirawakanda Temple",
-                    "distance_km": 2.0,
-                    "activities": [
-                        "Hilltop hike",
-                        "Panoramic city view",
-                        "Temple visit"
-                    ],
-                    "category": ["hiking", "cultural", "photography"]
-                }
-            ]
-            return dummy
+            return shape(trim_by_distance(copy.deepcopy(KANDY_NEARBY), radius_km, limit, categories), fields)
         else:
             return [
                 {
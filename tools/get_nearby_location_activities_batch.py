@@ -0,0 +1,16 @@
+async def get_nearby_location_activities_batch(locations: list[str]) -> dict:
+    """
+    Gather nearby locations and their activities for several designated locations in one call.
+
+    Args:
+        locations: List of locations to find nearby activities for (e.g., ["Kandy", "Ella"])
+
+    Returns:
+        Dictionary with ok/fallback/error counts and a "results" list in input order.
+        Each item holds its location, a status of "ok", "fallback" or "error", and the
+        data get_nearby_location_activities returns for it.
+    """
+    from core.batch import fan_out
+    from tools.get_nearby_location_activities import get_nearby_location_activities
+
+    return await fan_out(get_nearby_location_activities, "location", locations)
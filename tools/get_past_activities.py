@@ -1,60 +1,76 @@
-def get_past_activities(user: str) -> list:
+async def get_past_activities(
+    user: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    categories: list[str] | None = None,
+    fields: list[str] | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list:
     """
     Get past activities for a given user.
 
     Args:
         user: The username to fetch past activities for
+        start_date: Only return entries dated on or after this date (YYYY-MM-DD)
+        end_date: Only return entries dated on or before this date (YYYY-MM-DD)
+        categories: Only return entries having all of these categories (e.g., ["hiking", "nature"])
+        fields: Only return these fields of each entry (e.g., ["activity", "budget"])
+        limit: Maximum number of entries to return
+        offset: Number of entries to skip, for paging through the history
 
     Returns:
         A list of past activities with date and budget information.
     """
-    import urllib.parse
-    import urllib.request
-    import json
+    import asyncio
 
-    encoded = urllib.parse.quote(user)
-    url = f"http://localhost:3000/api/activities?user={encoded}"
+    from core.fallback import mark_fallback
+    from core.history import filter_rows, history_store, sync_history
+    from core.profiles import fold_history
+    from core.shaping import shape
 
     try:
-        with urllib.request.urlopen(url, timeout=5) as resp:
-            status = getattr(resp, "status", None) or resp.getcode()
-            if status != 200:
-                raise Exception(f"API returned status {status}")
-            data = json.load(resp)
-            
-            return data
-
+        await sync_history(user, "activities")
     except Exception as e:
-        dummy = [
-            {
-                "activity": "Hiking to Ella Rock viewpoint and sunrise photography",
-                "date": "2025-11-15",
-                "budget": 2500,
-                "category": ["hiking", "photography", "nature"]
-            },
-            {
-                "activity": "Rainforest trekking and bird watching in Sinharaja",
-                "date": "2025-11-16",
-                "budget": 3000,
-                "category": ["nature", "wildlife", "hiking"]
-            },
-            {
-                "activity": "World's End trail hike and wildlife observation",
-                "date": "2025-11-17",
-                "budget": 2800,
-                "category": ["hiking", "nature", "wildlife"]
-            },
-            {
-                "activity": "Climb Pidurangala Rock and explore Sigiriya surroundings",
-                "date": "2025-11-18",
-                "budget": 2000,
-                "category": ["hiking", "cultural", "adventure"]
-            },
-            {
-                "activity": "Trekking and camping in Knuckles Mountain valleys",
-                "date": "2025-11-19",
-                "budget": 3500,
-                "category": ["hiking", "camping", "nature", "adventure"]
-            }
-        ]
-        return dummy
+        # With a stored history, serve it; the next call tries the sync again
+        if await asyncio.to_thread(history_store.sync_state, user, "activities") is None:
+            mark_fallback(e)
+            dummy = [
+                {
+                    "activity": "Hiking to Ella Rock viewpoint and sunrise photography",
+                    "date": "2025-11-15",
+                    "budget": 2500,
+                    "category": ["hiking", "photography", "nature"]
+                },
+                {
+                    "activity": "Rainforest trekking and bird watching in Sinharaja",
+                    "date": "2025-11-16",
+                    "budget": 3000,
+                    "category": ["nature", "wildlife", "hiking"]
+                },
+                {
+                    "activity": "World's End trail hike and wildlife observation",
+                    "date": "2025-11-17",
+                    "budget": 2800,
+                    "category": ["hiking", "nature", "wildlife"]
+                },
+                {
+                    "activity": "Climb Pidurangala Rock and explore Sigiriya surroundings",
+                    "date": "2025-11-18",
+                    "budget": 2000,
+                    "category": ["hiking", "cultural", "adventure"]
+                },
+                {
+                    "activity": "Trekking and camping in Knuckles Mountain valleys",
+                    "date": "2025-11-19",
+                    "budget": 3500,
+                    "category": ["hiking", "camping", "nature", "adventure"]
+                }
+            ]
+            return shape(filter_rows(dummy, start_date, end_date, categories), fields, limit, offset)
+
+    # The cached profile folds in every stored row it has not seen, whoever synced it
+    await fold_history(user, "activities")
+
+    rows = await asyncio.to_thread(history_store.query, user, "activities", start_date, end_date, categories, limit, offset)
+    return shape(rows, fields)
@@ -0,0 +1,16 @@
+async def get_past_activities_batch(users: list[str]) -> dict:
+    """
+    Get past activities for several users in one call.
+
+    Args:
+        users: List of usernames to fetch past activities for
+
+    Returns:
+        Dictionary with ok/fallback/error counts and a "results" list in input order.
+        Each item holds its user, a status of "ok", "fallback" or "error", and the
+        data get_past_activities returns for it.
+    """
+    from core.batch import fan_out
+    from tools.get_past_activities import get_past_activities
+
+    return await fan_out(get_past_activities, "user", users)
@@ -1,60 +1,76 @@
-def get_past_locations(user: str) -> list:
+async def get_past_locations(
+    user: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    categories: list[str] | None = None,
+    fields: list[str] | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list:
     """
     Get past visited locations for a given user.
 
     Args:
         user: The username to fetch past locations for
+        start_date: Only return entries dated on or after this date (YYYY-MM-DD)
+        end_date: Only return entries dated on or before this date (YYYY-MM-DD)
+        categories: Only return entries having all of these categories (e.g., ["hiking", "nature"])
+        fields: Only return these fields of each entry (e.g., ["location", "date"])
+        limit: Maximum number of entries to return
+        offset: Number of entries to skip, for paging through the history
 
     Returns:
         A list of past locations with date and group size information.
     """
-    import urllib.parse
-    import urllib.request
-    import json
+    import asyncio
 
-    encoded = urllib.parse.quote(user)
-    url = f"http://localhost:3000/api/locations?user={encoded}"
+    from core.fallback import mark_fallback
+    from core.history import filter_rows, history_store, sync_history
+    from core.profiles import fold_history
+    from core.shaping import shape
 
     try:
-        with urllib.request.urlopen(url, timeout=5) as resp:
-            status = getattr(resp, "status", None) or resp.getcode()
-            if status != 200:
-                raise Exception(f"API returned status {status}")
-            data = json.load(resp)
-            
-            return data
-
+        await sync_history(user, "locations")
     except Exception as e:
-        dummy = [
-            {
-                "location": "Ella Rock, Badulla",
-                "date": "2025-11-15",
-                "group_size": 4,
-                "category": ["hiking", "photography", "nature"]
-            },
-            {
-                "location": "Sinharaja Forest Reserve, Deniyaya",
-                "date": "2025-11-16",
-                "group_size": 5,
-                "category": ["nature", "wildlife", "hiking"]
-            },
-            {
-                "location": "Horton Plains National Park, Nuwara Eliya",
-                "date": "2025-11-17",
-                "group_size": 3,
-                "category": ["hiking", "nature", "wildlife"]
-            },
-            {
-                "location": "Pidurangala Rock, Sigiriya",
-                "date": "2025-11-18",
-                "group_size": 2,
-                "category": ["hiking", "cultural", "adventure"]
-            },
-            {
-                "location": "Knuckles Mountain Range, Matale",
-                "date": "2025-11-19",
-                "group_size": 6,
-                "category": ["hiking", "camping", "nature", "adventure"]
-            }
-        ]
-        return dummy
+        # With a stored history, serve it; the next call tries the sync again
+        if await asyncio.to_thread(history_store.sync_state, user, "locations") is None:
+            mark_fallback(e)
+            dummy = [
+                {
+                    "location": "Ella Rock, Badulla",
+                    "date": "2025-11-15",
+                    "group_size": 4,
+                    "category": ["hiking", "photography", "nature"]
+                },
+                {
+                    "location": "Sinharaja Forest Reserve, Deniyaya",
+                    "date": "2025-11-16",
+                    "group_size": 5,
+                    "category": ["nature", "wildlife", "hiking"]
+                },
+                {
+                    "location": "Horton Plains National Park, Nuwara Eliya",
+                    "date": "2025-11-17",
+                    "group_size": 3,
+                    "category": ["hiking", "nature", "wildlife"]
+                },
+                {
+                    "location": "Pidurangala Rock, Sigiriya",
+                    "date": "2025-11-18",
+                    "group_size": 2,
+                    "category": ["hiking", "cultural", "adventure"]
+                },
+                {
+                    "location": "Knuckles Mountain Range, Matale",
+                    "date": "2025-11-19",
+                    "group_size": 6,
+                    "category": ["hiking", "camping", "nature", "adventure"]
+                }
+            ]
+            return shape(filter_rows(dummy, start_date, end_date, categories), fields, limit, offset)
+
+    # The cached profile folds in every stored row it has not seen, whoever synced it
+    await fold_history(user, "locations")
+
+    rows = await asyncio.to_thread(history_store.query, user, "locations", start_date, end_date, categories, limit, offset)
+    return shape(rows, fields)
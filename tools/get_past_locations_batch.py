@@ -0,0 +1,16 @@
+async def get_past_locations_batch(users: list[str]) -> dict:
+    """
+    Get past visited locations for several users in one call.
+
+    Args:
+        users: List of usernames to fetch past locations for
+
+    Returns:
+        Dictionary with ok/fallback/error counts and a "results" list in input order.
+        Each item holds its user, a status of "ok", "fallback" or "error", and the
+        data get_past_locations returns for it.
+    """
+    from core.batch import fan_out
+    from tools.get_past_locations import get_past_locations
+
+    return await fan_out(get_past_locations, "user", users)
@@ -0,0 +1,51 @@
+async def get_user_profile(user: str, include_history: bool = False) -> dict:
+    """
+    Get a compact summary of a user's travel preferences from their history.
+
+    Prefer this over get_past_activities and get_past_locations when only the
+    user's preferences are needed.
+
+    Args:
+        user: The username to summarize
+        include_history: Also return the raw past activities and locations
+
+    Returns:
+        Dictionary with the user's favorite categories, recency-weighted
+        interests, budget percentiles (LKR), group-size statistics and most
+        visited places.
+    """
+    import asyncio
+
+    from core.fallback import call_tracking_fallback, mark_fallback
+    from core.profiles import UserProfile, sync_profile, user_profile
+    from core.settings import PROFILE_HALF_LIFE_DAYS
+    from tools.get_past_activities import get_past_activities
+    from tools.get_past_locations import get_past_locations
+
+    if not include_history:
+        # Sync only new rows into the cached profile, without reading back the raw history
+        synced = await asyncio.gather(sync_profile(user, "activities"), sync_profile(user, "locations"))
+        if all(synced):
+            return {"user": user, **user_profile(user).summary()}
+
+    # Both tools fold new backend rows into the cached profile as they fetch
+    (activities, activities_fallback), (locations, locations_fallback) = await asyncio.gather(
+        call_tracking_fallback(get_past_activities, user),
+        call_tracking_fallback(get_past_locations, user),
+    )
+
+    fallback_reason = activities_fallback or locations_fallback
+    if fallback_reason is None:
+        profile = user_profile(user)
+    else:
+        mark_fallback(Exception(fallback_reason))
+        # Summarize what was returned without storing sample data in the cached profile
+        profile = UserProfile(PROFILE_HALF_LIFE_DAYS)
+        profile.add_activities(activities)
+        profile.add_locations(locations)
+
+    result = {"user": user, **profile.summary()}
+    if include_history:
+        result["past_activities"] = activities
+        result["past_locations"] = locations
+    return result
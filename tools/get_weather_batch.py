@@ -0,0 +1,17 @@
+async def get_weather_batch(locations: list[str], date: str = "2025-11-28") -> dict:
+    """
+    Get weather information for several locations on the same date in one call.
+
+    Args:
+        locations: City names or locations (e.g., ["Kandy", "Ella", "Galle"])
+        date: Date in YYYY-MM-DD format (e.g., "2025-11-15"). If empty, returns current weather.
+
+    Returns:
+        Dictionary with ok/fallback/error counts and a "results" list in input order.
+        Each item holds its location, a status of "ok", "fallback" or "error", and the
+        data get_weather returns for it.
+    """
+    from core.batch import fan_out
+    from tools.get_weather import get_weather
+
+    return await fan_out(get_weather, "location", locations, date=date)
@@ -0,0 +1,143 @@
+async def get_weather_range(location: str, start_date: str = "", end_date: str = "", dates: list[str] | None = None) -> dict:
+    """
+    Get daily weather for every day of a trip with a single geocode and one archive and one forecast request
+    per run of nearby dates.
+
+    Args:
+        location: City name or location (e.g., "Kandy", "Ella")
+        start_date: First day of the range in YYYY-MM-DD format (e.g., "2025-11-15")
+        end_date: Last day of the range in YYYY-MM-DD format. Defaults to start_date.
+        dates: Explicit list of YYYY-MM-DD dates to use instead of a start/end range.
+               Past days return historical data, days up to 16 days ahead return forecast data,
+               and later days return estimated typical weather.
+
+    Returns:
+        Dictionary with the resolved location and a "days" list holding one entry per date,
+        each in the same shape get_weather returns for a single date.
+    """
+    import asyncio
+    from datetime import date as Date, timedelta
+
+    from core.fallback import mark_fallback
+    from core.geocoding import geocode
+    from core.http import get_json
+    from core.settings import ARCHIVE_URL, FORECAST_URL, WEATHER_RANGE_MAX_DAYS, WEATHER_TIMEOUT
+    from core.weather import (
+        ARCHIVE_DAILY,
+        FORECAST_DAILY,
+        cache_weather,
+        daily_entry,
+        estimated_entry,
+        fallback_entry,
+        get_cached_weather,
+        weather_cache_key,
+    )
+
+    try:
+        if dates:
+            days = sorted({Date.fromisoformat(d) for d in dates})
+        else:
+            first = Date.fromisoformat(start_date)
+            last = Date.fromisoformat(end_date) if end_date else first
+            if last < first:
+                first, last = last, first
+            days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+    except ValueError:
+        return {
+            "error": "Invalid date format. Please use YYYY-MM-DD format (e.g., '2025-11-15')",
+            "location": location,
+            "start_date": start_date,
+            "end_date": end_date,
+            "dates": dates
+        }
+
+    if len(days) > WEATHER_RANGE_MAX_DAYS:
+        return {
+            "error": f"Too many days requested ({len(days)}). Please request at most {WEATHER_RANGE_MAX_DAYS} days.",
+            "location": location
+        }
+
+    try:
+        place = await geocode(location)
+    except Exception as e:
+        mark_fallback(e)
+        return {
+            "location": location,
+            "days": [fallback_entry(location, day.isoformat(), e) for day in days]
+        }
+
+    if place is None:
+        return {
+            "error": f"Location '{location}' not found",
+            "location": location
+        }
+
+    latitude = place["latitude"]
+    longitude = place["longitude"]
+    today = Date.today()
+    horizon = today + timedelta(days=16)
+
+    entries = {}
+    missing = {"historical": [], "forecast": []}
+    for day in days:
+        if day > horizon:
+            entries[day] = estimated_entry(place, day.isoformat())
+            continue
+        data_type = "historical" if day < today else "forecast"
+        cached = get_cached_weather(weather_cache_key(latitude, longitude, day.isoformat(), data_type))
+        if cached is not None:
+            entries[day] = cached
+        else:
+            missing[data_type].append(day)
+
+    # Dates at most a week apart share one request; farther ones start a new
+    # run, so two dates years apart do not download every day in between.
+    runs = []
+    for data_type, upstream, base_url, variables in (
+        ("historical", "archive", ARCHIVE_URL, ARCHIVE_DAILY),
+        ("forecast", "forecast", FORECAST_URL, FORECAST_DAILY),
+    ):
+        for day in missing[data_type]:
+            if runs and runs[-1][0] == data_type and (day - runs[-1][-1][-1]).days <= 7:
+                runs[-1][-1].append(day)
+            else:
+                runs.append((data_type, upstream, base_url, variables, [day]))
+
+    async def fetch_run(data_type: str, upstream: str, base_url: str, variables: str, wanted: list) -> Exception | None:
+        weather_url = f"{base_url}?latitude={latitude}&longitude={longitude}&start_date={wanted[0]}&end_date={wanted[-1]}&daily={variables}&timezone=auto"
+        try:
+            weather_data = await get_json(weather_url, timeout=WEATHER_TIMEOUT, upstream=upstream)
+            daily = weather_data.get("daily") or {}
+            positions = {d: i for i, d in enumerate(daily.get("time", []))}
+            for day in wanted:
+                iso = day.isoformat()
+                if iso not in positions:
+                    entries[day] = {
+                        "error": f"No {data_type} data available for date '{iso}'",
+                        "location": location,
+                        "date": iso
+                    }
+                    continue
+                entry = daily_entry(place, daily, positions[iso], data_type)
+                entries[day] = cache_weather(weather_cache_key(latitude, longitude, iso, data_type), entry)
+        except Exception as e:
+            for day in wanted:
+                entries[day] = fallback_entry(location, day.isoformat(), e)
+            return e
+        return None
+
+    # A fallback marked inside a gathered task would not reach this call's context
+    failures = [error for error in await asyncio.gather(*(fetch_run(*run) for run in runs)) if error is not None]
+    if failures:
+        mark_fallback(failures[0])
+
+    return {
+        "location": f"{place['name']}, {place['country']}",
+        "coordinates": {
+            "latitude": latitude,
+            "longitude": longitude
+        },
+        "start_date": days[0].isoformat(),
+        "end_date": days[-1].isoformat(),
+        "days": [entries[day] for day in days]
+    }
@@ -0,0 +1,83 @@
+async def plan_trip(user: str, location: str, date: str, include_history: bool = False) -> dict:
+    """
+    Gather everything needed to plan a trip in one call.
+
+    Validates the date, then fetches the weather, nearby places, the location
+    catalog and the user's profile concurrently. Use this instead of calling
+    validate_future_date, get_weather, get_nearby_location_activities,
+    get_all_location_for_designation, get_past_activities and
+    get_past_locations one by one.
+
+    Args:
+        user: The username planning the trip
+        location: The destination (e.g., "Kandy")
+        date: Trip date in YYYY-MM-DD format (e.g., "2025-12-25")
+        include_history: Also return the user's raw past activities and locations
+
+    Returns:
+        Dictionary with the date validation, weather, a deduplicated list of
+        places (flagged when the user has visited them), the user's profile,
+        and a "sources" entry giving the status of each part ("ok", "fallback"
+        or "error"). If the date is not valid, only the validation is returned.
+    """
+    import asyncio
+
+    from core.batch import run_tracked
+    from core.fallback import mark_fallback
+    from core.planning import merge_places
+    from tools.get_all_location_for_designation import get_all_location_for_designation
+    from tools.get_nearby_location_activities import get_nearby_location_activities
+    from tools.get_user_profile import get_user_profile
+    from tools.get_weather import get_weather
+    from tools.validate_future_date import validate_future_date
+
+    validation = validate_future_date(date)
+    if not validation["valid"]:
+        return {
+            "user": user,
+            "location": location,
+            "date": date,
+            "date_validation": validation
+        }
+
+    names = ["weather", "nearby", "catalog", "profile"]
+    parts = dict(zip(names, await asyncio.gather(
+        run_tracked(get_weather, location=location, date=date),
+        run_tracked(get_nearby_location_activities, location=location),
+        run_tracked(get_all_location_for_designation, location=location),
+        run_tracked(get_user_profile, user=user, include_history=True),
+    )))
+
+    def data(name: str, default):
+        return parts[name].get("data", default) if parts[name]["status"] != "error" else default
+
+    profile = data("profile", {})
+    past_activities = profile.pop("past_activities", [])
+    past_locations = profile.pop("past_locations", [])
+
+    sources = {}
+    for name, part in parts.items():
+        sources[name] = {"status": part["status"]}
+        if part["status"] == "error":
+            sources[name]["error"] = part["error"]
+        elif part["status"] == "fallback":
+            sources[name]["reason"] = part["reason"]
+    fallback_reasons = [part["reason"] for part in parts.values() if part["status"] == "fallback"]
+    if fallback_reasons:
+        mark_fallback(Exception(fallback_reasons[0]))
+
+    result = {
+        "user": user,
+        "location": location,
+        "date": date,
+        "date_validation": validation,
+        "weather": data("weather", None),
+        "places": merge_places(data("nearby", []), data("catalog", []), past_locations),
+        "profile": profile or None,
+        "sources": sources,
+        "partial": any(part["status"] != "ok" for part in parts.values())
+    }
+    if include_history:
+        result["past_activities"] = past_activities
+        result["past_locations"] = past_locations
+    return result